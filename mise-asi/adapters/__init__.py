@@ -1,6 +1,18 @@
 """
 Adapters Module
+
+App factories are resolved on first access so that importing one server
+mode does not load the other's framework (Flask vs ASGI).
 """
-from .flask_app import create_app
 
-__all__ = ["create_app"]
+__all__ = ["create_app", "create_asgi_app"]
+
+
+def __getattr__(name: str):
+    if name == "create_app":
+        from .flask_app import create_app
+        return create_app
+    if name == "create_asgi_app":
+        from .asgi_app import create_asgi_app
+        return create_asgi_app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,321 @@
+"""
+ASGI HTTP Adapter
+Async server mode serving the Flask-compatible API and the uAgent from one event loop
+
+Endpoints match the Flask adapter exactly (/health, /chat, /chat/batch, /sync, /tools,
+/metrics, /profile) and share its service layer. Blocking orchestration work runs on a bounded thread pool
+so a single process can hold hundreds of slow LLM conversations open, and
+when UAGENT_ENABLED is set the uAgent runs as a task on the same loop.
+
+Usage:
+    uvicorn asgi:app --host 0.0.0.0 --port 8001
+"""
+import asyncio
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable
+from urllib.parse import parse_qs
+
+from config import settings
+from jobs import start_jobs, stop_jobs
+from utils import get_logger, jsoncodec, METRICS_CONTENT_TYPE
+
+from .service import (
+    CORS_ORIGINS,
+    EXPOSED_HEADERS,
+    IDEMPOTENCY_HEADER,
+    NDJSON_CONTENT_TYPE,
+    PROFILE_ALLOCATIONS_HEADER,
+    PROFILE_HEADER,
+    TEXT_CONTENT_TYPE,
+    batch_ndjson,
+    batch_payload,
+    encode_json,
+    handle_chat,
+    health_payload,
+    metrics_text,
+    profile_payload,
+    shape_chat_payload,
+    start_chat_batch,
+    sync_payload,
+    tools_conditional,
+)
+
+logger = get_logger(__name__)
+
+Scope = dict[str, Any]
+Receive = Callable[[], Awaitable[dict]]
+Send = Callable[[dict], Awaitable[None]]
+
+# Same rule as flask-cors: an origin is a regex only if it has regex syntax,
+# otherwise it must match literally ('.' in a host name is not a wildcard)
+_REGEX_CHARS = frozenset("*\\]?$^[()")
+
+
+def _origin_pattern(origin: str) -> re.Pattern:
+    return re.compile(origin if _REGEX_CHARS.intersection(origin) else re.escape(origin))
+
+
+_CORS_PATTERNS = [_origin_pattern(origin) for origin in CORS_ORIGINS]
+
+
+def _allowed_origin(origin: str | None) -> bool:
+    """Check an Origin header against the shared CORS allow-list"""
+    if not origin:
+        return False
+    return any(pattern.fullmatch(origin) for pattern in _CORS_PATTERNS)
+
+
+def _headers(scope: Scope) -> dict[str, str]:
+    """Request headers with lower-cased names"""
+    return {k.decode("latin-1").lower(): v.decode("latin-1") for k, v in scope["headers"]}
+
+
+def _query(scope: Scope) -> dict[str, str]:
+    """First value of each query string parameter"""
+    parsed = parse_qs(scope.get("query_string", b"").decode("latin-1"))
+    return {k: v[0] for k, v in parsed.items()}
+
+
+class AsgiApp:
+    """
+    Minimal ASGI application for the mise-asi HTTP API
+    Handles lifespan events so the thread pool and uAgent shut down cleanly
+    """
+
+    def __init__(self, run_agent: bool | None = None):
+        self.executor = ThreadPoolExecutor(
+            max_workers=settings.ASGI_MAX_THREADS,
+            thread_name_prefix="mise-asgi"
+        )
+        self.run_agent = run_agent
+        self._agent_task: asyncio.Task | None = None
+
+        # Handlers return (payload, status) or (payload, status, headers); dict payloads
+        # are sent as JSON, str as text (Content-Type from headers, else text/plain),
+        # None as an empty body
+        self.routes: dict[tuple[str, str], Callable[[Scope, bytes], Awaitable[tuple]]] = {
+            ("GET", "/health"): self._health,
+            ("GET", "/sync"): self._sync,
+            ("GET", "/tools"): self._tools,
+            ("GET", "/metrics"): self._metrics,
+            ("GET", "/profile"): self._profile,
+            ("POST", "/chat"): self._chat,
+            ("GET", "/chat/batch"): self._batch_status,
+            ("DELETE", "/chat/batch"): self._batch_status,
+        }
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+        elif scope["type"] == "http":
+            await self._http(scope, receive, send)
+
+    # Lifespan
+
+    async def _lifespan(self, receive: Receive, send: Send):
+        while True:
+            event = await receive()
+            if event["type"] == "lifespan.startup":
+                try:
+                    await self.startup()
+                    await send({"type": "lifespan.startup.complete"})
+                except Exception as e:
+                    logger.error(f"ASGI startup failed: {e}")
+                    await send({"type": "lifespan.startup.failed", "message": str(e)})
+                    return
+            elif event["type"] == "lifespan.shutdown":
+                await self.shutdown()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    async def startup(self):
+        """Share the thread pool with the loop and start the uAgent and background jobs if enabled"""
+        loop = asyncio.get_running_loop()
+        # asyncio.to_thread (used by the uAgent dispatcher) now uses the same pool
+        loop.set_default_executor(self.executor)
+
+        run_agent = settings.UAGENT_ENABLED if self.run_agent is None else self.run_agent
+        if run_agent:
+            from uagent.integration import start_agent_task
+            self._agent_task = start_agent_task()
+
+        start_jobs()
+
+        logger.info(f"ASGI server ready ({settings.ASGI_MAX_THREADS} worker threads)")
+
+    async def shutdown(self):
+        """Stop the uAgent task and background jobs, then drain the thread pool"""
+        if self._agent_task is not None:
+            from uagent.integration import stop_agent_task
+            await stop_agent_task(self._agent_task)
+            self._agent_task = None
+
+        # Waits for a running job step, so keep it off the loop
+        await asyncio.get_running_loop().run_in_executor(self.executor, stop_jobs)
+
+        # Queued work is cancelled; running threads are joined by the loop's
+        # default-executor shutdown since this pool is also the default executor
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        logger.info("ASGI server stopped")
+
+    # HTTP
+
+    async def _http(self, scope: Scope, receive: Receive, send: Send):
+        method = scope["method"]
+        path = scope["path"].rstrip("/") or "/"
+        headers = _headers(scope)
+        origin = headers.get("origin")
+        accept_encoding = headers.get("accept-encoding")
+
+        if method == "OPTIONS":
+            await self._send(send, 204, None, origin, accept_encoding, preflight=True)
+            return
+
+        if (method, path) == ("POST", "/chat/batch"):
+            await self._chat_batch(scope, receive, send, origin, accept_encoding)
+            return
+
+        handler = self.routes.get((method, path))
+        if handler is None and method == "GET" and path.startswith("/profile/"):
+            handler = self._profile
+        if handler is None and method in ("GET", "DELETE") and path.startswith("/chat/batch/"):
+            handler = self._batch_status
+        if handler is None:
+            allowed = any(p == path for _, p in self.routes)
+            status = 405 if allowed else 404
+            await self._send(send, status, {"error": "Method not allowed" if allowed else "Not found"}, origin, accept_encoding)
+            return
+
+        body = await self._read_body(receive)
+        payload, status, *extra = await handler(scope, body)
+        await self._send(send, status, payload, origin, accept_encoding, extra_headers=extra[0] if extra else None)
+
+    async def _read_body(self, receive: Receive) -> bytes:
+        chunks = []
+        while True:
+            message = await receive()
+            chunks.append(message.get("body", b""))
+            if not message.get("more_body"):
+                return b"".join(chunks)
+
+    def _cors_headers(self, origin: str | None, preflight: bool = False) -> list[tuple[bytes, bytes]]:
+        if not _allowed_origin(origin):
+            return []
+        headers = [
+            (b"access-control-allow-origin", origin.encode("latin-1")),
+            (b"access-control-allow-credentials", b"true"),
+            (b"vary", b"Origin"),
+            (b"access-control-expose-headers", EXPOSED_HEADERS.encode("latin-1")),
+        ]
+        if preflight:
+            headers += [
+                (b"access-control-allow-methods", b"GET, POST, DELETE, OPTIONS"),
+                (b"access-control-allow-headers", f"Content-Type, Authorization, If-None-Match, {IDEMPOTENCY_HEADER}, {PROFILE_HEADER}, {PROFILE_ALLOCATIONS_HEADER}".encode("latin-1")),
+            ]
+        return headers
+
+    async def _send(
+        self,
+        send: Send,
+        status: int,
+        payload: dict | str | None,
+        origin: str | None,
+        accept_encoding: str | None = None,
+        preflight: bool = False,
+        extra_headers: dict[str, str] | None = None,
+    ):
+        """Text payloads are sent with the Content-Type in extra_headers (text/plain if none)"""
+        headers = self._cors_headers(origin, preflight)
+        if extra_headers:
+            headers += [(k.lower().encode("latin-1"), v.encode("latin-1")) for k, v in extra_headers.items()]
+
+        body = b""
+        if isinstance(payload, str):
+            body = payload.encode("utf-8")
+            if not any(name == b"content-type" for name, _ in headers):
+                headers.append((b"content-type", TEXT_CONTENT_TYPE.encode("latin-1")))
+        elif payload is not None:
+            body, json_headers = encode_json(payload, accept_encoding)
+            headers += [(k.lower().encode("latin-1"), v.encode("latin-1")) for k, v in json_headers.items()]
+        headers.append((b"content-length", str(len(body)).encode("latin-1")))
+
+        await send({"type": "http.response.start", "status": status, "headers": headers})
+        await send({"type": "http.response.body", "body": body})
+
+    # Routes
+
+    async def _health(self, scope: Scope, body: bytes) -> tuple[dict, int]:
+        return health_payload(), 200
+
+    async def _tools(self, scope: Scope, body: bytes) -> tuple[dict | None, int, dict]:
+        return tools_conditional(_headers(scope))
+
+    async def _sync(self, scope: Scope, body: bytes) -> tuple[dict | None, int, dict]:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, sync_payload, _query(scope), _headers(scope))
+
+    async def _metrics(self, scope: Scope, body: bytes) -> tuple[str, int, dict]:
+        return metrics_text(), 200, {"Content-Type": METRICS_CONTENT_TYPE}
+
+    async def _chat(self, scope: Scope, body: bytes) -> tuple[dict, int]:
+        try:
+            data = jsoncodec.loads(body) if body else None
+        except ValueError:
+            data = None
+        loop = asyncio.get_running_loop()
+        payload, status = await loop.run_in_executor(self.executor, handle_chat, data, _headers(scope))
+        query = _query(scope)
+        return shape_chat_payload(payload, query.get("fields"), query.get("verbose")), status
+
+    async def _batch_status(self, scope: Scope, body: bytes) -> tuple[dict, int]:
+        batch_id = scope["path"].rstrip("/")[len("/chat/batch/"):]
+        if not batch_id:
+            return {"error": "Not found"}, 404
+        return batch_payload(batch_id, cancel=scope["method"] == "DELETE")
+
+    async def _chat_batch(self, scope: Scope, receive: Receive, send: Send, origin: str | None, accept_encoding: str | None):
+        """Stream batch results as NDJSON; a client disconnect cancels the batch"""
+        body = await self._read_body(receive)
+        try:
+            data = jsoncodec.loads(body) if body else None
+        except ValueError:
+            data = None
+        run, status = start_chat_batch(data)
+        if status != 200:
+            await self._send(send, status, run, origin, accept_encoding)
+            return
+
+        headers = self._cors_headers(origin) + [
+            (b"content-type", NDJSON_CONTENT_TYPE.encode("latin-1")),
+            (b"cache-control", b"no-store"),
+            (b"x-batch-id", run.batch_id.encode("latin-1")),
+        ]
+        await send({"type": "http.response.start", "status": 200, "headers": headers})
+
+        async def watch_disconnect():
+            while (await receive())["type"] != "http.disconnect":
+                pass
+            run.cancel()
+
+        watcher = asyncio.create_task(watch_disconnect())
+        lines = batch_ndjson(run)
+        loop = asyncio.get_running_loop()
+        try:
+            # Each next() blocks until the next job finishes, so wait in the pool
+            while (line := await loop.run_in_executor(self.executor, next, lines, None)) is not None:
+                await send({"type": "http.response.body", "body": line, "more_body": True})
+            await send({"type": "http.response.body", "body": b""})
+        finally:
+            watcher.cancel()
+            lines.close()
+
+    async def _profile(self, scope: Scope, body: bytes) -> tuple[dict | str, int]:
+        profile_id = scope["path"].rstrip("/")[len("/profile/"):] or None
+        fmt = _query(scope).get("format", "json")
+        return profile_payload(profile_id, _headers(scope), fmt)
+
+
+def create_asgi_app(run_agent: bool | None = None) -> AsgiApp:
+    """Create the ASGI application"""
+    return AsgiApp(run_agent=run_agent)
@@ -4,12 +4,29 @@ Maps to: frontend_app.py from asi-samples
 
 Provides REST endpoints for the frontend to call the ASI orchestrator
 """
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request
 from flask_cors import CORS
 
-from config import settings
-from orchestration import get_orchestrator
-from utils import get_logger
+from jobs import start_jobs
+from utils import get_logger, METRICS_CONTENT_TYPE
+
+from .service import (
+    CORS_ORIGINS,
+    EXPOSED_HEADERS,
+    NDJSON_CONTENT_TYPE,
+    TEXT_CONTENT_TYPE,
+    batch_ndjson,
+    batch_payload,
+    encode_json,
+    handle_chat,
+    health_payload,
+    metrics_text,
+    profile_payload,
+    shape_chat_payload,
+    start_chat_batch,
+    sync_payload,
+    tools_conditional,
+)
 
 logger = get_logger(__name__)
 
@@ -19,88 +36,83 @@ def create_app() -> Flask:
     app = Flask(__name__)
     
     # Enable CORS for frontend - allow all common dev ports and production
-    CORS(app, origins=[
-        "http://localhost:5173",  # Vite dev server
-        "http://localhost:3000",  # Common React port
-        "http://localhost:8080",  # Your current frontend port
-        "http://127.0.0.1:5173",
-        "http://127.0.0.1:3000",
-        "http://127.0.0.1:8080",
-        "https://mise-ai.vercel.app",
-        r"https://mise-ai.*\.vercel\.app",  # Allow all Vercel preview deployments
-    ], supports_credentials=True)
+    CORS(app, origins=CORS_ORIGINS, supports_credentials=True, expose_headers=EXPOSED_HEADERS.split(", "))
+    
+    # Background jobs (meal plan precomputation) when JOBS_ENABLED
+    start_jobs()
+    
+    def json_response(payload: dict | None, status: int = 200, extra_headers: dict | None = None) -> Response:
+        """JSON via the fast codec, compressed when the client accepts it (no body for 304)"""
+        if payload is None:
+            return Response(status=status, headers=extra_headers)
+        body, headers = encode_json(payload, request.headers.get("Accept-Encoding"))
+        return Response(body, status=status, headers={**headers, **(extra_headers or {})})
+    
+    def request_headers() -> dict:
+        return {k.lower(): v for k, v in request.headers.items()}
     
     @app.route("/health", methods=["GET"])
     def health():
         """Health check endpoint"""
-        return jsonify({
-            "status": "healthy",
-            "agent": "mise-asi",
-            "version": "1.0.0"
-        })
+        return json_response(health_payload())
     
     @app.route("/chat", methods=["POST"])
     def chat():
         """
         Main chat endpoint - replaces gemini-proxy Supabase function
-        
-        Request body:
-        {
-            "message": "user message",
-            "user_id": "user-uuid",
-            "history": [] // optional conversation history
-        }
-        
-        Response:
-        {
-            "text": "assistant response",
-            "function_calls": [...],
-            "thought_steps": [...]
-        }
+        See adapters.service.handle_chat for the request/response contract
+        """
+        payload, status = handle_chat(request.get_json(silent=True), request_headers())
+        payload = shape_chat_payload(payload, request.args.get("fields"), request.args.get("verbose"))
+        return json_response(payload, status)
+    
+    @app.route("/chat/batch", methods=["POST"])
+    def chat_batch():
+        """
+        Run many chat jobs and stream their results as NDJSON as they finish
+        See adapters.service.start_chat_batch for the request contract
         """
-        try:
-            data = request.get_json()
-            
-            if not data:
-                return jsonify({"error": "No JSON body provided"}), 400
-            
-            message = data.get("message")
-            user_id = data.get("user_id")
-            history = data.get("history", [])
-            
-            if not message:
-                return jsonify({"error": "Message is required"}), 400
-            
-            if not user_id:
-                return jsonify({"error": "User ID is required"}), 400
-            
-            logger.info(f"Chat request from user {user_id[:8]}...")
-            
-            # Get orchestrator and process
-            orchestrator = get_orchestrator()
-            result = orchestrator.process_message(
-                message=message,
-                user_id=user_id,
-                history=history
-            )
-            
-            return jsonify(result)
-            
-        except Exception as e:
-            logger.error(f"Chat error: {e}")
-            return jsonify({
-                "error": str(e),
-                "text": "I encountered an error processing your request.",
-                "function_calls": [],
-                "thought_steps": []
-            }), 500
+        run, status = start_chat_batch(request.get_json(silent=True))
+        if status != 200:
+            return json_response(run, status)
+        return Response(
+            batch_ndjson(run),
+            content_type=NDJSON_CONTENT_TYPE,
+            headers={"X-Batch-Id": run.batch_id, "Cache-Control": "no-store"}
+        )
+    
+    @app.route("/chat/batch/<batch_id>", methods=["GET", "DELETE"])
+    def chat_batch_status(batch_id: str):
+        """Batch progress (GET) or cancellation (DELETE)"""
+        payload, status = batch_payload(batch_id, cancel=request.method == "DELETE")
+        return json_response(payload, status)
+    
+    @app.route("/sync", methods=["GET"])
+    def sync():
+        """
+        Changed and deleted pantry rows since a version (ETag/If-None-Match aware)
+        See adapters.service.sync_payload for the contract
+        """
+        payload, status, headers = sync_payload(request.args, request_headers())
+        return json_response(payload, status, headers)
     
     @app.route("/tools", methods=["GET"])
     def list_tools():
         """List available tools"""
-        from registry import get_all_tool_names
-        return jsonify({
-            "tools": get_all_tool_names()
-        })
+        return json_response(*tools_conditional(request_headers()))
+    
+    @app.route("/metrics", methods=["GET"])
+    def metrics():
+        """Prometheus-style metrics"""
+        return Response(metrics_text(), content_type=METRICS_CONTENT_TYPE)
+    
+    @app.route("/profile", methods=["GET"])
+    @app.route("/profile/<profile_id>", methods=["GET"])
+    def profile(profile_id: str | None = None):
+        """Stored request profiles (requires the profiling header)"""
+        payload, status = profile_payload(profile_id, request_headers(), request.args.get("format", "json"))
+        if isinstance(payload, str):
+            return Response(payload, status=status, content_type=TEXT_CONTENT_TYPE)
+        return json_response(payload, status)
     
     return app
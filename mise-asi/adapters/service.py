@@ -0,0 +1,549 @@
+"""
+Adapter Service Layer
+Transport-neutral request handling shared by the Flask and ASGI adapters
+
+Each function takes already-decoded request data and returns
+(payload, status) so both servers keep identical JSON contracts.
+Conditional reads return (payload, status, headers), with a None payload
+for 304 Not Modified.
+"""
+import gzip
+import hashlib
+import secrets
+from functools import partial
+from typing import Iterator
+
+from config import settings
+from orchestration import (
+    BatchJob,
+    BatchNotFound,
+    BatchRun,
+    get_batch,
+    get_orchestrator,
+    get_router,
+    get_scheduler,
+    get_session_manager,
+    request_cost,
+    run_batch,
+    SchedulerRejected,
+    SchedulerTimeout,
+    SessionNotFound,
+)
+from utils import (
+    get_logger,
+    counter,
+    SingleFlight,
+    render_metrics,
+    profiled,
+    get_profile_store,
+    Deadline,
+    jsoncodec,
+    build_delta,
+    get_sync_state,
+)
+
+try:
+    import brotli
+except ImportError:  # optional; gzip is always available
+    brotli = None
+
+logger = get_logger(__name__)
+
+CHAT_DEDUP = counter("mise_chat_dedup_total", "De-duplicated /chat requests by outcome (joined, replayed)")
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+
+# Request header carrying PROFILE_TOKEN to opt a /chat call into profiling
+PROFILE_HEADER = "X-Mise-Profile"
+# Set to "true" on a profiled call to also trace allocations (slows every concurrent request)
+PROFILE_ALLOCATIONS_HEADER = "X-Mise-Profile-Allocations"
+
+# Allowed CORS origins - all common dev ports and production
+CORS_ORIGINS = [
+    "http://localhost:5173",  # Vite dev server
+    "http://localhost:3000",  # Common React port
+    "http://localhost:8080",  # Your current frontend port
+    "http://127.0.0.1:5173",
+    "http://127.0.0.1:3000",
+    "http://127.0.0.1:8080",
+    "https://mise-ai.vercel.app",
+    r"https://mise-ai.*\.vercel\.app",  # Allow all Vercel preview deployments
+]
+
+# Response headers browser clients may read (sync validators, batch ids)
+EXPOSED_HEADERS = "ETag, X-Batch-Id"
+
+VERSION = "1.0.0"
+
+JSON_CONTENT_TYPE = "application/json"
+
+NDJSON_CONTENT_TYPE = "application/x-ndjson"
+
+TEXT_CONTENT_TYPE = "text/plain; charset=utf-8"
+
+
+def health_payload() -> dict:
+    """Health check payload"""
+    payload = {
+        "status": "healthy",
+        "agent": "mise-asi",
+        "version": VERSION
+    }
+    if settings.SCHEDULER_ENABLED:
+        payload["scheduler"] = get_scheduler().stats()
+    if settings.ROUTER_ENABLED:
+        payload["router"] = get_router().stats()
+    if settings.JOBS_ENABLED:
+        from jobs import get_job_scheduler
+        payload["jobs"] = get_job_scheduler().stats()
+    return payload
+
+
+def tools_payload() -> dict:
+    """List of available tools"""
+    from registry import get_all_tool_names
+    return {
+        "tools": get_all_tool_names()
+    }
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """True if an If-None-Match header lists `etag` (weak comparison) or is *"""
+    if not if_none_match:
+        return False
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in tags or any(tag.removeprefix("W/") == etag.removeprefix("W/") for tag in tags)
+
+
+def conditional(payload: dict, etag: str, headers: dict | None) -> tuple[dict | None, int, dict[str, str]]:
+    """(payload, 200) with an ETag, or (None, 304) when the client already has it"""
+    response_headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if etag_matches((headers or {}).get("if-none-match"), etag):
+        return None, 304, response_headers
+    return payload, 200, response_headers
+
+
+def tools_conditional(headers: dict | None) -> tuple[dict | None, int, dict[str, str]]:
+    """Tool list with a content-hash ETag"""
+    payload = tools_payload()
+    etag = '"' + hashlib.sha256(jsoncodec.dumps(payload)).hexdigest()[:16] + '"'
+    return conditional(payload, etag, headers)
+
+
+def sync_payload(args: dict, headers: dict | None = None) -> tuple[dict | None, int, dict[str, str]]:
+    """
+    Handle GET /sync?user_id=<uuid>&since=<version>
+    headers are lower-cased request headers
+
+    Response:
+    {
+        "version": 42, // send back as since= next time
+        "reset": false, // true = full snapshot, replace the local copy
+        "has_more": false, // true = call again with the new version
+        "changes": {
+            "user_inventory": {"upserted": [rows], "deleted": [row ids]},
+            ...
+        }
+    }
+
+    The ETag is the user's current version, so polling with If-None-Match
+    costs one small query and returns 304 while nothing has changed.
+    """
+    user_id = args.get("user_id")
+    if not user_id:
+        return {"error": "User ID is required"}, 400, {}
+    try:
+        since = int(args.get("since") or 0)
+    except ValueError:
+        return {"error": "since must be an integer version"}, 400, {}
+
+    try:
+        state = get_sync_state(user_id)
+        etag = f'W/"{state["version"]}"'
+        if since == state["version"] and etag_matches((headers or {}).get("if-none-match"), etag):
+            return None, 304, {"ETag": etag, "Cache-Control": "no-cache"}
+        payload = build_delta(user_id, since, settings.SYNC_MAX_CHANGES, state)
+    except Exception as e:
+        logger.error(f"Sync error: {e}")
+        return {"error": str(e)}, 500, {}
+    # Tag what was actually sent (a partial page carries its own version)
+    return conditional(payload, f'W/"{payload["version"]}"', headers)
+
+
+def metrics_text() -> str:
+    """Prometheus text exposition of process metrics"""
+    return render_metrics()
+
+
+def negotiate_encoding(accept_encoding: str | None) -> str | None:
+    """Pick br or gzip from an Accept-Encoding header (None = identity)"""
+    if not accept_encoding:
+        return None
+    accepted = set()
+    for part in accept_encoding.lower().split(","):
+        name, _, params = part.strip().partition(";")
+        q = params.strip()
+        if q.startswith("q="):
+            try:
+                if float(q[2:]) <= 0:
+                    continue
+            except ValueError:
+                continue
+        accepted.add(name.strip())
+    if brotli is not None and "br" in accepted:
+        return "br"
+    if "gzip" in accepted or "*" in accepted:
+        return "gzip"
+    return None
+
+
+def encode_json(payload: dict, accept_encoding: str | None = None) -> tuple[bytes, dict[str, str]]:
+    """
+    Serialize a JSON payload with the fast codec and compress it when the
+    client accepts it and the body is at least COMPRESS_MIN_BYTES
+    Returns (body, headers)
+    """
+    body = jsoncodec.dumps(payload)
+    headers = {"Content-Type": JSON_CONTENT_TYPE, "Vary": "Accept-Encoding"}
+    if len(body) < settings.COMPRESS_MIN_BYTES:
+        return body, headers
+
+    encoding = negotiate_encoding(accept_encoding)
+    if encoding == "br":
+        body = brotli.compress(body, quality=4)
+    elif encoding == "gzip":
+        body = gzip.compress(body, compresslevel=5)
+    if encoding:
+        headers["Content-Encoding"] = encoding
+    return body, headers
+
+
+def shape_chat_payload(payload: dict, fields: str | None = None, verbose: str | None = None) -> dict:
+    """
+    Apply the /chat response query options
+    verbose=false drops each function call's result and data (name and args are kept)
+    fields=text,function_calls keeps only the listed top-level keys (errors are always kept)
+    """
+    if verbose is not None and verbose.lower() in ("0", "false", "no"):
+        payload = dict(payload)
+        payload["function_calls"] = [
+            {k: v for k, v in call.items() if k not in ("result", "data")}
+            for call in payload.get("function_calls", [])
+        ]
+    if fields:
+        wanted = {f.strip() for f in fields.split(",") if f.strip()} | {"error", "retry_after"}
+        payload = {k: v for k, v in payload.items() if k in wanted}
+    return payload
+
+
+def profiling_authorized(headers: dict | None) -> bool:
+    """Check the profiling header against PROFILE_TOKEN (profiling is off without a token)"""
+    token = settings.PROFILE_TOKEN
+    if not token or not headers:
+        return False
+    return secrets.compare_digest(headers.get(PROFILE_HEADER.lower(), ""), token)
+
+
+def profile_payload(profile_id: str | None, headers: dict | None, fmt: str = "json") -> tuple[dict | str, int]:
+    """
+    Fetch a stored profile (or list recent ones when no id is given)
+    fmt="collapsed" returns the collapsed stacks as text for flamegraph tools
+    """
+    if not profiling_authorized(headers):
+        return {"error": "Not found"}, 404
+
+    store = get_profile_store()
+    if not profile_id:
+        return {"profiles": store.list()}, 200
+
+    profile = store.get(profile_id)
+    if profile is None:
+        return {"error": "Profile not found"}, 404
+    if fmt == "collapsed":
+        return profile.collapsed + "\n", 200
+    return profile.to_dict(), 200
+
+
+# Singleton instance
+_chat_flights: SingleFlight | None = None
+
+
+def _get_chat_flights() -> SingleFlight:
+    global _chat_flights
+    if _chat_flights is None:
+        _chat_flights = SingleFlight(
+            replay_seconds=settings.CHAT_REPLAY_SECONDS,
+            max_replays=settings.CHAT_REPLAY_MAX_ENTRIES,
+        )
+    return _chat_flights
+
+
+def chat_dedup_key(data: dict, headers: dict | None) -> tuple | None:
+    """
+    (user_id, idempotency key) when the client sends one, otherwise
+    (user_id, message hash, context hash); None if the body is not a chat request
+    The idempotency key alone identifies a request, so a retry still matches
+    after the first attempt has changed the stored session history. Without
+    one, the context includes the session version: a repeated short reply
+    ("yes") in a later turn is a new request, not a replay.
+    """
+    user_id, message = data.get("user_id"), data.get("message")
+    if not user_id or not isinstance(message, str) or not message:
+        return None
+    idempotency_key = (headers or {}).get(IDEMPOTENCY_HEADER.lower()) or data.get("idempotency_key")
+    if idempotency_key:
+        return (user_id, "key", str(idempotency_key))
+    context = [
+        data.get("history") or [],
+        data.get("conversation_id"),
+        _session_version(data.get("conversation_id")),
+        data.get("since"),
+        data.get("trace"),
+    ]
+    history_hash = hashlib.sha256(jsoncodec.dumps(context, sort_keys=True)).hexdigest()
+    return (user_id, hashlib.sha256(message.encode("utf-8")).hexdigest(), history_hash)
+
+
+def _session_version(conversation_id) -> int | None:
+    """Current version of a stored session (None without one; _handle_chat reports unknown ids)"""
+    if not conversation_id or not isinstance(conversation_id, str):
+        return None
+    session = get_session_manager().store.get(conversation_id)
+    return session.version if session is not None else None
+
+
+def handle_chat(data: dict | None, headers: dict | None = None) -> tuple[dict, int]:
+    """
+    Process a /chat request body, de-duplicating retries
+    Identical requests arriving while the first is running wait for its
+    result; successful results are replayed for CHAT_REPLAY_SECONDS. Shared
+    results carry "deduplicated": "joined" or "replayed".
+    See _handle_chat for the request/response contract.
+    """
+    key = chat_dedup_key(data, headers) if settings.CHAT_DEDUP_ENABLED and isinstance(data, dict) else None
+    if key is None or profiling_authorized(headers):
+        return _handle_chat(data, headers)
+
+    try:
+        (payload, status), how = _get_chat_flights().do(
+            key,
+            lambda: _handle_chat(data, headers),
+            replayable=lambda response: response[1] == 200,
+            timeout=settings.CHAT_MAX_DEADLINE_SECONDS,
+        )
+    except TimeoutError:
+        return {
+            "error": "The assistant is busy right now. Please try again shortly.",
+            "retry_after": 5
+        }, 503
+    if how is None:
+        return payload, status
+    CHAT_DEDUP.inc(outcome=how)
+    logger.info(f"Chat request from user {key[0][:8]} {how} an identical request")
+    return {**payload, "deduplicated": how}, status
+
+
+def _handle_chat(data: dict | None, headers: dict | None = None) -> tuple[dict, int]:
+    """
+    Process a /chat request body
+    headers are lower-cased request headers; sending X-Mise-Profile: <PROFILE_TOKEN>
+    profiles the request and returns a "profile_id" to fetch from /profile
+    (profiled requests are never de-duplicated). Adding
+    X-Mise-Profile-Allocations: true also traces allocations; tracemalloc is
+    process-wide, so every concurrent request pays for it while it runs.
+
+    Request body:
+    {
+        "message": "user message",
+        "user_id": "user-uuid",
+        "history": [], // optional conversation history (not needed with sessions)
+        "conversation_id": "...", // optional, continue a server-side session
+        "session": false, // optional, start a new server-side session
+        "since": 0, // optional, return session messages after this version
+        "deadline_ms": 20000, // optional time budget, including queueing
+        "idempotency_key": "...", // optional, same as the Idempotency-Key header
+        "trace": false // optional, include the span tree in the response
+    }
+
+    Response:
+    {
+        "text": "assistant response",
+        "function_calls": [...], // each {"name", "args", "result"}, plus "data" for panel tools
+        "thought_steps": [...],
+        "conversation_id": "...", // session mode only
+        "session_version": 12, // session mode only
+        "messages": [...], // session mode with "since" only
+        "trace": {...} // only when requested
+    }
+    """
+    try:
+        if not data:
+            return {"error": "No JSON body provided"}, 400
+
+        message = data.get("message")
+        user_id = data.get("user_id")
+        history = data.get("history", [])
+
+        if not message:
+            return {"error": "Message is required"}, 400
+
+        if not user_id:
+            return {"error": "User ID is required"}, 400
+
+        deadline_ms = data.get("deadline_ms")
+        if deadline_ms is not None and (isinstance(deadline_ms, bool) or not isinstance(deadline_ms, (int, float))):
+            return {"error": "deadline_ms must be a number"}, 400
+        deadline = Deadline.for_request(deadline_ms)
+
+        # Server-side session: history comes from the store, not the request body
+        session = None
+        if data.get("conversation_id") or data.get("session"):
+            session = get_session_manager().open(user_id, data.get("conversation_id"))
+            if not data.get("conversation_id") and history:
+                # Seed a new session from client-held history
+                session.append(
+                    [m for m in history if m.get("role") in ("user", "assistant")],
+                    get_session_manager().max_messages
+                )
+            history = list(session.messages)
+
+        logger.info(f"Chat request from user {user_id[:8]}...")
+
+        # Get orchestrator and process
+        orchestrator = get_orchestrator()
+
+        process = partial(
+            orchestrator.process_message,
+            message=message,
+            user_id=user_id,
+            history=history,
+            include_trace=bool(data.get("trace")),
+            deadline=deadline
+        )
+
+        def run() -> dict:
+            if not profiling_authorized(headers):
+                return process()
+            allocations = headers.get(PROFILE_ALLOCATIONS_HEADER.lower(), "").lower() == "true"
+            with profiled(f"chat user={user_id[:8]}", allocations=allocations) as profile:
+                result = process()
+            result["profile_id"] = profile.id
+            return result
+
+        if not settings.SCHEDULER_ENABLED:
+            result = run()
+        else:
+            # Admit through the fair scheduler; quota is charged by actual work done
+            with get_scheduler().slot(user_id, timeout=deadline.remaining()) as ticket:
+                result = run()
+                ticket.charge(request_cost(result))
+
+        if session is not None:
+            session = get_session_manager().record_turn(session, message, result["text"])
+            result["conversation_id"] = session.conversation_id
+            result["session_version"] = session.version
+            since = data.get("since")
+            if isinstance(since, int) and not isinstance(since, bool):
+                result["messages"] = session.since(since)
+
+        return result, 200
+
+    except SessionNotFound:
+        return {"error": "Conversation not found"}, 404
+
+    except SchedulerRejected as e:
+        logger.warning(f"Chat rate limited: {e}")
+        return {
+            "error": "Too many requests. Please wait before sending another message.",
+            "retry_after": round(e.retry_after, 1)
+        }, 429
+
+    except SchedulerTimeout as e:
+        logger.warning(f"Chat queue timeout: {e}")
+        return {
+            "error": "The assistant is busy right now. Please try again shortly.",
+            "retry_after": 5
+        }, 503
+
+    except Exception as e:
+        logger.error(f"Chat error: {e}")
+        return {
+            "error": str(e),
+            "text": "I encountered an error processing your request.",
+            "function_calls": [],
+            "thought_steps": []
+        }, 500
+
+
+def start_chat_batch(data: dict | None) -> tuple[BatchRun | dict, int]:
+    """
+    Validate a /chat/batch request body and start the batch
+    Returns (BatchRun, 200) to stream with batch_ndjson(), or (error payload, status)
+
+    Request body:
+    {
+        "jobs": [
+            {"id": "optional-job-id", "user_id": "user-uuid", "message": "...", "history": []}
+        ],
+        "max_concurrency": 8, // optional, capped by BATCH_MAX_CONCURRENCY
+        "deadline_ms": 60000 // optional time budget per job
+    }
+    """
+    if not data:
+        return {"error": "No JSON body provided"}, 400
+
+    raw_jobs = data.get("jobs")
+    if not isinstance(raw_jobs, list) or not raw_jobs:
+        return {"error": "jobs must be a non-empty list"}, 400
+
+    jobs = []
+    for index, raw in enumerate(raw_jobs):
+        if not isinstance(raw, dict) or not raw.get("user_id") or not raw.get("message"):
+            return {"error": f"Job {index} needs a user_id and a message"}, 400
+        jobs.append(BatchJob(
+            job_id=str(raw.get("id", index)),
+            user_id=raw["user_id"],
+            message=raw["message"],
+            history=raw.get("history") or [],
+        ))
+
+    max_concurrency = data.get("max_concurrency")
+    if max_concurrency is not None and (isinstance(max_concurrency, bool) or not isinstance(max_concurrency, int)):
+        return {"error": "max_concurrency must be an integer"}, 400
+    deadline_ms = data.get("deadline_ms")
+    if deadline_ms is not None and (isinstance(deadline_ms, bool) or not isinstance(deadline_ms, (int, float))):
+        return {"error": "deadline_ms must be a number"}, 400
+
+    try:
+        return run_batch(jobs, max_concurrency, deadline_ms), 200
+    except ValueError as e:
+        return {"error": str(e)}, 400
+
+
+def batch_ndjson(run: BatchRun) -> Iterator[bytes]:
+    """
+    Stream a batch as NDJSON lines:
+    {"type": "batch", ...progress} first, one {"type": "result", ...} per job
+    as it finishes (with "progress"), then {"type": "done", ...progress}
+    Closing the iterator early cancels the batch.
+    """
+    try:
+        yield jsoncodec.dumps({"type": "batch", **run.progress()}) + b"\n"
+        for result in run.results():
+            yield jsoncodec.dumps({"type": "result", **result, "progress": run.progress()}) + b"\n"
+        yield jsoncodec.dumps({"type": "done", **run.progress()}) + b"\n"
+    except GeneratorExit:
+        # Client went away before the batch finished
+        run.cancel()
+        raise
+
+
+def batch_payload(batch_id: str, cancel: bool = False) -> tuple[dict, int]:
+    """Progress of a recent batch, cancelling it first when asked"""
+    try:
+        run = get_batch(batch_id)
+    except BatchNotFound:
+        return {"error": "Batch not found"}, 404
+    if cancel:
+        run.cancel()
+    return run.progress(), 200
@@ -0,0 +1,74 @@
+"""
+mise-asi - ASI Orchestration Layer
+Entry point for the async (ASGI) server mode
+
+Serves /health, /chat and /tools plus the uAgent (when UAGENT_ENABLED=true)
+from a single event loop in one process.
+
+Usage:
+    python asgi.py
+
+Or with uvicorn directly:
+    uvicorn asgi:app --host 0.0.0.0 --port 8001
+
+The app is built on first access to `asgi.app` (or in main()), once per
+process, so importing this module starts nothing.
+"""
+import sys
+from pathlib import Path
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent))
+
+from config import settings
+from adapters import create_asgi_app
+from utils import get_logger
+
+logger = get_logger(__name__)
+
+
+# Built on first use by get_app()
+_app = None
+
+
+def get_app():
+    """Get or create the ASGI app for this process"""
+    global _app
+    if _app is None:
+        _app = create_asgi_app()
+    return _app
+
+
+def __getattr__(name: str):
+    # uvicorn resolves asgi:app through this
+    if name == "app":
+        return get_app()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def main():
+    """Main entry point"""
+    import uvicorn
+    
+    # Validate settings
+    missing = settings.validate()
+    if missing:
+        logger.warning(f"Missing environment variables: {', '.join(missing)}")
+        logger.warning("Some features may not work correctly.")
+    
+    print("🚀 mise-asi - ASI Orchestration Layer (async)")
+    print(f"📍 Running on http://localhost:{settings.PORT}")
+    print(f"🧵 Worker threads: {settings.ASGI_MAX_THREADS}")
+    print()
+    print("📋 Endpoints:")
+    print(f"   GET  /health - Health check")
+    print(f"   POST /chat   - Process chat message")
+    print(f"   GET  /tools  - List available tools")
+    print()
+    print("Press Ctrl+C to stop.\n")
+    
+    uvicorn.run(get_app(), host="0.0.0.0", port=settings.PORT, lifespan="on")
+
+
+if __name__ == "__main__":
+    main()
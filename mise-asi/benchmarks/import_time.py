@@ -0,0 +1,127 @@
+"""
+Import-time budget check for mise-asi
+Runs `python -X importtime` on an entry point in a fresh interpreter
+
+Fails (exit 1) when total import time exceeds the budget or when an SDK
+that should load lazily (openai, supabase, uagents) is imported at startup.
+With --health it also measures process spawn -> first /health response.
+
+Usage:
+    python benchmarks/import_time.py
+    python benchmarks/import_time.py --module asgi --budget-ms 300 --health
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# SDKs that must only load on first use
+DEFERRED_MODULES = ("openai", "supabase", "uagents")
+
+FIRST_PARTY = ("main", "asgi", "config", "adapters", "orchestration", "registry", "handlers", "utils", "uagent")
+
+HEALTH_PROBES = {
+    "main": (
+        "import main\n"
+        "response = main.app.test_client().get('/health')\n"
+        "assert response.status_code == 200, response.status_code\n"
+    ),
+    "asgi": (
+        "import asyncio, asgi\n"
+        "sent = []\n"
+        "async def receive(): return {'type': 'http.request', 'body': b''}\n"
+        "async def send(message): sent.append(message)\n"
+        "scope = {'type': 'http', 'method': 'GET', 'path': '/health', 'query_string': b'', 'headers': []}\n"
+        "asyncio.run(asgi.app(scope, receive, send))\n"
+        "assert sent[0]['status'] == 200, sent[0]['status']\n"
+    ),
+}
+
+
+def _env() -> dict:
+    path = os.pathsep.join(p for p in (str(ROOT), os.environ.get("PYTHONPATH", "")) if p)
+    return {**os.environ, "PYTHONPATH": path}
+
+
+def run_importtime(module: str) -> list[tuple[int, int, str]]:
+    """Return (self_us, cumulative_us, name) for every module imported by `import module`"""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        env=_env(),
+    )
+    if proc.returncode != 0:
+        sys.stderr.write(proc.stderr)
+        raise SystemExit(f"import {module} failed")
+
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((int(self_us), int(cumulative_us), name.rstrip()))
+    return rows
+
+
+def time_to_health(module: str) -> float:
+    """Milliseconds from spawning the interpreter to the first /health response"""
+    start = time.perf_counter()
+    subprocess.run(
+        [sys.executable, "-c", HEALTH_PROBES[module]],
+        cwd=ROOT,
+        check=True,
+        env=_env(),
+    )
+    return (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check import-time budget for an entry point")
+    parser.add_argument("--module", default="main", choices=sorted(HEALTH_PROBES))
+    parser.add_argument("--budget-ms", type=float, default=250.0, help="total import time budget")
+    parser.add_argument("--top", type=int, default=15, help="slowest modules to list")
+    parser.add_argument("--health", action="store_true", help="also time process start -> /health")
+    args = parser.parse_args()
+
+    rows = run_importtime(args.module)
+    total_ms = sum(self_us for self_us, _, _ in rows) / 1000
+    first_party_ms = sum(
+        self_us for self_us, _, name in rows
+        if name.strip().split(".")[0] in FIRST_PARTY
+    ) / 1000
+    loaded = {name.strip().split(".")[0] for _, _, name in rows}
+    eager_sdks = [m for m in DEFERRED_MODULES if m in loaded]
+
+    print(f"import {args.module}: {total_ms:.1f} ms total, {first_party_ms:.1f} ms in mise-asi modules")
+    print(f"budget: {args.budget_ms:.0f} ms")
+    print()
+    print(f"{'cumulative ms':>14}  {'self ms':>8}  module")
+    for self_us, cumulative_us, name in sorted(rows, key=lambda r: r[1], reverse=True)[:args.top]:
+        print(f"{cumulative_us / 1000:>14.1f}  {self_us / 1000:>8.1f}  {name.strip()}")
+
+    if args.health:
+        print()
+        print(f"process start -> /health: {time_to_health(args.module):.1f} ms")
+
+    failures = []
+    if total_ms > args.budget_ms:
+        failures.append(f"import time {total_ms:.1f} ms exceeds budget {args.budget_ms:.0f} ms")
+    if eager_sdks:
+        failures.append(f"imported at startup, should be lazy: {', '.join(eager_sdks)}")
+    if failures:
+        print()
+        for failure in failures:
+            print(f"FAIL: {failure}")
+        sys.exit(1)
+    print()
+    print("OK")
+
+
+if __name__ == "__main__":
+    main()
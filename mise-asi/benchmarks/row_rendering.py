@@ -0,0 +1,189 @@
+"""
+Row rendering benchmark for mise-asi
+Compares the dict-copy + string += renderers with the current renderers
+
+Builds synthetic Supabase rows (every column present, as the API returns
+them), then times and traces allocations for rendering the inventory,
+shopping list and leftovers the way getInventory/getShoppingList/
+getLeftovers do. No database or network is used.
+
+The current renderers read the response dicts directly. An earlier version
+decoded every row into a slotted object first; that cost about as much CPU
+as the dict copies it replaced (0.9x-1.3x end to end). Without it, at 2k and
+20k rows the renders measure 1.8x-2.4x faster than the old renderers, with
+about a third of the peak allocation.
+
+Usage:
+    python benchmarks/row_rendering.py
+    python benchmarks/row_rendering.py --rows 5000 --repeat 20
+"""
+import argparse
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from handlers.inventory_handlers import render_inventory  # noqa: E402
+from handlers.leftovers_handlers import render_leftovers  # noqa: E402
+from handlers.shopping_list_handlers import render_shopping_list  # noqa: E402
+
+CATEGORIES = ("Produce", "Dairy", "Meat", "Pantry", "Frozen", "Spices")
+TIMESTAMP = "2026-10-19T12:00:00.000000+00:00"
+USER_ID = "00000000-0000-0000-0000-000000000000"
+
+
+def inventory_rows(n: int) -> list[dict]:
+    return [
+        {
+            "id": f"inv-{i:08d}",
+            "user_id": USER_ID,
+            "item_name": f"ingredient {i}",
+            "quantity": i % 7 + 1,
+            "unit": "g" if i % 2 else "pcs",
+            "category": CATEGORIES[i % len(CATEGORIES)],
+            "location": "fridge" if i % 3 == 0 else None,
+            "notes": "opened" if i % 5 == 0 else None,
+            "expiry_date": "2026-11-01" if i % 4 == 0 else None,
+            "created_at": TIMESTAMP,
+            "updated_at": TIMESTAMP,
+        }
+        for i in range(n)
+    ]
+
+
+def shopping_rows(n: int) -> list[dict]:
+    return [
+        {
+            "id": f"shop-{i:08d}",
+            "user_id": USER_ID,
+            "item": f"item {i}",
+            "quantity": i % 4 or None,
+            "unit": "kg" if i % 3 else None,
+            "created_at": TIMESTAMP,
+            "updated_at": TIMESTAMP,
+        }
+        for i in range(n)
+    ]
+
+
+def leftover_rows(n: int) -> list[dict]:
+    return [
+        {
+            "id": f"left-{i:08d}",
+            "user_id": USER_ID,
+            "meal_name": f"meal {i}",
+            "servings": i % 4 + 1,
+            "notes": "spicy" if i % 2 else None,
+            "date_created": "2026-10-18",
+            "created_at": TIMESTAMP,
+            "updated_at": TIMESTAMP,
+        }
+        for i in range(n)
+    ]
+
+
+# Previous renderers, kept here as the baseline
+
+def _legacy_sanitize(data):
+    if isinstance(data, list):
+        return [_legacy_sanitize(item) for item in data]
+    sanitized = dict(data)
+    for field in ["id", "user_id", "created_at", "updated_at"]:
+        sanitized.pop(field, None)
+    return sanitized
+
+
+def legacy_inventory(rows: list[dict]) -> str:
+    items_by_category: dict[str, list] = {}
+    for item in _legacy_sanitize(rows):
+        category = item.get("category", "Other")
+        if category not in items_by_category:
+            items_by_category[category] = []
+        items_by_category[category].append(item)
+    text = "Current pantry and refrigerator inventory:\n\n"
+    for category, items in items_by_category.items():
+        text += f"**{category}:**\n"
+        for item in items:
+            line = f"- {item.get('quantity', '')} {item.get('unit', '')} of {item.get('item_name', '')}"
+            if item.get("location"):
+                line += f" (stored in {item['location']})"
+            if item.get("notes"):
+                line += f" - Notes: {item['notes']}"
+            text += line + "\n"
+        text += "\n"
+    text += "Use these ingredients to suggest meals that maximize the use of available items and minimize food waste."
+    return text
+
+
+def legacy_shopping_list(rows: list[dict]) -> str:
+    text = "Current shopping list:\n"
+    for item in _legacy_sanitize(rows):
+        name = item.get("item", "Unknown")
+        qty = item.get("quantity", "")
+        unit = item.get("unit", "")
+        if qty and unit:
+            text += f"- {qty} {unit} {name}\n"
+        elif qty:
+            text += f"- {qty} {name}\n"
+        else:
+            text += f"- {name}\n"
+    return text
+
+
+def legacy_leftovers(rows: list[dict]) -> str:
+    text = "**Current Leftovers:**\n"
+    for item in _legacy_sanitize(rows):
+        text += f"- {item.get('meal_name', 'Unknown')}: {item.get('servings', 0)} servings"
+        if item.get("notes"):
+            text += f" ({item['notes']})"
+        text += "\n"
+    return text
+
+
+CASES = {
+    "inventory": (inventory_rows, legacy_inventory, render_inventory),
+    "shopping_list": (shopping_rows, legacy_shopping_list, render_shopping_list),
+    "leftovers": (leftover_rows, legacy_leftovers, render_leftovers),
+}
+
+
+def measure(render, rows: list[dict], repeat: int) -> tuple[float, int]:
+    """(best milliseconds per call, peak bytes allocated during one call)"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        render(rows)
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    render(rows)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best * 1000, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark handler row rendering")
+    parser.add_argument("--rows", type=int, default=2000, help="rows per table")
+    parser.add_argument("--repeat", type=int, default=10, help="timed runs per renderer (best is reported)")
+    args = parser.parse_args()
+
+    print(f"{args.rows} rows, best of {args.repeat}")
+    print()
+    print(f"{'table':<14} {'renderer':<8} {'ms':>9} {'peak KiB':>10}")
+    for table, (make_rows, legacy, render) in CASES.items():
+        rows = make_rows(args.rows)
+        if legacy(rows) != render(rows):
+            raise SystemExit(f"{table}: current renderer output differs from legacy output")
+        legacy_ms, legacy_peak = measure(legacy, rows, args.repeat)
+        current_ms, current_peak = measure(render, rows, args.repeat)
+        print(f"{table:<14} {'legacy':<8} {legacy_ms:>9.2f} {legacy_peak / 1024:>10.1f}")
+        print(f"{'':<14} {'current':<8} {current_ms:>9.2f} {current_peak / 1024:>10.1f}"
+              f"   ({legacy_ms / current_ms:.1f}x faster, {legacy_peak / max(current_peak, 1):.1f}x less memory)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Meal plan -> shopping list diff benchmark for mise-asi
+Times shopping_list_deficit on synthetic meals, inventory and list rows
+
+Ingredient lines use a mix of units (g/kg/oz, ml/cup/tbsp, pieces) and
+names that only match partially ('fresh basil' vs 'basil'), so both the
+unit conversion and the fallback name match are exercised. No database
+or network is used.
+
+Usage:
+    python benchmarks/shopping_diff.py
+    python benchmarks/shopping_diff.py --meals 500 --ingredients 12 --distinct 400
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from utils import InventoryRow, ShoppingListRow, decode_rows, shopping_list_deficit  # noqa: E402
+
+UNITS = (("g", 150), ("kg", 0.5), ("oz", 4), ("ml", 200), ("cup", 1), ("tbsp", 2), ("", 3))
+
+
+def meals(n: int, per_meal: int, distinct: int) -> list[dict]:
+    return [
+        {
+            "name": f"meal {m}",
+            "ingredients": [
+                {
+                    "item": f"{'fresh ' if (m + i) % 9 == 0 else ''}ingredient {(m * per_meal + i) % distinct}",
+                    "quantity": UNITS[(m * per_meal + i) % distinct % len(UNITS)][1],
+                    "unit": UNITS[(m * per_meal + i) % distinct % len(UNITS)][0],
+                }
+                for i in range(per_meal)
+            ],
+        }
+        for m in range(n)
+    ]
+
+
+def inventory_rows(distinct: int) -> list[dict]:
+    # Every other ingredient is in stock, in the base unit of its recipes
+    base = {"g": "g", "kg": "g", "oz": "g", "ml": "ml", "cup": "ml", "tbsp": "ml", "": "piece"}
+    return [
+        {
+            "id": f"inv-{i:08d}",
+            "item_name": f"ingredient {i}",
+            "quantity": 400 if i % 4 == 0 else 50,
+            "unit": base[UNITS[i % len(UNITS)][0]],
+        }
+        for i in range(0, distinct, 2)
+    ]
+
+
+def shopping_rows(distinct: int) -> list[dict]:
+    return [
+        {"id": f"shop-{i:08d}", "item": f"ingredient {i}", "quantity": 1, "unit": UNITS[i % len(UNITS)][0]}
+        for i in range(1, distinct, 5)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--meals", type=int, default=300)
+    parser.add_argument("--ingredients", type=int, default=10, help="ingredient lines per meal")
+    parser.add_argument("--distinct", type=int, default=300, help="distinct ingredients")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    planned = meals(args.meals, args.ingredients, args.distinct)
+    inventory = decode_rows(InventoryRow, inventory_rows(args.distinct))
+    shopping_list = decode_rows(ShoppingListRow, shopping_rows(args.distinct))
+
+    diff = shopping_list_deficit(planned, inventory, shopping_list)
+    timings = []
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        shopping_list_deficit(planned, inventory, shopping_list)
+        timings.append(time.perf_counter() - start)
+    timings.sort()
+
+    print(
+        f"{diff['lines']} ingredient lines, {diff['ingredients']} distinct, "
+        f"{len(inventory)} inventory rows, {len(shopping_list)} list rows"
+    )
+    print(f"to buy {len(diff['to_buy'])}, covered {len(diff['covered'])}, check {len(diff['check'])}")
+    print(f"median {timings[len(timings) // 2] * 1000:.2f} ms, best {timings[0] * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -17,6 +17,14 @@ class Settings:
     FLASK_ENV: str = os.getenv("FLASK_ENV", "development")
     DEBUG: bool = FLASK_ENV == "development"
     
+    # ASGI server mode
+    ASGI_MAX_THREADS: int = int(os.getenv("ASGI_MAX_THREADS", "256"))
+    
+    # HTTP responses: JSON codec ("auto" uses orjson when installed, or "json") and
+    # gzip/brotli compression for bodies of at least COMPRESS_MIN_BYTES
+    JSON_CODEC: str = os.getenv("JSON_CODEC", "auto").lower()
+    COMPRESS_MIN_BYTES: int = int(os.getenv("COMPRESS_MIN_BYTES", "1024"))
+    
     # Supabase
     SUPABASE_URL: str = os.getenv("SUPABASE_URL", "")
     SUPABASE_KEY: str = os.getenv("SUPABASE_KEY", "")
@@ -25,9 +33,102 @@ class Settings:
     ASICLOUD_API_KEY: str = os.getenv("ASICLOUD_API_KEY", "")
     ASICLOUD_BASE_URL: str = os.getenv("ASICLOUD_BASE_URL", "https://inference.asicloud.cudos.org/v1")
     MODEL_NAME: str = os.getenv("MODEL_NAME", "openai/gpt-oss-20b")
+    # Optional small/fast model for tool selection and simple intents (empty disables the cascade)
+    SMALL_MODEL_NAME: str = os.getenv("SMALL_MODEL_NAME", "")
+    CASCADE_SIMPLE_MAX_WORDS: int = int(os.getenv("CASCADE_SIMPLE_MAX_WORDS", "12"))
+    
+    # Per-request time budget (clients may ask for less/more via deadline_ms, within limits)
+    CHAT_DEADLINE_SECONDS: float = float(os.getenv("CHAT_DEADLINE_SECONDS", "60"))
+    CHAT_MIN_DEADLINE_SECONDS: float = float(os.getenv("CHAT_MIN_DEADLINE_SECONDS", "1"))
+    CHAT_MAX_DEADLINE_SECONDS: float = float(os.getenv("CHAT_MAX_DEADLINE_SECONDS", "300"))
+    
+    # Chat front door scheduling (per-user fair queueing + rate limits)
+    SCHEDULER_ENABLED: bool = os.getenv("SCHEDULER_ENABLED", "true").lower() == "true"
+    SCHEDULER_MAX_IN_FLIGHT: int = int(os.getenv("SCHEDULER_MAX_IN_FLIGHT", "16"))
+    SCHEDULER_QUEUE_TIMEOUT: float = float(os.getenv("SCHEDULER_QUEUE_TIMEOUT", "30"))
+    SCHEDULER_MAX_QUEUE: int = int(os.getenv("SCHEDULER_MAX_QUEUE", "200"))
+    # Quota units are LLM iterations + tool calls
+    SCHEDULER_BUCKET_CAPACITY: float = float(os.getenv("SCHEDULER_BUCKET_CAPACITY", "60"))
+    SCHEDULER_REFILL_PER_SECOND: float = float(os.getenv("SCHEDULER_REFILL_PER_SECOND", "0.5"))
+    
+    # Batch chat (/chat/batch): jobs per batch, concurrent jobs per batch, batches kept for progress lookups
+    BATCH_MAX_JOBS: int = int(os.getenv("BATCH_MAX_JOBS", "1000"))
+    BATCH_MAX_CONCURRENCY: int = int(os.getenv("BATCH_MAX_CONCURRENCY", "8"))
+    BATCH_MAX_TRACKED: int = int(os.getenv("BATCH_MAX_TRACKED", "100"))
+    
+    # Answer cache: full answers reused while the user's sync version (pantry state) is unchanged
+    ANSWER_CACHE_ENABLED: bool = os.getenv("ANSWER_CACHE_ENABLED", "true").lower() == "true"
+    ANSWER_CACHE_TTL_SECONDS: float = float(os.getenv("ANSWER_CACHE_TTL_SECONDS", "1800"))
+    ANSWER_CACHE_MAX_ENTRIES: int = int(os.getenv("ANSWER_CACHE_MAX_ENTRIES", "5000"))
+    
+    # Delta sync (/sync): most change-log entries returned per response
+    SYNC_MAX_CHANGES: int = int(os.getenv("SYNC_MAX_CHANGES", "1000"))
+    # Change-log retention; clients syncing from older versions get a full snapshot
+    SYNC_LOG_RETENTION_DAYS: float = float(os.getenv("SYNC_LOG_RETENTION_DAYS", "30"))
+    
+    # Background jobs (enable in one process per deployment); off-peak window is UTC hours "start-end"
+    JOBS_ENABLED: bool = os.getenv("JOBS_ENABLED", "false").lower() == "true"
+    JOBS_OFF_PEAK_HOURS: str = os.getenv("JOBS_OFF_PEAK_HOURS", "1-6")
+    
+    # Precomputed weekly meal plans: off-peak sweep of recently active users plus
+    # quick refreshes for users whose "plan my week" missed the cache
+    MEAL_PLAN_SWEEP_INTERVAL_SECONDS: float = float(os.getenv("MEAL_PLAN_SWEEP_INTERVAL_SECONDS", "1800"))
+    MEAL_PLAN_REFRESH_INTERVAL_SECONDS: float = float(os.getenv("MEAL_PLAN_REFRESH_INTERVAL_SECONDS", "60"))
+    MEAL_PLAN_SWEEP_LIMIT: int = int(os.getenv("MEAL_PLAN_SWEEP_LIMIT", "200"))
+    MEAL_PLAN_CONCURRENCY: int = int(os.getenv("MEAL_PLAN_CONCURRENCY", "4"))
+    MEAL_PLAN_DEADLINE_SECONDS: float = float(os.getenv("MEAL_PLAN_DEADLINE_SECONDS", "180"))
+    MEAL_PLAN_MAX_AGE_HOURS: float = float(os.getenv("MEAL_PLAN_MAX_AGE_HOURS", "168"))
+    MEAL_PLAN_ACTIVE_DAYS: float = float(os.getenv("MEAL_PLAN_ACTIVE_DAYS", "14"))
+    
+    # Expiry scan: a set-based job rebuilds use_soon_items (inventory expiring within
+    # USE_SOON_WITHIN_DAYS, leftovers older than LEFTOVER_SHELF_LIFE_DAYS minus that,
+    # anything up to USE_SOON_EXPIRED_DAYS past due); chat turns get the top items as a note
+    USE_SOON_WITHIN_DAYS: int = int(os.getenv("USE_SOON_WITHIN_DAYS", "3"))
+    USE_SOON_EXPIRED_DAYS: int = int(os.getenv("USE_SOON_EXPIRED_DAYS", "7"))
+    LEFTOVER_SHELF_LIFE_DAYS: int = int(os.getenv("LEFTOVER_SHELF_LIFE_DAYS", "4"))
+    USE_SOON_REFRESH_INTERVAL_SECONDS: float = float(os.getenv("USE_SOON_REFRESH_INTERVAL_SECONDS", "3600"))
+    USE_SOON_INJECT: bool = os.getenv("USE_SOON_INJECT", "true").lower() == "true"
+    USE_SOON_INJECT_LIMIT: int = int(os.getenv("USE_SOON_INJECT_LIMIT", "5"))
+    USE_SOON_CACHE_SECONDS: float = float(os.getenv("USE_SOON_CACHE_SECONDS", "300"))
+    
+    # /chat retry de-duplication: identical in-flight requests share one run and
+    # successful results are replayed for CHAT_REPLAY_SECONDS
+    CHAT_DEDUP_ENABLED: bool = os.getenv("CHAT_DEDUP_ENABLED", "true").lower() == "true"
+    CHAT_REPLAY_SECONDS: float = float(os.getenv("CHAT_REPLAY_SECONDS", "30"))
+    CHAT_REPLAY_MAX_ENTRIES: int = int(os.getenv("CHAT_REPLAY_MAX_ENTRIES", "1000"))
+    
+    # Server-side conversation sessions: "memory" or "supabase" (memory tier + orchestrator_sessions table)
+    SESSION_STORE: str = os.getenv("SESSION_STORE", "memory").lower()
+    # Idle expiry in both tiers; with JOBS_ENABLED the sessions.prune job deletes expired rows
+    SESSION_TTL_SECONDS: float = float(os.getenv("SESSION_TTL_SECONDS", "86400"))
+    SESSION_MAX_SESSIONS: int = int(os.getenv("SESSION_MAX_SESSIONS", "10000"))
+    SESSION_MAX_MESSAGES: int = int(os.getenv("SESSION_MAX_MESSAGES", "40"))
+    
+    # Deterministic intent router for simple commands (skips the LLM when confident)
+    ROUTER_ENABLED: bool = os.getenv("ROUTER_ENABLED", "true").lower() == "true"
+    ROUTER_MIN_CONFIDENCE: float = float(os.getenv("ROUTER_MIN_CONFIDENCE", "0.75"))
+    
+    # Speculative prefetch of likely read tools during the first LLM call
+    SPECULATION_ENABLED: bool = os.getenv("SPECULATION_ENABLED", "true").lower() == "true"
+    SPECULATION_MAX_WORKERS: int = int(os.getenv("SPECULATION_MAX_WORKERS", "16"))
+    
+    # Tracing: "none", "jsonl" (local file) or "otlp" (OTLP/HTTP JSON collector)
+    TRACE_EXPORTER: str = os.getenv("TRACE_EXPORTER", "none").lower()
+    TRACE_FILE: str = os.getenv("TRACE_FILE", "traces/traces.jsonl")
+    TRACE_OTLP_ENDPOINT: str = os.getenv("TRACE_OTLP_ENDPOINT", "http://localhost:4318/v1/traces")
+    
+    # On-demand profiling: requests with X-Mise-Profile: <PROFILE_TOKEN> are profiled
+    # (disabled when PROFILE_TOKEN is empty); X-Mise-Profile-Allocations: true adds
+    # tracemalloc, which is process-wide and slows concurrent requests while it runs
+    PROFILE_TOKEN: str = os.getenv("PROFILE_TOKEN", "")
+    PROFILE_INTERVAL_MS: float = float(os.getenv("PROFILE_INTERVAL_MS", "5"))
+    PROFILE_TOP_ALLOCATIONS: int = int(os.getenv("PROFILE_TOP_ALLOCATIONS", "25"))
+    PROFILE_MAX_STORED: int = int(os.getenv("PROFILE_MAX_STORED", "50"))
+    PROFILE_DIR: str = os.getenv("PROFILE_DIR", "")
     
     # Agent
     AGENT_SEED: str = os.getenv("AGENT_SEED", "mise-asi-default-seed")
+    UAGENT_ENABLED: bool = os.getenv("UAGENT_ENABLED", "false").lower() == "true"
     
     @classmethod
     def validate(cls) -> list[str]:
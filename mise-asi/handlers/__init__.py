@@ -2,7 +2,20 @@
 Handlers Module
 Exports all domain handlers - Maps to: src/hooks/chat/functionHandlers.ts
 """
-from .types import FunctionCall, HandlerContext, sanitize_data_for_display
+import time
+from typing import Callable
+
+from registry import is_read_only_tool
+from utils import counter, histogram, span, current_deadline
+
+from .types import (
+    FunctionCall,
+    HandlerContext,
+    ToolResult,
+    function_call_record,
+    sanitize_data_for_display,
+)
+from .shared_results import SharedToolResults, current_shared_results, share_key, sharing_tool_results
 from .utility_handlers import handle_utility_functions
 from .inventory_handlers import handle_inventory_functions
 from .shopping_list_handlers import handle_shopping_list_functions
@@ -25,6 +38,8 @@ FUNCTION_HANDLERS = {
     "createInventoryItems": handle_inventory_functions,
     "updateInventoryItem": handle_inventory_functions,
     "deleteInventoryItem": handle_inventory_functions,
+    "getUseSoonItems": handle_inventory_functions,
+    "consumeMealIngredients": handle_inventory_functions,
     
     # Shopping List
     "showShoppingList": handle_shopping_list_functions,
@@ -34,10 +49,13 @@ FUNCTION_HANDLERS = {
     "getShoppingListItems": handle_shopping_list_functions,
     "createShoppingListItems": handle_shopping_list_functions,
     "deleteShoppingListItems": handle_shopping_list_functions,
+    "markPurchased": handle_shopping_list_functions,
+    "addMealPlanToShoppingList": handle_shopping_list_functions,
     
     # Meals
     "suggestMeal": handle_meal_functions,
     "updateMealPlan": handle_meal_functions,
+    "getMealPlan": handle_meal_functions,
     
     # Preferences
     "getUserPreferences": handle_preferences_functions,
@@ -66,6 +84,18 @@ FUNCTION_HANDLERS = {
     "clearAmazonSearchCache": handle_amazon_search_functions,
 }
 
+TOOL_CALLS = counter("mise_tool_calls_total", "Tool calls by tool name and status")
+TOOL_CALL_SECONDS = histogram("mise_tool_call_seconds", "Tool handler latency in seconds")
+
+# Called with (user_id, tool name) after any tool that may change user state runs
+_mutation_listeners: list[Callable[[str, str], None]] = []
+
+
+def add_mutation_listener(listener: Callable[[str, str], None]):
+    """Register a callback for mutating tool calls (e.g. to drop cached answers)"""
+    if listener not in _mutation_listeners:
+        _mutation_listeners.append(listener)
+
 
 def handle_function_call(function_call: FunctionCall, ctx: HandlerContext) -> str:
     """
@@ -75,16 +105,56 @@ def handle_function_call(function_call: FunctionCall, ctx: HandlerContext) -> st
     name = function_call["name"]
     handler = FUNCTION_HANDLERS.get(name)
     
+    deadline = current_deadline()
+    if handler and deadline is not None and deadline.expired():
+        TOOL_CALLS.inc(tool=name, status="deadline")
+        return f"Skipped {name}: the request ran out of time."
+    
+    shared = current_shared_results()
+    key = share_key(ctx.user_id, name, function_call.get("args")) if shared is not None else None
+    if handler and key is not None:
+        result = shared.get(key)
+        if result is not None:
+            TOOL_CALLS.inc(tool=name, status="shared")
+            ctx.log_step(f"✅ Executed: {name} (shared)")
+            return result
+    
     if handler:
-        return handler(function_call, ctx)
+        start = time.perf_counter()
+        status = "ok"
+        try:
+            with span(f"tool.{name}", tool=name) as tool_span:
+                result = handler(function_call, ctx)
+                tool_span.set(result_bytes=len(result.encode("utf-8")))
+            if key is not None:
+                shared.put(key, result)
+            elif shared is not None and not is_read_only_tool(name):
+                shared.invalidate_user(ctx.user_id)
+            return result
+        except Exception:
+            status = "error"
+            raise
+        finally:
+            TOOL_CALL_SECONDS.observe(time.perf_counter() - start, tool=name)
+            TOOL_CALLS.inc(tool=name, status=status)
+            # Handlers report failures as text, so any attempt counts as a change
+            if not is_read_only_tool(name):
+                for listener in _mutation_listeners:
+                    listener(ctx.user_id, name)
     
+    TOOL_CALLS.inc(tool=name, status="unknown")
     return f"Function '{name}' is not handled by any known handler."
 
 
 __all__ = [
     "FunctionCall",
     "HandlerContext",
+    "ToolResult",
+    "function_call_record",
     "sanitize_data_for_display",
     "FUNCTION_HANDLERS",
     "handle_function_call",
+    "add_mutation_listener",
+    "SharedToolResults",
+    "sharing_tool_results",
 ]
@@ -2,8 +2,23 @@
 Inventory Handlers
 Maps to: src/hooks/chat/handlers/inventoryHandlers.ts and crudInventoryHandlers.ts
 """
-from handlers.types import FunctionCall, HandlerContext, sanitize_data_for_display
-from utils import get_user_inventory, update_user_inventory
+from datetime import date
+
+from handlers.types import FunctionCall, HandlerContext, ToolResult, table_payload
+from utils import (
+    InventoryRow,
+    UseSoonRow,
+    consume_inventory_items,
+    convert,
+    decode_rows,
+    format_quantity,
+    ingredient_key,
+    match_ingredient,
+    parse_quantity,
+    get_use_soon_items,
+    get_user_inventory,
+    update_user_inventory,
+)
 
 
 def handle_inventory_functions(function_call: FunctionCall, ctx: HandlerContext) -> str:
@@ -24,6 +39,10 @@ def handle_inventory_functions(function_call: FunctionCall, ctx: HandlerContext)
         return handle_update_inventory_item(args, ctx)
     elif name == "deleteInventoryItem":
         return handle_delete_inventory_item(args, ctx)
+    elif name == "getUseSoonItems":
+        return handle_get_use_soon_items(ctx)
+    elif name == "consumeMealIngredients":
+        return handle_consume_meal_ingredients(args, ctx)
     
     return f"Unknown inventory function: {name}"
 
@@ -34,44 +53,52 @@ def handle_get_inventory(args: dict, ctx: HandlerContext) -> str:
         ctx.log_step("🔨 Retrieving current inventory data", "Loading all available ingredients", "active")
         
         inventory_items = get_user_inventory(ctx.user_id)
+        data = table_payload("user_inventory", inventory_items, None)
         
         if not inventory_items:
             ctx.log_step("✅ Executed: getInventory")
-            return "The pantry and refrigerator are currently empty. The user will need to go shopping before you can suggest meals based on available ingredients. Ask them what they'd like to cook and help them create a shopping list."
-        
-        sanitized_data = sanitize_data_for_display(inventory_items)
-        
-        # Organize by category
-        items_by_category: dict[str, list] = {}
-        for item in sanitized_data:
-            category = item.get("category", "Other")
-            if category not in items_by_category:
-                items_by_category[category] = []
-            items_by_category[category].append(item)
+            return ToolResult("The pantry and refrigerator are currently empty. The user will need to go shopping before you can suggest meals based on available ingredients. Ask them what they'd like to cook and help them create a shopping list.", data)
         
-        inventory_details = "Current pantry and refrigerator inventory:\n\n"
-        
-        for category, items in items_by_category.items():
-            inventory_details += f"**{category}:**\n"
-            for item in items:
-                line = f"- {item.get('quantity', '')} {item.get('unit', '')} of {item.get('item_name', '')}"
-                if item.get("location"):
-                    line += f" (stored in {item['location']})"
-                if item.get("notes"):
-                    line += f" - Notes: {item['notes']}"
-                inventory_details += line + "\n"
-            inventory_details += "\n"
-        
-        inventory_details += "Use these ingredients to suggest meals that maximize the use of available items and minimize food waste."
+        inventory_details = render_inventory(inventory_items)
         
         ctx.log_step("✅ Executed: getInventory")
-        return inventory_details
+        return ToolResult(inventory_details, data)
         
     except Exception as e:
         ctx.log_step("❌ getInventory failed")
         return f"I had trouble fetching your inventory: {str(e)}"
 
 
+def render_inventory(rows: list[dict]) -> str:
+    """
+    Inventory grouped by category (first-seen order), built with a single join
+    Reads the response rows directly: building row objects first costs as much as the render
+    """
+    items_by_category: dict[str, list[str]] = {}
+    for row in rows:
+        get = row.get
+        line = f"- {get('quantity', '')} {get('unit', '')} of {get('item_name', '')}"
+        location = get("location")
+        if location:
+            line += f" (stored in {location})"
+        notes = get("notes")
+        if notes:
+            line += f" - Notes: {notes}"
+        category = get("category", "Other")
+        lines = items_by_category.get(category)
+        if lines is None:
+            lines = items_by_category[category] = []
+        lines.append(line)
+    
+    parts = ["Current pantry and refrigerator inventory:\n"]
+    for category, lines in items_by_category.items():
+        parts.append(f"**{category}:**")
+        parts.extend(lines)
+        parts.append("")
+    parts.append("Use these ingredients to suggest meals that maximize the use of available items and minimize food waste.")
+    return "\n".join(parts)
+
+
 def handle_update_inventory(args: dict, ctx: HandlerContext) -> str:
     """Update inventory items - matches updateInventory handler"""
     try:
@@ -152,3 +179,132 @@ def handle_delete_inventory_item(args: dict, ctx: HandlerContext) -> str:
     except Exception as e:
         ctx.log_step("❌ deleteInventoryItem failed")
         return f"Failed to delete item: {str(e)}"
+
+
+def _when(use_by: date, today: date) -> str:
+    days = (use_by - today).days
+    if days < 0:
+        return f"{-days} day{'s' if days != -1 else ''} overdue"
+    if days == 0:
+        return "today"
+    if days == 1:
+        return "tomorrow"
+    return f"in {days} days"
+
+
+def _amount(item: UseSoonRow) -> str:
+    quantity = item.quantity
+    if isinstance(quantity, float) and quantity.is_integer():
+        quantity = int(quantity)
+    if quantity is None or quantity == "":
+        return ""
+    return f"{quantity} {item.unit} " if item.unit else f"{quantity} "
+
+
+def render_use_soon_line(item: UseSoonRow, today: date) -> str:
+    """One item, e.g. 2 l of Milk (inventory, use by 2026-10-20, tomorrow)"""
+    use_by = date.fromisoformat(str(item.use_by)[:10])
+    amount = _amount(item)
+    of = "of " if amount else ""
+    return f"{amount}{of}{item.name} ({item.source}, use by {use_by.isoformat()}, {_when(use_by, today)})"
+
+
+def render_use_soon(items: list[UseSoonRow], today: date) -> str:
+    """Use-soon list as markdown bullets, soonest first"""
+    lines = ["Items to use soon (from the last expiry scan):"]
+    lines.extend(f"- {render_use_soon_line(item, today)}" for item in items)
+    lines.append("Suggest meals that use these first to avoid waste.")
+    return "\n".join(lines)
+
+
+def handle_get_use_soon_items(ctx: HandlerContext) -> str:
+    """Read the user's materialized use-soon list (built by the expiry scan job)"""
+    try:
+        items = decode_rows(UseSoonRow, get_use_soon_items(ctx.user_id))
+        
+        ctx.log_step("✅ Executed: getUseSoonItems")
+        if not items:
+            return "Nothing in the inventory or leftovers is close to expiring."
+        return render_use_soon(items, date.today())
+        
+    except Exception as e:
+        ctx.log_step("❌ getUseSoonItems failed")
+        return f"Failed to get items to use soon: {str(e)}"
+
+
+def plan_consumption(ingredients: list[dict], inventory: list[InventoryRow]) -> tuple[dict[str, float], list[str]]:
+    """
+    Amounts to subtract per inventory row id (in the row's unit) for a meal's ingredients
+    Returns (amounts, reasons for ingredients that leave the inventory unchanged)
+    """
+    by_key = {ingredient_key(item.item_name): item for item in inventory}
+    amounts: dict[str, float] = {}
+    skipped: list[str] = []
+    for ingredient in ingredients:
+        name = ingredient.get("item") or ingredient.get("item_name") or ""
+        item = match_ingredient(name, by_key)
+        if item is None:
+            skipped.append(f"{name or 'unnamed ingredient'}: not in your inventory")
+            continue
+        quantity = parse_quantity(ingredient.get("quantity"))
+        if quantity is None or quantity <= 0:
+            skipped.append(f"{name}: no amount given")
+            continue
+        amount = convert(quantity, ingredient.get("unit"), item.unit)
+        if amount is None:
+            skipped.append(f"{name}: recipe uses {ingredient.get('unit')}, inventory tracks {item.unit}")
+            continue
+        amounts[item.id] = amounts.get(item.id, 0.0) + amount
+    return amounts, skipped
+
+
+def handle_consume_meal_ingredients(args: dict, ctx: HandlerContext) -> str:
+    """
+    Subtract a cooked meal's ingredients from the inventory in one transaction
+    Names are matched against the inventory and quantities converted to each item's unit;
+    optionally saves the leftover servings in the same round trip
+    """
+    try:
+        ingredients = args.get("ingredients") or []
+        meal_name = args.get("meal_name") or ""
+        leftover_servings = parse_quantity(args.get("leftover_servings"))
+        
+        if not ingredients:
+            return "No ingredients provided."
+        if leftover_servings and not meal_name:
+            return "Meal name is required to save leftovers."
+        
+        inventory = decode_rows(InventoryRow, get_user_inventory(ctx.user_id))
+        amounts, skipped = plan_consumption(ingredients, inventory)
+        leftover = None
+        if leftover_servings and leftover_servings > 0:
+            leftover = {"meal_name": meal_name, "servings": leftover_servings, "notes": args.get("leftover_notes") or ""}
+        
+        if not amounts and leftover is None:
+            ctx.log_step("✅ Executed: consumeMealIngredients (nothing to change)")
+            return "Your inventory was not changed:\n" + "\n".join(f"- {reason}" for reason in skipped)
+        
+        applied = consume_inventory_items(
+            ctx.user_id,
+            [{"id": row_id, "amount": round(amount, 4)} for row_id, amount in amounts.items()],
+            leftover,
+        )
+        
+        lines = [f"Updated your inventory after cooking {meal_name or 'the meal'}:"]
+        lines.extend(
+            f"- {row['item_name']}: {format_quantity(float(row['quantity']))} {row['unit']} left"
+            for row in applied.get("updated") or []
+        )
+        lines.extend(f"- {row['item_name']}: used up and removed" for row in applied.get("deleted") or [])
+        if skipped:
+            lines.append("Not changed:")
+            lines.extend(f"- {reason}" for reason in skipped)
+        if leftover is not None:
+            lines.append(f"Saved {format_quantity(leftover_servings)} serving(s) of {meal_name} as leftovers.")
+        
+        ctx.log_step("✅ Executed: consumeMealIngredients")
+        return "\n".join(lines)
+        
+    except Exception as e:
+        ctx.log_step("❌ consumeMealIngredients failed")
+        return f"Failed to update inventory for the meal: {str(e)}"
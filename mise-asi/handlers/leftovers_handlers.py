@@ -2,8 +2,8 @@
 Leftovers Handlers
 Maps to: src/hooks/chat/handlers/leftoverHandlers.ts and crudLeftoversHandlers.ts
 """
-from handlers.types import FunctionCall, HandlerContext, sanitize_data_for_display
-from utils import get_user_leftovers, add_leftover_item, update_leftover_item, delete_leftover_item
+from handlers.types import FunctionCall, HandlerContext, ToolResult, current_sync_version, table_payload
+from utils import LeftoverRow, get_user_leftovers, add_leftover_item, update_leftover_item, delete_leftover_item
 
 
 def handle_leftovers_functions(function_call: FunctionCall, ctx: HandlerContext) -> str:
@@ -27,36 +27,60 @@ def handle_leftovers_functions(function_call: FunctionCall, ctx: HandlerContext)
     return f"Unknown leftovers function: {name}"
 
 
+def _leftovers_payload(user_id: str, panel: bool = False) -> dict:
+    """Panel payloads carry the sync version; model reads skip that query"""
+    version = current_sync_version(user_id) if panel else None
+    return table_payload("user_leftovers", get_user_leftovers(user_id), version)
+
+
 def handle_get_leftovers(ctx: HandlerContext) -> str:
     """Get all leftovers"""
     try:
-        leftovers = get_user_leftovers(ctx.user_id)
+        data = _leftovers_payload(ctx.user_id)
+        leftovers = data["rows"]
         
         if not leftovers:
             ctx.log_step("✅ Executed: getLeftovers")
-            return "No leftovers stored. When the user has leftover meals, they can tell you to save them."
-        
-        sanitized = sanitize_data_for_display(leftovers)
+            return ToolResult("No leftovers stored. When the user has leftover meals, they can tell you to save them.", data)
         
-        result = "**Current Leftovers:**\n"
-        for item in sanitized:
-            result += f"- {item.get('meal_name', 'Unknown')}: {item.get('servings', 0)} servings"
-            if item.get("notes"):
-                result += f" ({item['notes']})"
-            result += "\n"
+        result = render_leftovers(leftovers)
         
         ctx.log_step("✅ Executed: getLeftovers")
-        return result
+        return ToolResult(result, data)
         
     except Exception as e:
         ctx.log_step("❌ getLeftovers failed")
         return f"Failed to get leftovers: {str(e)}"
 
 
+def _leftover_line(row: dict) -> str:
+    get = row.get
+    notes = get("notes")
+    if notes:
+        return f"- {get('meal_name', 'Unknown')}: {get('servings', 0)} servings ({notes})\n"
+    return f"- {get('meal_name', 'Unknown')}: {get('servings', 0)} servings\n"
+
+
+def render_leftovers(rows: list[dict]) -> str:
+    """Leftovers as markdown bullets, straight from the response rows"""
+    return "**Current Leftovers:**\n" + "".join(map(_leftover_line, rows))
+
+
+def _find_leftover(user_id: str, meal_name: str) -> LeftoverRow | None:
+    """Only the matching row is decoded"""
+    row = next((r for r in get_user_leftovers(user_id) if r.get("meal_name") == meal_name), None)
+    return LeftoverRow.from_dict(row) if row is not None else None
+
+
 def handle_show_leftovers(ctx: HandlerContext) -> str:
-    """Show leftovers panel"""
+    """Show leftovers panel, with the leftovers attached so the panel renders without a refetch"""
+    try:
+        data = _leftovers_payload(ctx.user_id, panel=True)
+    except Exception as e:
+        ctx.log_step("⚠️ Could not load leftovers", str(e))
+        data = None
     ctx.log_step("✅ Executed: showLeftovers")
-    return "Opening your leftovers..."
+    return ToolResult("Opening your leftovers...", data)
 
 
 def handle_add_leftover(args: dict, ctx: HandlerContext) -> str:
@@ -89,8 +113,7 @@ def handle_update_leftover(args: dict, ctx: HandlerContext) -> str:
         if not meal_name:
             return "Meal name is required."
         
-        leftovers = get_user_leftovers(ctx.user_id)
-        leftover = next((l for l in leftovers if l.get("meal_name") == meal_name), None)
+        leftover = _find_leftover(ctx.user_id, meal_name)
         
         if not leftover:
             return f"Leftover '{meal_name}' not found."
@@ -101,7 +124,7 @@ def handle_update_leftover(args: dict, ctx: HandlerContext) -> str:
         if "notes" in args:
             updates["notes"] = args["notes"]
         
-        update_leftover_item(leftover["id"], updates)
+        update_leftover_item(leftover.id, updates)
         
         ctx.log_step("✅ Executed: updateLeftover")
         return f"Updated '{meal_name}' leftover."
@@ -117,20 +140,19 @@ def handle_adjust_servings(args: dict, ctx: HandlerContext) -> str:
         meal_name = args.get("meal_name")
         adjustment = args.get("adjustment", 0)
         
-        leftovers = get_user_leftovers(ctx.user_id)
-        leftover = next((l for l in leftovers if l.get("meal_name") == meal_name), None)
+        leftover = _find_leftover(ctx.user_id, meal_name)
         
         if not leftover:
             return f"Leftover '{meal_name}' not found."
         
-        new_servings = leftover.get("servings", 0) + adjustment
+        new_servings = leftover.servings + adjustment
         
         if new_servings <= 0:
-            delete_leftover_item(leftover["id"])
+            delete_leftover_item(leftover.id)
             ctx.log_step("✅ Executed: adjustLeftoverServings (removed)")
             return f"'{meal_name}' has been finished and removed."
         
-        update_leftover_item(leftover["id"], {"servings": new_servings})
+        update_leftover_item(leftover.id, {"servings": new_servings})
         
         ctx.log_step("✅ Executed: adjustLeftoverServings")
         return f"'{meal_name}' now has {new_servings} servings."
@@ -147,13 +169,12 @@ def handle_remove_leftover(args: dict, ctx: HandlerContext) -> str:
         if not meal_name:
             return "Meal name is required."
         
-        leftovers = get_user_leftovers(ctx.user_id)
-        leftover = next((l for l in leftovers if l.get("meal_name") == meal_name), None)
+        leftover = _find_leftover(ctx.user_id, meal_name)
         
         if not leftover:
             return f"Leftover '{meal_name}' not found."
         
-        delete_leftover_item(leftover["id"])
+        delete_leftover_item(leftover.id)
         
         ctx.log_step("✅ Executed: removeLeftover")
         return f"Removed '{meal_name}' from leftovers."
@@ -3,6 +3,16 @@ Meal Handlers
 Maps to: src/hooks/chat/handlers/mealHandlers.ts
 """
 from handlers.types import FunctionCall, HandlerContext
+from utils import get_meal_plan, set_meal_plan_slot
+
+DAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+MEAL_TYPES = ["breakfast", "lunch", "dinner", "snack"]
+
+
+def normalize_day(day: str) -> str:
+    """'monday ' -> 'Monday'; unknown names are kept as given"""
+    name = day.strip().capitalize()
+    return name if name in DAYS else day.strip()
 
 
 def handle_meal_functions(function_call: FunctionCall, ctx: HandlerContext) -> str:
@@ -17,6 +27,8 @@ def handle_meal_functions(function_call: FunctionCall, ctx: HandlerContext) -> s
         return handle_suggest_meal(args, ctx)
     elif name == "updateMealPlan":
         return handle_update_meal_plan(args, ctx)
+    elif name == "getMealPlan":
+        return handle_get_meal_plan(ctx)
     
     return f"Unknown meal function: {name}"
 
@@ -75,8 +87,10 @@ def handle_update_meal_plan(args: dict, ctx: HandlerContext) -> str:
         if not day or not meal_type or not meal:
             return "Day, meal type, and meal data are required."
         
-        # In frontend, this updates UI state via setPlan
-        # Here we just return confirmation
+        # Stored in precomputed_meal_plans (the frontend keeps its own meal_plans)
+        day = normalize_day(day)
+        meal_type = meal_type.lower()
+        set_meal_plan_slot(ctx.user_id, day, meal_type, meal)
         meal_name = meal.get("name", "meal")
         
         ctx.log_step("✅ Executed: updateMealPlan")
@@ -85,3 +99,43 @@ def handle_update_meal_plan(args: dict, ctx: HandlerContext) -> str:
     except Exception as e:
         ctx.log_step("❌ updateMealPlan failed")
         return f"Failed to update meal plan: {str(e)}"
+
+
+def format_meal_plan(plan: dict) -> str:
+    """Render {day: {meal_type: meal}} as a day-by-day list"""
+    days = [d for d in DAYS if d in plan] + [d for d in plan if d not in DAYS]
+    result = ""
+    for day in days:
+        meals = plan[day] or {}
+        result += f"**{day}**\n"
+        types = [t for t in MEAL_TYPES if t in meals] + [t for t in meals if t not in MEAL_TYPES]
+        for meal_type in types:
+            meal = meals[meal_type] or {}
+            calories = f" ({meal['calories']} kcal)" if meal.get("calories") else ""
+            result += f"- {meal_type.capitalize()}: {meal.get('name', 'Meal')}{calories}\n"
+        result += "\n"
+    return result
+
+
+def handle_get_meal_plan(ctx: HandlerContext) -> str:
+    """Get the user's saved weekly meal plan"""
+    try:
+        row = get_meal_plan(ctx.user_id)
+        
+        if not row or not row.get("plan"):
+            ctx.log_step("✅ Executed: getMealPlan")
+            return "No weekly meal plan saved yet. Build one with updateMealPlan for each day and meal."
+        
+        result = "**Your meal plan for the week:**\n\n"
+        result += format_meal_plan(row["plan"])
+        if row.get("summary"):
+            result += f"💡 *{row['summary']}*\n"
+        if row.get("stale"):
+            result += "\n⚠️ Inventory, leftovers or preferences changed since this plan was made, so it may need updating.\n"
+        
+        ctx.log_step("✅ Executed: getMealPlan")
+        return result
+        
+    except Exception as e:
+        ctx.log_step("❌ getMealPlan failed")
+        return f"Failed to get meal plan: {str(e)}"
@@ -2,8 +2,8 @@
 Preferences Handlers
 Maps to: src/hooks/chat/handlers/preferenceHandlers.ts and crudPreferencesHandlers.ts
 """
-from handlers.types import FunctionCall, HandlerContext, sanitize_data_for_display
-from utils import get_user_preferences, update_user_preferences
+from handlers.types import FunctionCall, HandlerContext, ToolResult, table_payload
+from utils import PreferencesRow, get_user_preferences, update_user_preferences
 
 
 def handle_preferences_functions(function_call: FunctionCall, ctx: HandlerContext) -> str:
@@ -27,34 +27,38 @@ def handle_get_preferences(ctx: HandlerContext) -> str:
     """Get user preferences"""
     try:
         prefs = get_user_preferences(ctx.user_id)
+        data = table_payload("user_preferences", [prefs] if prefs else [], None)
         
         if not prefs:
             ctx.log_step("✅ Executed: getUserPreferences")
-            return "No preferences set yet. Ask the user about their dietary restrictions, allergies, and nutritional goals."
+            return ToolResult("No preferences set yet. Ask the user about their dietary restrictions, allergies, and nutritional goals.", data)
         
-        sanitized = sanitize_data_for_display(prefs)
-        
-        result = "**User Preferences:**\n\n"
-        
-        if sanitized.get("dietary_restrictions"):
-            result += f"🥗 Dietary restrictions: {', '.join(sanitized['dietary_restrictions'])}\n"
-        if sanitized.get("allergies"):
-            result += f"⚠️ Allergies: {', '.join(sanitized['allergies'])}\n"
-        if sanitized.get("calorie_goal"):
-            result += f"🔥 Daily calorie goal: {sanitized['calorie_goal']}\n"
-        if sanitized.get("protein_goal"):
-            result += f"💪 Daily protein goal: {sanitized['protein_goal']}g\n"
-        if sanitized.get("cuisine_preferences"):
-            result += f"🍽️ Preferred cuisines: {', '.join(sanitized['cuisine_preferences'])}\n"
+        result = render_preferences(PreferencesRow.from_dict(prefs))
         
         ctx.log_step("✅ Executed: getUserPreferences")
-        return result
+        return ToolResult(result, data)
         
     except Exception as e:
         ctx.log_step("❌ getUserPreferences failed")
         return f"Failed to get preferences: {str(e)}"
 
 
+def render_preferences(prefs: PreferencesRow) -> str:
+    """Preferences summary, one line per field that is set"""
+    lines = ["**User Preferences:**\n\n"]
+    if prefs.dietary_restrictions:
+        lines.append(f"🥗 Dietary restrictions: {', '.join(prefs.dietary_restrictions)}\n")
+    if prefs.allergies:
+        lines.append(f"⚠️ Allergies: {', '.join(prefs.allergies)}\n")
+    if prefs.calorie_goal:
+        lines.append(f"🔥 Daily calorie goal: {prefs.calorie_goal}\n")
+    if prefs.protein_goal:
+        lines.append(f"💪 Daily protein goal: {prefs.protein_goal}g\n")
+    if prefs.cuisine_preferences:
+        lines.append(f"🍽️ Preferred cuisines: {', '.join(prefs.cuisine_preferences)}\n")
+    return "".join(lines)
+
+
 def handle_update_preferences(args: dict, ctx: HandlerContext) -> str:
     """Update user preferences"""
     try:
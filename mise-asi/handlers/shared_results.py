@@ -0,0 +1,80 @@
+"""
+Shared tool results
+Lets several requests in one scope (e.g. a batch) reuse read-only tool results
+
+Inside sharing_tool_results(), a read-only tool call is answered from the
+shared cache when another request has already made it:
+1. User-independent tools (catalog searches) are keyed by their arguments
+   and shared across every user in the scope
+2. Other read-only tools are shared per user, for calls without arguments
+3. Volatile tools (getCurrentTime) are never shared
+Any other tool call for a user clears that user's entries, so later reads
+see the change.
+"""
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator
+
+from registry import USER_INDEPENDENT_TOOLS, VOLATILE_TOOLS, is_read_only_tool
+from utils import jsoncodec
+
+# (user_id or "" for user-independent results, tool name, canonical args)
+ShareKey = tuple[str, str, str]
+
+
+def share_key(user_id: str, name: str, args: dict | None) -> ShareKey | None:
+    """Key a tool call's result can be shared under, or None if it must run"""
+    if not is_read_only_tool(name) or name in VOLATILE_TOOLS:
+        return None
+    if name in USER_INDEPENDENT_TOOLS:
+        return ("", name, jsoncodec.dumps_str(args or {}, sort_keys=True))
+    if args:
+        return None
+    return (user_id, name, "")
+
+
+class SharedToolResults:
+    """Read-only tool results keyed by share_key()"""
+
+    def __init__(self):
+        self._results: dict[ShareKey, str] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: ShareKey) -> str | None:
+        with self._lock:
+            result = self._results.get(key)
+            if result is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return result
+
+    def put(self, key: ShareKey, result: str):
+        with self._lock:
+            self._results[key] = result
+
+    def invalidate_user(self, user_id: str):
+        """Drop the user's entries (user-independent results stay)"""
+        with self._lock:
+            for key in [k for k in self._results if k[0] == user_id]:
+                del self._results[key]
+
+
+_shared_results: ContextVar[SharedToolResults | None] = ContextVar("mise_shared_tool_results", default=None)
+
+
+def current_shared_results() -> SharedToolResults | None:
+    return _shared_results.get()
+
+
+@contextmanager
+def sharing_tool_results(shared: SharedToolResults) -> Iterator[SharedToolResults]:
+    """Share read-only tool results between all calls made inside the block"""
+    token = _shared_results.set(shared)
+    try:
+        yield shared
+    finally:
+        _shared_results.reset(token)
@@ -2,8 +2,26 @@
 Shopping List Handlers
 Maps to: src/hooks/chat/handlers/shoppingListHandlers.ts and crudShoppingListHandlers.ts
 """
-from handlers.types import FunctionCall, HandlerContext, sanitize_data_for_display
-from utils import get_user_shopping_list, add_shopping_list_items, remove_shopping_list_items
+from handlers.types import FunctionCall, HandlerContext, ToolResult, current_sync_version, table_payload
+from utils import (
+    InventoryRow,
+    ShoppingListRow,
+    convert,
+    decode_rows,
+    format_quantity,
+    get_meal_plan,
+    get_user_inventory,
+    get_user_shopping_list,
+    add_shopping_list_items,
+    ingredient_key,
+    mark_shopping_items_purchased,
+    match_ingredient,
+    normalize_unit,
+    parse_quantity,
+    remove_shopping_list_items,
+    shopping_list_deficit,
+)
+from handlers.meal_handlers import normalize_day
 
 
 def handle_shopping_list_functions(function_call: FunctionCall, ctx: HandlerContext) -> str:
@@ -22,47 +40,66 @@ def handle_shopping_list_functions(function_call: FunctionCall, ctx: HandlerCont
         return handle_add_to_shopping_list(args, ctx)
     elif name == "removeFromShoppingList" or name == "deleteShoppingListItems":
         return handle_remove_from_shopping_list(args, ctx)
+    elif name == "markPurchased":
+        return handle_mark_purchased(args, ctx)
+    elif name == "addMealPlanToShoppingList":
+        return handle_add_meal_plan_to_shopping_list(args, ctx)
     
     return f"Unknown shopping list function: {name}"
 
 
+def _shopping_list_payload(user_id: str, panel: bool = False) -> dict:
+    """Panel payloads carry the sync version; model reads skip that query"""
+    version = current_sync_version(user_id) if panel else None
+    return table_payload("shopping_lists", get_user_shopping_list(user_id), version)
+
+
 def handle_show_shopping_list(ctx: HandlerContext) -> str:
-    """Show shopping list panel"""
+    """Show shopping list panel, with the list attached so the panel renders without a refetch"""
+    try:
+        data = _shopping_list_payload(ctx.user_id, panel=True)
+    except Exception as e:
+        ctx.log_step("⚠️ Could not load shopping list items", str(e))
+        data = None
     ctx.log_step("✅ Executed: showShoppingList")
-    return "Opening your shopping list..."
+    return ToolResult("Opening your shopping list...", data)
 
 
 def handle_get_shopping_list(ctx: HandlerContext) -> str:
     """Get all shopping list items"""
     try:
-        items = get_user_shopping_list(ctx.user_id)
+        data = _shopping_list_payload(ctx.user_id)
+        items = data["rows"]
         
         if not items:
             ctx.log_step("✅ Executed: getShoppingList")
-            return "Your shopping list is empty."
-        
-        sanitized = sanitize_data_for_display(items)
-        
-        result = "Current shopping list:\n"
-        for item in sanitized:
-            name = item.get("item", "Unknown")
-            qty = item.get("quantity", "")
-            unit = item.get("unit", "")
-            if qty and unit:
-                result += f"- {qty} {unit} {name}\n"
-            elif qty:
-                result += f"- {qty} {name}\n"
-            else:
-                result += f"- {name}\n"
+            return ToolResult("Your shopping list is empty.", data)
+        
+        result = render_shopping_list(items)
         
         ctx.log_step("✅ Executed: getShoppingList")
-        return result
+        return ToolResult(result, data)
         
     except Exception as e:
         ctx.log_step("❌ getShoppingList failed")
         return f"Failed to get shopping list: {str(e)}"
 
 
+def _shopping_list_line(row: dict) -> str:
+    get = row.get
+    name, quantity, unit = get("item", "Unknown"), get("quantity", ""), get("unit", "")
+    if quantity and unit:
+        return f"- {quantity} {unit} {name}\n"
+    if quantity:
+        return f"- {quantity} {name}\n"
+    return f"- {name}\n"
+
+
+def render_shopping_list(rows: list[dict]) -> str:
+    """Shopping list as markdown bullets, straight from the response rows"""
+    return "Current shopping list:\n" + "".join(map(_shopping_list_line, rows))
+
+
 def handle_add_to_shopping_list(args: dict, ctx: HandlerContext) -> str:
     """Add items to shopping list"""
     try:
@@ -97,3 +134,211 @@ def handle_remove_from_shopping_list(args: dict, ctx: HandlerContext) -> str:
     except Exception as e:
         ctx.log_step("❌ removeFromShoppingList failed")
         return f"Failed to remove items: {str(e)}"
+
+
+def _purchases(args: dict, shopping_list: list[ShoppingListRow]) -> list[tuple[dict, list[ShoppingListRow]]]:
+    """(what was bought, shopping list rows it covers) for each bought item"""
+    if args.get("all"):
+        return [({"item": row.item}, [row]) for row in shopping_list]
+    
+    rows_by_key: dict[str, list[ShoppingListRow]] = {}
+    for row in shopping_list:
+        rows_by_key.setdefault(ingredient_key(row.item), []).append(row)
+    
+    purchases = []
+    for bought in args.get("items") or []:
+        rows = match_ingredient(bought.get("item") or "", rows_by_key) or []
+        # A row is moved once even if it is named twice
+        for other in rows:
+            rows_by_key[ingredient_key(other.item)] = []
+        purchases.append((bought, rows))
+    return purchases
+
+
+def plan_purchase(
+    purchases: list[tuple[dict, list[ShoppingListRow]]],
+    inventory: list[InventoryRow],
+) -> tuple[dict[str, float], list[dict], list[str], list[str]]:
+    """
+    Inventory changes for bought items, merging into existing items where units allow
+    Returns (amount to add per inventory row id, new inventory rows,
+    shopping list ids to remove, reasons for items left where they are)
+    """
+    inventory_by_key = {ingredient_key(item.item_name): item for item in inventory}
+    increments: dict[str, float] = {}
+    new_items: dict[str, dict] = {}
+    list_ids: list[str] = []
+    skipped: list[str] = []
+    
+    for bought, rows in purchases:
+        name = bought.get("item") or (rows[0].item if rows else "")
+        if not name:
+            continue
+        # The amount actually bought wins over what the list asked for
+        quantity = parse_quantity(bought.get("quantity"))
+        unit = bought.get("unit")
+        if quantity is None and rows:
+            unit = unit or rows[0].unit
+            quantity, same_unit = 0.0, []
+            for row in rows:
+                amount = convert(parse_quantity(row.quantity) or 1.0, row.unit, unit)
+                if amount is None:
+                    skipped.append(
+                        f"{row.item}: listed in {normalize_unit(row.unit)} and {normalize_unit(unit)}, move it separately"
+                    )
+                    continue
+                quantity += amount
+                same_unit.append(row)
+            if not same_unit:
+                continue
+            rows = same_unit
+        elif quantity is None:
+            quantity = 1.0
+        
+        existing = match_ingredient(name, inventory_by_key)
+        if existing is not None:
+            amount = convert(quantity, unit, existing.unit)
+            if amount is None:
+                skipped.append(f"{name}: bought in {unit}, inventory tracks {existing.item_name} in {existing.unit}")
+                continue
+            increments[existing.id] = increments.get(existing.id, 0.0) + amount
+        else:
+            key = ingredient_key(name)
+            pending = new_items.get(key)
+            if pending is None:
+                new_items[key] = {
+                    "item_name": rows[0].item if rows else name,
+                    "quantity": quantity,
+                    "unit": unit or "piece",
+                    "category": bought.get("category") or "Other",
+                    "expiry_date": bought.get("expiry_date"),
+                }
+            else:
+                amount = convert(quantity, unit, pending["unit"])
+                if amount is None:
+                    skipped.append(f"{name}: bought in {unit} and {pending['unit']}, add it separately")
+                    continue
+                pending["quantity"] += amount
+        list_ids.extend(row.id for row in rows)
+    
+    for item in new_items.values():
+        item["quantity"] = round(item["quantity"], 4)
+    return increments, list(new_items.values()), list_ids, skipped
+
+
+def handle_mark_purchased(args: dict, ctx: HandlerContext) -> str:
+    """
+    Move bought items from the shopping list into the inventory in one transaction
+    Quantities merge into matching inventory items (converted to their unit)
+    """
+    try:
+        if not args.get("all") and not args.get("items"):
+            return "No purchased items provided."
+        
+        shopping_list = decode_rows(ShoppingListRow, get_user_shopping_list(ctx.user_id))
+        inventory = decode_rows(InventoryRow, get_user_inventory(ctx.user_id))
+        increments, new_items, list_ids, skipped = plan_purchase(_purchases(args, shopping_list), inventory)
+        
+        if not increments and not new_items:
+            ctx.log_step("✅ Executed: markPurchased (nothing to move)")
+            if not skipped:
+                return "Your shopping list is empty, so there was nothing to move."
+            return "Nothing was moved:\n" + "\n".join(f"- {reason}" for reason in skipped)
+        
+        applied = mark_shopping_items_purchased(
+            ctx.user_id,
+            [{"id": row_id, "amount": round(amount, 4)} for row_id, amount in increments.items()],
+            new_items,
+            list_ids,
+        )
+        
+        lines = ["Added your purchases to the inventory:"]
+        lines.extend(
+            f"- {row['item_name']}: now {format_quantity(float(row['quantity']))} {row['unit']}"
+            for row in (applied.get("merged") or []) + (applied.get("added") or [])
+        )
+        removed = applied.get("removed") or 0
+        if removed:
+            lines.append(f"Removed {removed} item(s) from your shopping list.")
+        if skipped:
+            lines.append("Not moved:")
+            lines.extend(f"- {reason}" for reason in skipped)
+        
+        ctx.log_step("✅ Executed: markPurchased")
+        return "\n".join(lines)
+        
+    except Exception as e:
+        ctx.log_step("❌ markPurchased failed")
+        return f"Failed to move purchases into your inventory: {str(e)}"
+
+
+def _planned_meals(args: dict, user_id: str) -> list[dict]:
+    """Meals passed in the call, or the saved weekly plan's meals (optionally only some days)"""
+    if args.get("meals"):
+        return args["meals"]
+    row = get_meal_plan(user_id)
+    plan = (row or {}).get("plan") or {}
+    days = {normalize_day(day) for day in args.get("days") or []}
+    return [
+        meal
+        for day, meals in plan.items()
+        if not days or normalize_day(day) in days
+        for meal in (meals or {}).values()
+        if meal
+    ]
+
+
+def handle_add_meal_plan_to_shopping_list(args: dict, ctx: HandlerContext) -> str:
+    """
+    Add what the planned meals still need to the shopping list
+    Requirements are totalled, inventory and already-listed amounts subtracted
+    (utils/shopping_diff.py), and only the deficit is written, in one insert
+    """
+    try:
+        meals = _planned_meals(args, ctx.user_id)
+        if not meals:
+            ctx.log_step("✅ Executed: addMealPlanToShoppingList (no meals)")
+            return "No planned meals found. Pass the meals, or save a plan with updateMealPlan first."
+        
+        inventory = decode_rows(InventoryRow, get_user_inventory(ctx.user_id))
+        shopping_list = decode_rows(ShoppingListRow, get_user_shopping_list(ctx.user_id))
+        diff = shopping_list_deficit(meals, inventory, shopping_list)
+        to_buy = diff["to_buy"]
+        
+        without_ingredients = sum(1 for meal in meals if not meal.get("ingredients"))
+        if not diff["lines"]:
+            ctx.log_step("✅ Executed: addMealPlanToShoppingList (no ingredients)")
+            return (
+                f"None of the {len(meals)} planned meals list ingredients. "
+                "Pass the meals with their ingredients to build the shopping list."
+            )
+        
+        if to_buy and not args.get("dry_run"):
+            add_shopping_list_items(ctx.user_id, to_buy)
+        
+        if to_buy:
+            verb = "Would add" if args.get("dry_run") else "Added"
+            lines = [f"{verb} {len(to_buy)} item(s) to your shopping list:"]
+            lines.extend(
+                f"- {format_quantity(item['quantity'])} {item['unit']} {item['item']}"
+                if item["quantity"] is not None else f"- {item['item']}"
+                for item in to_buy
+            )
+        else:
+            lines = ["You already have or have listed everything these meals need."]
+        lines.append(
+            f"Checked {diff['lines']} ingredient line(s) from {len(meals)} meal(s); "
+            f"{len(diff['covered'])} ingredient(s) already covered."
+        )
+        if without_ingredients:
+            lines.append(f"{without_ingredients} meal(s) had no ingredient list and were skipped.")
+        if diff["check"]:
+            lines.append("Check these yourself (units can't be compared):")
+            lines.extend(f"- {reason}" for reason in diff["check"])
+        
+        ctx.log_step("✅ Executed: addMealPlanToShoppingList")
+        return "\n".join(lines)
+        
+    except Exception as e:
+        ctx.log_step("❌ addMealPlanToShoppingList failed")
+        return f"Failed to build the shopping list from your meal plan: {str(e)}"
@@ -5,6 +5,10 @@ Maps to: src/hooks/chat/handlers/handlerUtils.ts
 from typing import Callable, Any, TypedDict
 from dataclasses import dataclass
 
+from utils import DisplayView, get_logger, get_sync_state
+
+logger = get_logger(__name__)
+
 
 class FunctionCall(TypedDict):
     """Incoming function call from LLM - matches Gemini FunctionCall"""
@@ -26,23 +30,63 @@ class HandlerContext:
         self.add_thought_step(step, details, status)
 
 
+class ToolResult(str):
+    """
+    Handler text with an optional structured payload for the UI
+    It is the same string the model sees; `data` rides along so the adapter
+    can return rows without the client querying them again, e.g.
+    {"table": "shopping_lists", "rows": [...], "count": 3, "version": 42}
+    """
+    data: dict | None
+
+    def __new__(cls, text: str, data: dict | None = None):
+        result = super().__new__(cls, text)
+        result.data = data
+        return result
+
+
+def table_payload(table: str, rows: list[dict], version: int | None) -> dict:
+    """
+    Rows from one fetch, as the UI caches them
+    `version` is the delta-sync version read before the rows (see utils/sync.py),
+    so the client can continue with /sync?since=version. Panel tools read it;
+    reads made for the model pass None rather than spend a query on it.
+    """
+    return {"table": table, "rows": rows, "count": len(rows), "version": version}
+
+
+def current_sync_version(user_id: str) -> int | None:
+    """Sync version to stamp a payload with, or None if it cannot be read"""
+    try:
+        return get_sync_state(user_id)["version"]
+    except Exception as e:
+        logger.warning(f"Sync version unavailable for {user_id[:8]}: {e}")
+        return None
+
+
+def function_call_record(name: str, args: dict, result: str) -> dict:
+    """Entry for a response's function_calls, with the result's payload as "data" when it has one"""
+    record = {"name": name, "args": args, "result": result}
+    data = getattr(result, "data", None)
+    if data is not None:
+        record["data"] = data
+    return record
+
+
 # Type for handler functions
 HandlerFunction = Callable[[FunctionCall, HandlerContext], str]
 
 
 def sanitize_data_for_display(data: Any) -> Any:
     """
-    Remove sensitive fields from data before showing to user
+    Hide sensitive fields from data before showing to user
     Maps to: sanitizeDataForDisplay in handlerUtils.ts
+    Dicts come back as read-only DisplayView projections rather than copies
     """
     if isinstance(data, list):
         return [sanitize_data_for_display(item) for item in data]
     
     if isinstance(data, dict):
-        sanitized = dict(data)
-        # Remove sensitive fields
-        for field in ["id", "user_id", "created_at", "updated_at"]:
-            sanitized.pop(field, None)
-        return sanitized
+        return DisplayView(data)
     
     return data
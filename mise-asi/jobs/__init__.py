@@ -0,0 +1,69 @@
+"""
+Background Jobs Module
+"""
+from config import settings
+from utils import prune_orchestrator_sessions, prune_user_change_log
+
+from .scheduler import Job, JobScheduler, parse_hour_window
+from .meal_plans import precompute_meal_plans, refresh_requested_meal_plans, sweep_meal_plans
+from .use_soon import refresh_use_soon
+
+# Singleton instance
+_scheduler: JobScheduler | None = None
+
+
+def get_job_scheduler() -> JobScheduler:
+    """Get or create the job scheduler with the configured jobs registered"""
+    global _scheduler
+    if _scheduler is None:
+        _scheduler = JobScheduler(off_peak_hours=parse_hour_window(settings.JOBS_OFF_PEAK_HOURS))
+        _scheduler.add(
+            "meal_plans.sweep", sweep_meal_plans,
+            settings.MEAL_PLAN_SWEEP_INTERVAL_SECONDS, off_peak_only=True
+        )
+        _scheduler.add(
+            "meal_plans.refresh", refresh_requested_meal_plans,
+            settings.MEAL_PLAN_REFRESH_INTERVAL_SECONDS
+        )
+        _scheduler.add(
+            "use_soon.refresh", refresh_use_soon,
+            settings.USE_SOON_REFRESH_INTERVAL_SECONDS
+        )
+        _scheduler.add(
+            "sync.prune", lambda: prune_user_change_log(settings.SYNC_LOG_RETENTION_DAYS),
+            24 * 3600, off_peak_only=True
+        )
+        if settings.SESSION_STORE == "supabase":
+            _scheduler.add(
+                "sessions.prune", lambda: prune_orchestrator_sessions(settings.SESSION_TTL_SECONDS),
+                24 * 3600, off_peak_only=True
+            )
+    return _scheduler
+
+
+def start_jobs() -> bool:
+    """Start background jobs if JOBS_ENABLED; returns whether they run in this process"""
+    if not settings.JOBS_ENABLED:
+        return False
+    get_job_scheduler().start()
+    return True
+
+
+def stop_jobs():
+    """Stop background jobs if they were started"""
+    if _scheduler is not None:
+        _scheduler.stop()
+
+
+__all__ = [
+    "Job",
+    "JobScheduler",
+    "parse_hour_window",
+    "get_job_scheduler",
+    "start_jobs",
+    "stop_jobs",
+    "precompute_meal_plans",
+    "refresh_requested_meal_plans",
+    "sweep_meal_plans",
+    "refresh_use_soon",
+]
@@ -0,0 +1,72 @@
+"""
+Weekly Meal Plan Precomputation
+Generates plans through the orchestrator and stores them in precomputed_meal_plans
+
+Two jobs share precompute_meal_plans():
+1. sweep_meal_plans (off-peak) - users who asked for a plan in the last
+   MEAL_PLAN_ACTIVE_DAYS whose plan is stale, missing or older than
+   MEAL_PLAN_MAX_AGE_HOURS
+2. refresh_requested_meal_plans (any time) - users whose "plan my week"
+   request just missed the cache
+"""
+from datetime import datetime, timedelta, timezone
+
+from config import settings
+from orchestration import BatchJob, run_batch
+from orchestration.meal_plans import PRECOMPUTE_PROMPT, get_meal_plan_cache, plan_from_function_calls
+from utils import get_logger, counter, get_meal_plan_candidates, save_precomputed_meal_plan
+
+logger = get_logger(__name__)
+
+MEAL_PLANS_PRECOMPUTED = counter("mise_meal_plans_precomputed_total", "Background weekly plan runs by outcome")
+
+
+def precompute_meal_plans(user_ids: list[str]) -> dict:
+    """Generate and store a weekly plan for each user; returns outcome counts"""
+    counts = {"saved": 0, "empty": 0, "failed": 0}
+    if not user_ids:
+        return counts
+
+    # Plans are saved as fresh only if nothing changed after this point
+    started_at = datetime.now(timezone.utc).isoformat()
+    run = run_batch(
+        [BatchJob(job_id=user_id, user_id=user_id, message=PRECOMPUTE_PROMPT) for user_id in user_ids],
+        max_concurrency=settings.MEAL_PLAN_CONCURRENCY,
+        deadline_ms=settings.MEAL_PLAN_DEADLINE_SECONDS * 1000,
+        # Bounded by MEAL_PLAN_CONCURRENCY; never charged to the users' chat quota
+        background=True,
+    )
+    for result in run.results():
+        outcome = "failed"
+        if result["status"] == "ok":
+            plan = plan_from_function_calls(result.get("function_calls", []))
+            if not plan:
+                outcome = "empty"
+            else:
+                try:
+                    save_precomputed_meal_plan(result["user_id"], plan, result.get("text", ""), started_at)
+                    outcome = "saved"
+                except Exception as e:
+                    logger.error(f"Saving meal plan for {result['user_id'][:8]} failed: {e}")
+        counts[outcome] += 1
+        MEAL_PLANS_PRECOMPUTED.inc(outcome=outcome)
+
+    logger.info(f"Precomputed meal plans: {counts}")
+    return counts
+
+
+def sweep_meal_plans() -> dict:
+    """Refresh stale, missing or old plans of recently active users"""
+    now = datetime.now(timezone.utc)
+    user_ids = get_meal_plan_candidates(
+        active_since=(now - timedelta(days=settings.MEAL_PLAN_ACTIVE_DAYS)).isoformat(),
+        generated_before=(now - timedelta(hours=settings.MEAL_PLAN_MAX_AGE_HOURS)).isoformat(),
+        limit=min(settings.MEAL_PLAN_SWEEP_LIMIT, settings.BATCH_MAX_JOBS),
+    )
+    return precompute_meal_plans(user_ids)
+
+
+def refresh_requested_meal_plans() -> dict:
+    """Refresh plans for users whose last request missed the cache"""
+    user_ids = get_meal_plan_cache().take_refresh_requests(min(settings.MEAL_PLAN_SWEEP_LIMIT, settings.BATCH_MAX_JOBS))
+    return precompute_meal_plans(user_ids)
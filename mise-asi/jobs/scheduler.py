@@ -0,0 +1,160 @@
+"""
+Job Scheduler
+Runs periodic background jobs on a daemon thread
+
+Each job has an interval; off-peak jobs only start inside the configured
+UTC hour window (e.g. 1-6, which may wrap past midnight) and otherwise wait
+for it. Jobs run one at a time, so a slow job delays the others rather than
+overlapping with itself.
+"""
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable
+
+from utils import get_logger, counter, histogram
+
+logger = get_logger(__name__)
+
+JOB_RUNS = counter("mise_job_runs_total", "Background job runs by job and status")
+JOB_SECONDS = histogram(
+    "mise_job_seconds", "Background job duration in seconds",
+    buckets=(0.1, 0.5, 1, 5, 15, 60, 300, 900, 3600)
+)
+
+# Longest the loop sleeps before re-checking due jobs and the off-peak window
+_MAX_SLEEP = 60.0
+
+
+def parse_hour_window(value: str) -> tuple[int, int] | None:
+    """'1-6' -> (1, 6); empty or malformed -> None (no window)"""
+    start, sep, end = value.partition("-")
+    if not sep:
+        return None
+    try:
+        window = (int(start) % 24, int(end) % 24)
+    except ValueError:
+        return None
+    return window if window[0] != window[1] else None
+
+
+@dataclass
+class Job:
+    """A periodic background job"""
+    name: str
+    func: Callable[[], Any]
+    interval_seconds: float
+    off_peak_only: bool = False
+    next_run: float = 0.0
+    runs: int = 0
+    failures: int = 0
+    last_result: Any = None
+    last_error: str | None = None
+
+
+class JobScheduler:
+    """Runs registered jobs when they are due"""
+
+    def __init__(self, off_peak_hours: tuple[int, int] | None = None):
+        self.off_peak_hours = off_peak_hours
+        self.jobs: dict[str, Job] = {}
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def add(self, name: str, func: Callable[[], Any], interval_seconds: float, off_peak_only: bool = False) -> Job:
+        job = Job(name=name, func=func, interval_seconds=interval_seconds, off_peak_only=off_peak_only)
+        self.jobs[name] = job
+        return job
+
+    def in_off_peak(self, now: datetime | None = None) -> bool:
+        """True inside the off-peak window (always true when no window is set)"""
+        if self.off_peak_hours is None:
+            return True
+        hour = (now or datetime.now(timezone.utc)).hour
+        start, end = self.off_peak_hours
+        if start < end:
+            return start <= hour < end
+        return hour >= start or hour < end
+
+    def seconds_until_off_peak(self, now: datetime | None = None) -> float:
+        """0 inside the window, else seconds until it next opens"""
+        now = now or datetime.now(timezone.utc)
+        if self.in_off_peak(now):
+            return 0.0
+        opens = now.replace(hour=self.off_peak_hours[0], minute=0, second=0, microsecond=0)
+        if opens <= now:
+            opens += timedelta(days=1)
+        return (opens - now).total_seconds()
+
+    def trigger(self, name: str):
+        """Make a job due now (off-peak jobs still wait for the window)"""
+        self.jobs[name].next_run = 0.0
+        self._wake.set()
+
+    def run_pending(self) -> float:
+        """Run every due job; returns seconds until the next one is due"""
+        now = time.monotonic()
+        window_opens = self.seconds_until_off_peak()
+        for job in list(self.jobs.values()):
+            if job.next_run > now or (job.off_peak_only and window_opens):
+                continue
+            self._run(job)
+            job.next_run = time.monotonic() + job.interval_seconds
+        now = time.monotonic()
+        # A due off-peak job outside the window waits for the window, not 0 seconds
+        upcoming = [
+            max(job.next_run - now, window_opens if job.off_peak_only else 0.0)
+            for job in self.jobs.values()
+        ]
+        return max(0.0, min(upcoming)) if upcoming else _MAX_SLEEP
+
+    def _run(self, job: Job):
+        start = time.perf_counter()
+        status = "ok"
+        try:
+            job.last_result = job.func()
+            job.last_error = None
+        except Exception as e:
+            status = "error"
+            job.failures += 1
+            job.last_error = str(e)
+            logger.error(f"Job {job.name} failed: {e}")
+        finally:
+            job.runs += 1
+            JOB_SECONDS.observe(time.perf_counter() - start, job=job.name)
+            JOB_RUNS.inc(job=job.name, status=status)
+
+    def start(self):
+        """Start the scheduler thread (idempotent)"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._loop, name="mise-jobs", daemon=True)
+        self._thread.start()
+        logger.info(f"Job scheduler started: {', '.join(self.jobs) or 'no jobs'}")
+
+    def stop(self, timeout: float | None = 5.0):
+        """Stop after the current job finishes"""
+        self._stopped.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _loop(self):
+        while not self._stopped.is_set():
+            delay = self.run_pending()
+            self._wake.wait(min(delay, _MAX_SLEEP))
+            self._wake.clear()
+
+    def stats(self) -> dict:
+        """Per-job run counts for health reporting"""
+        return {
+            "off_peak": self.in_off_peak(),
+            "jobs": {
+                job.name: {"runs": job.runs, "failures": job.failures, "last_error": job.last_error}
+                for job in self.jobs.values()
+            },
+        }
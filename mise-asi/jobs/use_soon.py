@@ -0,0 +1,32 @@
+"""
+Expiry Scan
+Rebuilds every user's use-soon list (use_soon_items) in one set-based pass
+
+refresh_use_soon_items() in the database selects near-expiry inventory and
+aging leftovers for all users through date-indexed range scans, so a pass
+costs one round trip regardless of user count.
+"""
+import time
+
+from config import settings
+from orchestration.use_soon import get_use_soon_cache
+from utils import get_logger, counter, refresh_use_soon_items
+
+logger = get_logger(__name__)
+
+USE_SOON_ITEMS = counter("mise_use_soon_items_total", "Items materialized by expiry scan runs")
+
+
+def refresh_use_soon() -> int:
+    """Run the expiry scan; returns how many use-soon items were materialized"""
+    start = time.perf_counter()
+    count = refresh_use_soon_items(
+        within_days=settings.USE_SOON_WITHIN_DAYS,
+        leftover_shelf_days=settings.LEFTOVER_SHELF_LIFE_DAYS,
+        expired_days=settings.USE_SOON_EXPIRED_DAYS,
+    )
+    # Notes cached in this process predate the new lists
+    get_use_soon_cache().clear()
+    USE_SOON_ITEMS.inc(count)
+    logger.info(f"Expiry scan materialized {count} use-soon items in {time.perf_counter() - start:.2f}s")
+    return count
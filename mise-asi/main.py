@@ -7,6 +7,13 @@ Usage:
 
 Or with gunicorn (production):
     gunicorn -w 4 -b 0.0.0.0:8001 main:app
+
+The app is built on first access to `main.app` (or in main()), once per
+process, so importing this module starts nothing.
+
+For many concurrent slow conversations prefer the async server mode,
+which also hosts the uAgent on the same event loop:
+    uvicorn asgi:app --host 0.0.0.0 --port 8001
 """
 import sys
 from pathlib import Path
@@ -20,6 +27,24 @@ from utils import get_logger
 
 logger = get_logger(__name__)
 
+# Built on first use by get_app()
+_app = None
+
+
+def get_app():
+    """Get or create the Flask app for this process"""
+    global _app
+    if _app is None:
+        _app = create_app()
+    return _app
+
+
+def __getattr__(name: str):
+    # gunicorn resolves main:app through this
+    if name == "app":
+        return get_app()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 def main():
     """Main entry point"""
@@ -31,7 +56,7 @@ def main():
         logger.warning("Some features may not work correctly.")
     
     # Create Flask app
-    app = create_app()
+    app = get_app()
     
     # Print startup info
     print("🚀 mise-asi - ASI Orchestration Layer")
@@ -53,9 +78,5 @@ def main():
     )
 
 
-# For gunicorn
-app = create_app()
-
-
 if __name__ == "__main__":
     main()
@@ -2,11 +2,36 @@
 Orchestration Module
 """
 from .orchestrator import Orchestrator, get_orchestrator
+from .batch import BatchJob, BatchNotFound, BatchRun, get_batch, run_batch
+from .router import IntentRouter, get_router
+from .scheduler import (
+    FairScheduler,
+    SchedulerRejected,
+    SchedulerTimeout,
+    get_scheduler,
+    request_cost,
+)
+from .sessions import Session, SessionNotFound, get_session_manager
 from .types import OrchestratorRequest, OrchestratorResponse
 
 __all__ = [
     "Orchestrator",
     "get_orchestrator",
+    "BatchJob",
+    "BatchNotFound",
+    "BatchRun",
+    "get_batch",
+    "run_batch",
+    "IntentRouter",
+    "get_router",
+    "FairScheduler",
+    "SchedulerRejected",
+    "SchedulerTimeout",
+    "get_scheduler",
+    "request_cost",
+    "Session",
+    "SessionNotFound",
+    "get_session_manager",
     "OrchestratorRequest",
     "OrchestratorResponse",
 ]
@@ -0,0 +1,203 @@
+"""
+Answer Cache
+Reuses full orchestrator answers while the user's pantry state is unchanged
+
+The cache key is:
+1. The normalized message and a hash of the conversation history
+2. The user's sync version (one row read per request), which database
+   triggers bump on every change to inventory, shopping lists, leftovers
+   and preferences
+3. The use-soon note injected into the prompt, if any
+4. A per-user generation bumped by every mutating tool call
+
+An answer is stored only when the run finished normally, called nothing
+but read-only tools whose data the sync version covers, and the version
+read again after the run still matches - so an answer is never served for
+state other than the state it was computed from. Entries expire after
+ANSWER_CACHE_TTL_SECONDS and the least recently used are evicted beyond
+ANSWER_CACHE_MAX_ENTRIES.
+"""
+import copy
+import hashlib
+import re
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from config import settings
+from handlers import add_mutation_listener
+from registry import is_read_only_tool
+from utils import get_logger, counter, jsoncodec, get_sync_state
+
+from .speculation import get_prefetch_executor
+from .use_soon import get_use_soon_cache
+
+logger = get_logger(__name__)
+
+ANSWER_CACHE = counter("mise_answer_cache_total", "Answer cache lookups and stores by outcome")
+
+# Read-only tools whose results the sync version does not cover:
+# external or time-dependent data, and tables written by background jobs
+UNCACHEABLE_TOOLS = frozenset({
+    "getCurrentTime",
+    "searchAmazonProduct",
+    "searchMultipleAmazonProducts",
+    "getAmazonSearchResults",
+    "getMealPlan",
+    "getUseSoonItems",
+})
+
+_PUNCTUATION = re.compile(r"[^\w\s']+")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_message(message: str) -> str:
+    """'  What can I cook tonight?? ' -> 'what can i cook tonight'"""
+    return _WHITESPACE.sub(" ", _PUNCTUATION.sub(" ", message.lower())).strip()
+
+
+def _digest(value) -> str:
+    return hashlib.sha256(jsoncodec.dumps(value, sort_keys=True)).hexdigest()
+
+
+def state_version(user_id: str) -> int:
+    """The user's sync version; changes whenever a table the cache depends on does"""
+    return get_sync_state(user_id)["version"]
+
+
+def cache_key(
+    user_id: str,
+    message: str,
+    history: list[dict] | None,
+    state: int,
+    note: str | None,
+    generation: int,
+) -> str:
+    """Key for one request; system messages in the history are ignored"""
+    conversation = [(m.get("role"), m.get("content")) for m in history or [] if m.get("role") != "system"]
+    return _digest([user_id, normalize_message(message), conversation, state, note, generation])
+
+
+def cacheable(result: dict) -> bool:
+    """A normal answer that used only read-only tools covered by the sync version"""
+    return bool(result.get("text")) and all(
+        is_read_only_tool(call["name"]) and call["name"] not in UNCACHEABLE_TOOLS
+        for call in result.get("function_calls", [])
+    )
+
+
+@dataclass
+class Lookup:
+    """Key material for one request, kept so the answer can be stored later"""
+    user_id: str
+    key: str
+    state: int
+    generation: int
+    hit: dict | None = None
+
+
+@dataclass
+class _Entry:
+    user_id: str
+    result: dict
+    stored_at: float
+
+
+class AnswerCache:
+    """LRU + TTL cache of orchestrator answers keyed by message and pantry state"""
+
+    def __init__(self, max_entries: int = 5000, ttl_seconds: float = 1800):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self._generations: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def lookup(self, message: str, user_id: str, history: list[dict] | None) -> Lookup | None:
+        """
+        Key the request and return a cached answer in .hit if there is one
+        None when the pantry state cannot be read (the request is then not cached)
+        """
+        with self._lock:
+            generation = self._generations.get(user_id, 0)
+        try:
+            state = state_version(user_id)
+        except Exception as e:
+            logger.warning(f"Answer cache skipped, could not read state: {e}")
+            ANSWER_CACHE.inc(outcome="state_error")
+            return None
+
+        # The same note the orchestrator will inject (served from its own cache)
+        note = get_use_soon_cache().note(user_id) if settings.USE_SOON_INJECT else None
+        key = cache_key(user_id, message, history, state, note, generation)
+        lookup = Lookup(user_id=user_id, key=key, state=state, generation=generation)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.monotonic() - entry.stored_at > self.ttl_seconds:
+                del self._entries[key]
+                entry = None
+            if entry is not None:
+                self._entries.move_to_end(key)
+                lookup.hit = copy.deepcopy(entry.result)
+                lookup.hit["cache"] = {"hit": True, "age_seconds": round(time.monotonic() - entry.stored_at, 1)}
+        ANSWER_CACHE.inc(outcome="hit" if lookup.hit else "miss")
+        return lookup
+
+    def store(self, lookup: Lookup, result: dict):
+        """Cache a finished answer if it qualifies (verified in the background)"""
+        if not cacheable(result):
+            ANSWER_CACHE.inc(outcome="not_cacheable")
+            return
+        entry = _Entry(
+            user_id=lookup.user_id,
+            result={k: copy.deepcopy(result[k]) for k in ("text", "function_calls", "thought_steps")},
+            stored_at=time.monotonic(),
+        )
+        # Re-reading the version costs a DB round trip, so keep it off the response path
+        get_prefetch_executor().submit(self._store_if_unchanged, lookup, entry)
+
+    def _store_if_unchanged(self, lookup: Lookup, entry: _Entry):
+        try:
+            unchanged = state_version(lookup.user_id) == lookup.state
+        except Exception as e:
+            logger.warning(f"Answer cache store skipped: {e}")
+            unchanged = False
+        with self._lock:
+            if not unchanged or self._generations.get(lookup.user_id, 0) != lookup.generation:
+                ANSWER_CACHE.inc(outcome="state_changed")
+                return
+            self._entries[lookup.key] = entry
+            self._entries.move_to_end(lookup.key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        ANSWER_CACHE.inc(outcome="stored")
+
+    def invalidate_user(self, user_id: str, tool: str | None = None):
+        """Bump the user's generation and drop their entries"""
+        with self._lock:
+            self._generations[user_id] = self._generations.get(user_id, 0) + 1
+            for key in [k for k, e in self._entries.items() if e.user_id == user_id]:
+                del self._entries[key]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# Singleton instance
+_cache: AnswerCache | None = None
+_cache_lock = threading.Lock()
+
+
+def get_answer_cache() -> AnswerCache:
+    """Get or create answer cache singleton (invalidated by every mutating tool call)"""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = AnswerCache(
+                max_entries=settings.ANSWER_CACHE_MAX_ENTRIES,
+                ttl_seconds=settings.ANSWER_CACHE_TTL_SECONDS,
+            )
+            add_mutation_listener(_cache.invalidate_user)
+        return _cache
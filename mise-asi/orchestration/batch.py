@@ -0,0 +1,219 @@
+"""
+Batch Chat
+Runs many (user_id, message) jobs through the orchestrator concurrently
+
+A batch:
+1. Runs at most max_concurrency jobs at a time on its own worker pool,
+   each admitted through the fair scheduler like a normal /chat request
+   (background batches skip it: their pool bounds them, and they must not
+   spend the users' interactive quota)
+2. Shares read-only tool results between jobs (catalog searches across
+   users, user reads per user; see handlers.shared_results), and the
+   process-wide LLM and Supabase clients between all jobs
+3. Yields per-job results in completion order, with progress counts
+4. Can be cancelled: queued jobs are skipped and running jobs have their
+   deadline expired so they stop at the next LLM/tool/database step
+"""
+import queue
+import secrets
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from functools import partial
+from typing import Iterator
+
+from config import settings
+from handlers import SharedToolResults, sharing_tool_results
+from utils import get_logger, counter, Deadline
+
+from .orchestrator import get_orchestrator
+from .scheduler import SchedulerRejected, SchedulerTimeout, get_scheduler, request_cost
+
+logger = get_logger(__name__)
+
+BATCH_JOBS = counter("mise_batch_jobs_total", "Batch chat jobs by status")
+
+
+class BatchNotFound(Exception):
+    """Raised when a batch id is unknown or has been forgotten"""
+
+
+@dataclass
+class BatchJob:
+    """One message to process for one user"""
+    job_id: str
+    user_id: str
+    message: str
+    history: list[dict] = field(default_factory=list)
+
+
+class BatchRun:
+    """A running batch; iterate results() to receive job results as they finish"""
+
+    def __init__(
+        self,
+        jobs: list[BatchJob],
+        max_concurrency: int,
+        deadline_ms: int | float | None = None,
+        background: bool = False,
+    ):
+        self.batch_id = secrets.token_urlsafe(12)
+        self.jobs = jobs
+        self.max_concurrency = max(1, min(max_concurrency, settings.BATCH_MAX_CONCURRENCY))
+        self.deadline_ms = deadline_ms
+        self.background = background
+        self.shared = SharedToolResults()
+
+        self._results: queue.Queue[dict] = queue.Queue()
+        self._cancelled = threading.Event()
+        self._lock = threading.Lock()
+        self._running: dict[str, Deadline] = {}
+        self._counts = {"succeeded": 0, "failed": 0, "cancelled": 0}
+        self._executor: ThreadPoolExecutor | None = None
+
+    def start(self) -> "BatchRun":
+        """Queue every job on the batch's worker pool"""
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_concurrency,
+            thread_name_prefix=f"mise-batch-{self.batch_id[:6]}"
+        )
+        for job in self.jobs:
+            self._executor.submit(self._run_job, job)
+        # Workers exit once the queue drains; nothing waits on them
+        self._executor.shutdown(wait=False)
+        logger.info(f"Batch {self.batch_id} started: {len(self.jobs)} jobs, concurrency {self.max_concurrency}")
+        return self
+
+    def results(self, timeout: float | None = None) -> Iterator[dict]:
+        """
+        Job results in completion order, one per job
+        Raises queue.Empty if no result arrives within `timeout` seconds
+        """
+        for _ in range(len(self.jobs)):
+            yield self._results.get(timeout=timeout)
+
+    def cancel(self):
+        """Skip queued jobs and stop running ones at their next step"""
+        with self._lock:
+            if self._cancelled.is_set() or sum(self._counts.values()) == len(self.jobs):
+                return
+            self._cancelled.set()
+            running = list(self._running.values())
+        for deadline in running:
+            deadline.expire()
+        logger.info(f"Batch {self.batch_id} cancelled ({len(running)} jobs running)")
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def progress(self) -> dict:
+        with self._lock:
+            finished = sum(self._counts.values())
+            running = len(self._running)
+            counts = dict(self._counts)
+        total = len(self.jobs)
+        if finished == total:
+            state = "cancelled" if self.cancelled else "done"
+        else:
+            state = "cancelling" if self.cancelled else "running"
+        return {
+            "batch_id": self.batch_id,
+            "state": state,
+            "total": total,
+            "completed": finished,
+            "running": running,
+            "pending": total - finished - running,
+            **counts,
+            "shared_tool_hits": self.shared.hits,
+        }
+
+    def _run_job(self, job: BatchJob):
+        if self.cancelled:
+            self._finish(job, {"status": "cancelled"}, "cancelled")
+            return
+
+        deadline = Deadline.for_request(self.deadline_ms)
+        with self._lock:
+            self._running[job.job_id] = deadline
+        try:
+            with sharing_tool_results(self.shared):
+                result = self._execute(job, deadline)
+            if self.cancelled and deadline.expired():
+                self._finish(job, {"status": "cancelled", **result}, "cancelled")
+            else:
+                self._finish(job, {"status": "ok", **result}, "succeeded")
+        except SchedulerRejected as e:
+            self._finish(job, {"status": "rate_limited", "error": str(e), "retry_after": round(e.retry_after, 1)}, "failed")
+        except SchedulerTimeout as e:
+            self._finish(job, {"status": "busy", "error": str(e)}, "failed")
+        except Exception as e:
+            logger.error(f"Batch {self.batch_id} job {job.job_id} failed: {e}")
+            self._finish(job, {"status": "error", "error": str(e)}, "failed")
+
+    def _execute(self, job: BatchJob, deadline: Deadline) -> dict:
+        process = partial(
+            get_orchestrator().process_message,
+            message=job.message,
+            user_id=job.user_id,
+            history=job.history,
+            deadline=deadline
+        )
+        if self.background or not settings.SCHEDULER_ENABLED:
+            return process()
+        with get_scheduler().slot(job.user_id, timeout=deadline.remaining()) as ticket:
+            result = process()
+            ticket.charge(request_cost(result))
+            return result
+
+    def _finish(self, job: BatchJob, result: dict, outcome: str):
+        with self._lock:
+            self._running.pop(job.job_id, None)
+            self._counts[outcome] += 1
+        BATCH_JOBS.inc(status=result["status"])
+        self._results.put({"job_id": job.job_id, "user_id": job.user_id, **result})
+
+
+# Recent batches by id, for progress and cancellation
+_batches: OrderedDict[str, BatchRun] = OrderedDict()
+_batches_lock = threading.Lock()
+
+
+def run_batch(
+    jobs: list[BatchJob],
+    max_concurrency: int | None = None,
+    deadline_ms: int | float | None = None,
+    background: bool = False,
+) -> BatchRun:
+    """
+    Start a batch and return it; iterate run.results() for job results
+    background=True is for server-initiated work (jobs): no user quota is charged
+
+    Example:
+        run = run_batch([BatchJob("1", user_id, "Plan my week")], max_concurrency=8)
+        for result in run.results():
+            print(result["job_id"], result["status"], run.progress()["completed"])
+    """
+    if not jobs:
+        raise ValueError("A batch needs at least one job")
+    if len(jobs) > settings.BATCH_MAX_JOBS:
+        raise ValueError(f"A batch may contain at most {settings.BATCH_MAX_JOBS} jobs")
+    if len({job.job_id for job in jobs}) != len(jobs):
+        raise ValueError("Job ids must be unique within a batch")
+
+    run = BatchRun(jobs, max_concurrency or settings.BATCH_MAX_CONCURRENCY, deadline_ms, background)
+    with _batches_lock:
+        _batches[run.batch_id] = run
+        while len(_batches) > settings.BATCH_MAX_TRACKED:
+            _batches.popitem(last=False)
+    return run.start()
+
+
+def get_batch(batch_id: str) -> BatchRun:
+    """A recent batch by id"""
+    with _batches_lock:
+        run = _batches.get(batch_id)
+    if run is None:
+        raise BatchNotFound(batch_id)
+    return run
@@ -0,0 +1,99 @@
+"""
+Model Cascade
+Routes LLM iterations between a small fast model and the main model
+
+Tool-selection iterations and simple intents run on SMALL_MODEL_NAME.
+The tier is chosen before each call, so no answer is generated twice:
+1. A request that is not simple runs its turns that follow tool results
+   (where the final answer gets written) on the main MODEL_NAME
+2. A small-model tool call that fails validation (unknown tool, bad
+   JSON, missing required arguments) is redone on the main model; that
+   output is only a tool call, so the retry is cheap
+Disabled when SMALL_MODEL_NAME is empty.
+"""
+from typing import Any
+
+from config import settings
+from registry import TOOLS
+from utils import get_logger, counter, jsoncodec
+
+from .speculation import MEAL_PLANNING_PATTERN
+
+logger = get_logger(__name__)
+
+ESCALATIONS = counter("mise_llm_escalations_total", "Small-model turns escalated to the main model by reason")
+
+_TOOL_SCHEMAS = {tool["name"]: tool["input_schema"] for tool in TOOLS}
+
+
+def validate_tool_call(name: str, raw_args: Any) -> str | None:
+    """Return why a tool call is invalid, or None if it can be executed"""
+    schema = _TOOL_SCHEMAS.get(name)
+    if schema is None:
+        return f"unknown tool {name}"
+
+    if isinstance(raw_args, dict):
+        args = raw_args
+    elif not raw_args:
+        args = {}
+    else:
+        try:
+            args = jsoncodec.loads(raw_args)
+        except (TypeError, ValueError):
+            return f"unparseable arguments for {name}"
+        if not isinstance(args, dict):
+            return f"arguments for {name} are not an object"
+
+    missing = [field for field in schema.get("required", []) if field not in args]
+    if missing:
+        return f"{name} missing {', '.join(missing)}"
+    return None
+
+
+class ModelCascade:
+    """Chooses the model per iteration and decides when to escalate"""
+
+    def __init__(self, small_model: str, large_model: str, simple_max_words: int = 12):
+        self.small_model = small_model
+        self.large_model = large_model
+        self.simple_max_words = simple_max_words
+
+    def is_simple(self, message: str) -> bool:
+        """Short requests that are not about planning meals"""
+        return (
+            len(message.split()) <= self.simple_max_words
+            and not MEAL_PLANNING_PATTERN.search(message.lower())
+        )
+
+    def model_for(self, simple: bool, after_tools: bool) -> str:
+        """
+        Model for the next turn
+        Turns that follow tool results usually write the answer, so for a
+        request that is not simple they go straight to the main model
+        """
+        if after_tools and not simple:
+            return self.large_model
+        return self.small_model
+
+    def escalation_reason(self, response_message: Any) -> str | None:
+        """Why a small-model tool call must be redone on the main model, if at all"""
+        for tool_call in response_message.tool_calls or ():
+            problem = validate_tool_call(tool_call.function.name, tool_call.function.arguments)
+            if problem:
+                logger.info(f"Escalating: invalid tool call ({problem})")
+                return "invalid_tool_call"
+        return None
+
+    def record_escalation(self, reason: str):
+        ESCALATIONS.inc(reason=reason)
+
+
+def get_cascade() -> ModelCascade | None:
+    """Cascade configured from settings, or None when no small model is set"""
+    if not settings.SMALL_MODEL_NAME or settings.SMALL_MODEL_NAME == settings.MODEL_NAME:
+        return None
+    return ModelCascade(
+        settings.SMALL_MODEL_NAME,
+        settings.MODEL_NAME,
+        simple_max_words=settings.CASCADE_SIMPLE_MAX_WORDS,
+    )
@@ -0,0 +1,130 @@
+"""
+Precomputed Meal Plans
+Serves "plan my week" from the precomputed_meal_plans table
+
+Plans are written by the background precompute job (jobs.meal_plans) and
+by updateMealPlan. Database triggers mark a plan stale whenever the user's
+inventory, leftovers or preferences change. A fresh, complete precomputed
+plan answers "plan my week" straight from the table; otherwise the request
+falls through to the LLM loop and is queued for a background refresh so
+the next request is a cache read. Requests that only show the saved plan
+never queue a refresh.
+"""
+import threading
+from datetime import datetime, timedelta, timezone
+
+from config import settings
+from handlers.meal_handlers import DAYS, normalize_day
+from utils import get_logger, counter, get_meal_plan, touch_meal_plan_request
+
+logger = get_logger(__name__)
+
+MEAL_PLAN_LOOKUPS = counter("mise_meal_plan_lookups_total", "Weekly plan requests by outcome (hit, stale, missing)")
+
+PRECOMPUTE_PROMPT = (
+    "Create my meal plan for the next 7 days with breakfast, lunch and dinner each day. "
+    "Check my inventory, leftovers and preferences first and use up what I already have. "
+    "Save every meal with updateMealPlan, then reply with a two-sentence summary of the week."
+)
+
+
+def plan_from_function_calls(function_calls: list[dict]) -> dict:
+    """Assemble {day: {meal_type: meal}} from the updateMealPlan calls of a run"""
+    plan: dict[str, dict] = {}
+    for call in function_calls:
+        if call.get("name") != "updateMealPlan":
+            continue
+        args = call.get("args") or {}
+        day, meal_type, meal = args.get("day"), args.get("meal_type"), args.get("meal")
+        if not day or not meal_type or not meal:
+            continue
+        plan.setdefault(normalize_day(day), {})[meal_type.lower()] = meal
+    return plan
+
+
+def _parse_time(value: str | None) -> datetime | None:
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        return None
+
+
+def plan_is_fresh(row: dict | None, now: datetime | None = None) -> bool:
+    """
+    A complete precomputed plan that is not stale and was generated less
+    than MEAL_PLAN_MAX_AGE_HOURS ago
+    Rows started by chat updateMealPlan calls (source 'chat', no
+    generated_at) may hold a single slot, so they never count as a week.
+    """
+    if not row or row.get("stale") or row.get("source") != "precomputed":
+        return False
+    generated = _parse_time(row.get("generated_at"))
+    if generated is None:
+        return False
+    plan = row.get("plan") or {}
+    if any(not plan.get(day) for day in DAYS):
+        return False
+    now = now or datetime.now(timezone.utc)
+    return now - generated < timedelta(hours=settings.MEAL_PLAN_MAX_AGE_HOURS)
+
+
+class MealPlanCache:
+    """Freshness checks for stored plans plus the queue of users needing a refresh"""
+
+    def __init__(self):
+        self._refresh: set[str] = set()
+        self._lock = threading.Lock()
+
+    def lookup(self, user_id: str) -> bool:
+        """
+        True when the user's stored plan can be served as a weekly plan
+        Otherwise the user (who asked for a plan) is queued for a background refresh
+        """
+        row = get_meal_plan(user_id)
+        fresh = plan_is_fresh(row)
+        MEAL_PLAN_LOOKUPS.inc(outcome="hit" if fresh else "stale" if row and row.get("plan") else "missing")
+        self._note_request(user_id, row)
+        if not fresh:
+            self.request_refresh(user_id)
+        return fresh
+
+    def request_refresh(self, user_id: str):
+        with self._lock:
+            self._refresh.add(user_id)
+
+    def take_refresh_requests(self, limit: int) -> list[str]:
+        """Up to `limit` queued users, removed from the queue"""
+        with self._lock:
+            taken = list(self._refresh)[:limit]
+            self._refresh.difference_update(taken)
+            return taken
+
+    def pending(self) -> int:
+        with self._lock:
+            return len(self._refresh)
+
+    @staticmethod
+    def _note_request(user_id: str, row: dict | None):
+        """Keep requested_at current (at most hourly) so the user stays in the sweep"""
+        now = datetime.now(timezone.utc)
+        requested = _parse_time(row.get("requested_at")) if row else None
+        if requested is not None and now - requested < timedelta(hours=1):
+            return
+        try:
+            touch_meal_plan_request(user_id, now.isoformat())
+        except Exception as e:
+            logger.warning(f"Could not record plan request for {user_id[:8]}: {e}")
+
+
+# Singleton instance
+_cache: MealPlanCache | None = None
+
+
+def get_meal_plan_cache() -> MealPlanCache:
+    """Get or create meal plan cache singleton"""
+    global _cache
+    if _cache is None:
+        _cache = MealPlanCache()
+    return _cache
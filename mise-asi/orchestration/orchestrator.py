@@ -8,17 +8,54 @@ This orchestrator:
 3. Executes function calls via handlers
 4. Returns final response
 """
-import json
+import hashlib
+import time
 from typing import Any
-from openai import OpenAI
 
 from config import settings
-from registry import TOOLS
-from handlers import handle_function_call, FunctionCall, HandlerContext
-from utils import get_logger
+from registry import TOOLS, is_read_only_tool
+from handlers import handle_function_call, function_call_record, FunctionCall, HandlerContext
+from utils import (
+    get_logger,
+    jsoncodec,
+    counter,
+    histogram,
+    start_trace,
+    span,
+    current_span,
+    Deadline,
+    deadline_scope,
+)
+
+from .answer_cache import get_answer_cache
+from .cascade import get_cascade
+from .router import get_router
+from .speculation import start_speculation
+from .use_soon import get_use_soon_cache
 
 logger = get_logger(__name__)
 
+CHAT_REQUESTS = counter("mise_chat_requests_total", "Orchestrated chat requests by outcome")
+CHAT_REQUEST_SECONDS = histogram("mise_chat_request_seconds", "End-to-end process_message latency in seconds")
+CHAT_ITERATIONS = histogram(
+    "mise_chat_iterations", "LLM iterations per chat request", buckets=(1, 2, 3, 4, 5, 6, 8, 10)
+)
+CHAT_TOOL_CALLS = histogram(
+    "mise_chat_tool_calls", "Tool calls per chat request", buckets=(0, 1, 2, 3, 5, 8, 13, 20)
+)
+LLM_REQUEST_SECONDS = histogram("mise_llm_request_seconds", "LLM call latency in seconds by model and iteration")
+LLM_REQUESTS = counter("mise_llm_requests_total", "LLM calls by model and status")
+LLM_TOKENS = counter("mise_llm_tokens_total", "LLM token usage by model and kind")
+LLM_CACHED_RATIO = histogram(
+    "mise_llm_cached_prompt_ratio", "Share of prompt tokens served from the provider prefix cache",
+    buckets=(0.0, 0.1, 0.25, 0.5, 0.75, 0.9, 1.0)
+)
+
+
+def canonical_json(value: Any) -> str:
+    """Byte-stable JSON: sorted keys, compact separators, unescaped unicode"""
+    return jsoncodec.dumps_str(value, sort_keys=True)
+
 
 # System prompt - matches src/lib/prompts/systemPrompt.ts
 SYSTEM_PROMPT = """You are Mise, a helpful AI meal planning assistant. You help users:
@@ -47,30 +84,119 @@ class Orchestrator:
         if not settings.ASICLOUD_API_KEY:
             raise ValueError("ASICLOUD_API_KEY not configured")
         
+        # Imported here so the SDK only loads when the first chat arrives
+        from openai import OpenAI
+        
         self.client = OpenAI(
             api_key=settings.ASICLOUD_API_KEY,
             base_url=settings.ASICLOUD_BASE_URL
         )
         self.model = settings.MODEL_NAME
+        # Small model for tool selection / simple intents; None = single model
+        self.cascade = get_cascade()
         self.temperature = 0.7
         self.max_iterations = 5
+        
+        # Tools are serialized once in a fixed order with sorted keys so every
+        # request starts with the same bytes (system prompt + tools) and the
+        # provider's prefix cache can be reused across iterations and users
+        self.openai_tools = self._convert_tools_to_openai_format()
+        self.prefix_hash = hashlib.sha256(
+            (SYSTEM_PROMPT + canonical_json(self.openai_tools)).encode("utf-8")
+        ).hexdigest()[:16]
     
     def process_message(
         self, 
         message: str, 
         user_id: str,
-        history: list[dict] | None = None
+        history: list[dict] | None = None,
+        include_trace: bool = False,
+        deadline: Deadline | None = None
     ) -> dict:
         """
         Process a user message through the orchestration loop
-        Returns: {"text": str, "function_calls": list, "thought_steps": list}
+        The deadline (default CHAT_DEADLINE_SECONDS from now) bounds LLM, tool and DB work;
+        when it cannot fit another iteration the answer is built from tool results so far
+        Returns: {"text": str, "function_calls": list, "thought_steps": list, "iterations": int, "usage": dict}
+        plus "route" when the intent router answered without the LLM (iterations is then 0),
+        "cache" when the answer came from the answer cache (iterations is then 0)
+        and "trace" (the span tree) when include_trace is set
         """
+        deadline = deadline or Deadline.for_request()
+        with deadline_scope(deadline), start_trace(
+            "chat.request",
+            user=user_id[:8],
+            message_chars=len(message),
+            history_messages=len(history or []),
+            deadline_seconds=round(deadline.remaining(), 3)
+        ) as root:
+            result = self._route(message, user_id)
+            if result is not None:
+                root.set(route=result["route"]["intent"])
+            else:
+                result = self._answer(message, user_id, history, deadline)
+            root.set(iterations=result["iterations"], tool_calls=len(result["function_calls"]))
+            if "usage" in result:
+                root.set(**result["usage"])
+        
+        if include_trace:
+            result["trace"] = root.to_dict()
+        return result
+    
+    def _route(self, message: str, user_id: str) -> dict | None:
+        """Answer simple commands through the intent router, skipping the LLM"""
+        if not settings.ROUTER_ENABLED:
+            return None
+        start = time.perf_counter()
+        with span("router") as router_span:
+            result = get_router().route(message, user_id)
+            router_span.set(routed=result is not None)
+        if result is not None:
+            CHAT_REQUESTS.inc(outcome="routed")
+            CHAT_REQUEST_SECONDS.observe(time.perf_counter() - start)
+            CHAT_TOOL_CALLS.observe(len(result["function_calls"]))
+        return result
+    
+    def _answer(self, message: str, user_id: str, history: list[dict] | None, deadline: Deadline) -> dict:
+        """Serve from the answer cache when the pantry state is unchanged, else run the loop"""
+        lookup = None
+        if settings.ANSWER_CACHE_ENABLED:
+            start = time.perf_counter()
+            with span("answer_cache") as cache_span:
+                lookup = get_answer_cache().lookup(message, user_id, history)
+                cache_span.set(hit=bool(lookup and lookup.hit))
+            if lookup and lookup.hit:
+                CHAT_REQUESTS.inc(outcome="cached")
+                CHAT_REQUEST_SECONDS.observe(time.perf_counter() - start)
+                return {**lookup.hit, "iterations": 0}
+        
+        result = self._process_message(message, user_id, history, deadline)
+        outcome = result.pop("outcome")
+        if lookup is not None and outcome == "answered":
+            get_answer_cache().store(lookup, result)
+        return result
+    
+    def _process_message(
+        self,
+        message: str,
+        user_id: str,
+        history: list[dict] | None,
+        deadline: Deadline
+    ) -> dict:
+        """Run the orchestration loop inside the request trace"""
+        request_start = time.perf_counter()
+        outcome = "answered"
         thought_steps: list[str] = []
         function_calls_made: list[dict] = []
         
         def add_thought_step(step: str, details: str | None = None, status: str = "completed"):
             thought_steps.append(step)
             logger.info(f"Thought: {step}")
+            active = current_span()
+            if active is not None:
+                active.add_event("thought_step", step=step, details=details, status=status)
+                if step.startswith("❌"):
+                    active.set_error(step)
         
         # Create handler context
         ctx = HandlerContext(
@@ -78,137 +204,264 @@ class Orchestrator:
             add_thought_step=add_thought_step
         )
         
-        # Build messages
-        messages = history or []
+        # Build messages on a copy - the caller's history (or a stored session) is not modified
+        messages = list(history or [])
         # Ensure system prompt is first
         if not messages or messages[0].get("role") != "system":
             messages.insert(0, {"role": "system", "content": SYSTEM_PROMPT})
+        
+        # Near-expiry items go after the cached prefix (system prompt + history)
+        if settings.USE_SOON_INJECT:
+            with span("use_soon") as use_soon_span:
+                note = get_use_soon_cache().note(user_id)
+                use_soon_span.set(injected=note is not None)
+            if note:
+                messages.append({"role": "system", "content": note})
             
         messages.append({"role": "user", "content": message})
         
-        # Convert tools to OpenAI format
-        openai_tools = self._convert_tools_to_openai_format()
+        usage_totals = {"prompt_tokens": 0, "cached_prompt_tokens": 0, "completion_tokens": 0}
+        
+        # Prefetch likely read tools so they run behind the first LLM call
+        speculation = start_speculation(message, ctx)
         
         iteration = 0
         final_response = ""
+        answered = False
+        # Slowest LLM call so far - the cost we expect another iteration to need
+        slowest_llm_call = 0.0
+        simple = self.cascade.is_simple(message) if self.cascade else False
+        # Whether the next turn follows tool results (picks the cascade tier)
+        after_tools = False
         
         while iteration < self.max_iterations:
+            if iteration and not deadline.can_fit(slowest_llm_call):
+                logger.info(
+                    f"Stopping after {iteration} iteration(s): {deadline.remaining():.1f}s left, "
+                    f"last LLM call took up to {slowest_llm_call:.1f}s"
+                )
+                outcome = "deadline"
+                break
+            
             iteration += 1
             logger.info(f"Orchestration iteration {iteration}")
             
-            try:
-                # Call ASI Cloud / OpenAI
-                response = self.client.chat.completions.create(
-                    model=self.model,
-                    messages=messages,
-                    tools=openai_tools,
-                    tool_choice="auto",
-                    temperature=self.temperature
-                )
+            model = self.cascade.model_for(simple, after_tools) if self.cascade else self.model
+            with span("llm.iteration", iteration=iteration, model=model, messages=len(messages)) as iter_span:
+                try:
+                    # Call ASI Cloud / OpenAI
+                    response, llm_seconds = self._complete(model, messages, iteration, deadline, usage_totals)
+                    slowest_llm_call = max(slowest_llm_call, llm_seconds)
+                    
+                    # Redo the turn on the main model if the small model's tool call is unusable
+                    if model != self.model:
+                        reason = self.cascade.escalation_reason(response.choices[0].message)
+                        if reason and deadline.can_fit(slowest_llm_call):
+                            self.cascade.record_escalation(reason)
+                            model = self.model
+                            iter_span.set(model=model, escalated=reason)
+                            response, llm_seconds = self._complete(model, messages, iteration, deadline, usage_totals)
+                            slowest_llm_call = max(slowest_llm_call, llm_seconds)
                 
-                response_message = response.choices[0].message
+                    response_message = response.choices[0].message
                 
-                # Check if model wants to use tools
-                if response_message.tool_calls:
-                    tool_calls = response_message.tool_calls
+                    # Check if model wants to use tools
+                    if response_message.tool_calls:
+                        tool_calls = response_message.tool_calls
                     
-                    logger.info(f"Model wants to use {len(tool_calls)} tool(s)")
+                        logger.info(f"Model wants to use {len(tool_calls)} tool(s)")
                     
-                    # Sanitize assistant message so we only resend plain dicts/strings
-                    assistant_message = {
-                        "role": "assistant",
-                        # Some providers fail on null content when tool calls are present
-                        "content": response_message.content or "",
-                        "tool_calls": []
-                    }
-                    # The assistant message (with tool_calls) must be added before tool responses
-                    messages.append(assistant_message)
+                        # Sanitize assistant message so we only resend plain dicts/strings
+                        assistant_message = {
+                            "role": "assistant",
+                            # Some providers fail on null content when tool calls are present
+                            "content": response_message.content or "",
+                            "tool_calls": []
+                        }
+                        # The assistant message (with tool_calls) must be added before tool responses
+                        messages.append(assistant_message)
                     
-                    # Execute each tool
-                    for tool_call in tool_calls:
-                        tool_name = tool_call.function.name
-                        raw_args = tool_call.function.arguments
-
-                        # Accept both dict and JSON-string arguments from providers
-                        if isinstance(raw_args, dict):
-                            tool_args = raw_args
-                        elif isinstance(raw_args, str):
-                            try:
-                                tool_args = json.loads(raw_args) if raw_args else {}
-                            except Exception:
-                                logger.warning(f"Could not parse args for {tool_name}: {raw_args}")
+                        # Execute each tool
+                        for tool_call in tool_calls:
+                            tool_name = tool_call.function.name
+                            raw_args = tool_call.function.arguments
+
+                            # Accept both dict and JSON-string arguments from providers
+                            if isinstance(raw_args, dict):
+                                tool_args = raw_args
+                            elif isinstance(raw_args, str):
+                                try:
+                                    tool_args = jsoncodec.loads(raw_args) if raw_args else {}
+                                except Exception:
+                                    logger.warning(f"Could not parse args for {tool_name}: {raw_args}")
+                                    tool_args = {}
+                            else:
                                 tool_args = {}
-                        else:
-                            tool_args = {}
                         
-                        logger.info(f"Executing tool: {tool_name}")
-                        add_thought_step(f"🔧 Calling: {tool_name}")
-
-                        # Mirror tool call back to the model using a plain dict
-                        assistant_message["tool_calls"].append({
-                            "id": tool_call.id,
-                            "type": tool_call.type,
-                            "function": {
+                            logger.info(f"Executing tool: {tool_name}")
+                            add_thought_step(f"🔧 Calling: {tool_name}")
+
+                            # Re-encode canonically so resent history stays byte-identical
+                            encoded_args = canonical_json(tool_args)
+                            iter_span.add_event("tool_call", tool=tool_name, args_bytes=len(encoded_args))
+
+                            # Mirror tool call back to the model using a plain dict
+                            assistant_message["tool_calls"].append({
+                                "id": tool_call.id,
+                                "type": tool_call.type,
+                                "function": {
+                                    "name": tool_name,
+                                    "arguments": encoded_args
+                                }
+                            })
+                        
+                            # Create function call and execute
+                            func_call: FunctionCall = {
                                 "name": tool_name,
-                                # Re-encode to a JSON string as expected by the API
-                                "arguments": json.dumps(tool_args)
+                                "args": tool_args
                             }
-                        })
                         
-                        # Create function call and execute
-                        func_call: FunctionCall = {
-                            "name": tool_name,
-                            "args": tool_args
-                        }
+                            result = speculation.take(tool_name, tool_args) if speculation else None
+                            if result is None:
+                                result = handle_function_call(func_call, ctx)
+                                if speculation and not is_read_only_tool(tool_name):
+                                    speculation.invalidate()
                         
-                        result = handle_function_call(func_call, ctx)
+                            function_calls_made.append(function_call_record(tool_name, tool_args, result))
                         
-                        function_calls_made.append({
-                            "name": tool_name,
-                            "args": tool_args,
-                            "result": result
-                        })
-                        
-                        # Add tool result to messages
-                        messages.append({
-                            "role": "tool",
-                            "tool_call_id": tool_call.id,
-                            "name": tool_name,
-                            "content": result
-                        })
+                            # Add tool result to messages
+                            messages.append({
+                                "role": "tool",
+                                "tool_call_id": tool_call.id,
+                                "name": tool_name,
+                                "content": result
+                            })
                     
-                    continue
+                        after_tools = True
+                        continue
                 
-                else:
-                    # Model provided final answer
-                    final_response = response_message.content or ""
-                    logger.info("Got final response from model")
-                    break
+                    else:
+                        # Model provided final answer
+                        final_response = response_message.content or ""
+                        answered = True
+                        logger.info("Got final response from model")
+                        break
                     
-            except Exception as e:
-                logger.exception("Orchestration error")
-                fallback = (
-                    function_calls_made[-1]["result"]
-                    if function_calls_made
-                    else "I ran into a problem after calling the tools."
-                )
-                final_response = (
-                    f"I encountered an error processing your request: {str(e)}"
-                    f"\n\nLatest tool output:\n{fallback}"
-                )
-                break
+                except Exception as e:
+                    iter_span.set_error(e)
+                    if deadline.expired():
+                        logger.warning(f"Deadline reached during iteration {iteration}: {e}")
+                        outcome = "deadline"
+                        break
+                    logger.exception("Orchestration error")
+                    outcome = "error"
+                    fallback = (
+                        function_calls_made[-1]["result"]
+                        if function_calls_made
+                        else "I ran into a problem after calling the tools."
+                    )
+                    final_response = (
+                        f"I encountered an error processing your request: {str(e)}"
+                        f"\n\nLatest tool output:\n{fallback}"
+                    )
+                    break
+        
+        if speculation:
+            speculation.finish()
+        
+        if outcome == "answered" and not answered:
+            outcome = "max_iterations"
+        if outcome in ("deadline", "max_iterations"):
+            final_response = self._best_effort_answer(function_calls_made, outcome)
         
-        if iteration >= self.max_iterations:
-            final_response = "I've reached the maximum number of operations for this request. Please try a simpler question or start a new chat."
+        CHAT_REQUESTS.inc(outcome=outcome)
+        CHAT_REQUEST_SECONDS.observe(time.perf_counter() - request_start)
+        CHAT_ITERATIONS.observe(iteration)
+        CHAT_TOOL_CALLS.observe(len(function_calls_made))
         
         return {
             "text": final_response,
             "function_calls": function_calls_made,
-            "thought_steps": thought_steps
+            "thought_steps": thought_steps,
+            "iterations": iteration,
+            "usage": usage_totals,
+            "outcome": outcome
         }
     
+    def _best_effort_answer(self, function_calls: list[dict], reason: str) -> str:
+        """Answer from the tool results gathered so far when the loop cannot finish"""
+        if reason == "deadline":
+            intro = "I ran out of time before I could finish"
+        else:
+            intro = "I've reached the maximum number of operations for this request"
+        
+        results: list[str] = []
+        for call in function_calls:
+            result = call["result"]
+            if result and result not in results:
+                results.append(result)
+        if not results:
+            return f"{intro}. Please try a simpler question or start a new chat."
+        return f"{intro}, but here is what I found so far:\n\n" + "\n\n".join(results)
+    
+    def _complete(
+        self,
+        model: str,
+        messages: list[dict],
+        iteration: int,
+        deadline: Deadline,
+        usage_totals: dict
+    ) -> tuple[Any, float]:
+        """One chat completion with per-model metrics; returns (response, seconds)"""
+        with span("llm.call", model=model) as call_span:
+            llm_start = time.perf_counter()
+            try:
+                response = self.client.chat.completions.create(
+                    model=model,
+                    messages=messages,
+                    tools=self.openai_tools,
+                    tool_choice="auto",
+                    temperature=self.temperature,
+                    timeout=deadline.remaining()
+                )
+            except Exception:
+                LLM_REQUESTS.inc(model=model, status="error")
+                raise
+            finally:
+                llm_seconds = time.perf_counter() - llm_start
+                LLM_REQUEST_SECONDS.observe(llm_seconds, model=model, iteration=iteration)
+            LLM_REQUESTS.inc(model=model, status="ok")
+            self._record_usage(response, call_span, usage_totals, model)
+        return response, llm_seconds
+    
+    def _record_usage(self, response: Any, call_span: Any, totals: dict, model: str):
+        """Record token usage reported by the provider, including prefix-cache hits"""
+        usage = getattr(response, "usage", None)
+        if usage is None:
+            return
+        prompt_tokens = getattr(usage, "prompt_tokens", 0) or 0
+        completion_tokens = getattr(usage, "completion_tokens", 0) or 0
+        details = getattr(usage, "prompt_tokens_details", None)
+        cached_tokens = (getattr(details, "cached_tokens", 0) or 0) if details is not None else 0
+        
+        LLM_TOKENS.inc(prompt_tokens - cached_tokens, model=model, kind="prompt_uncached")
+        LLM_TOKENS.inc(cached_tokens, model=model, kind="prompt_cached")
+        LLM_TOKENS.inc(completion_tokens, model=model, kind="completion")
+        if prompt_tokens:
+            LLM_CACHED_RATIO.observe(cached_tokens / prompt_tokens, model=model)
+        
+        totals["prompt_tokens"] += prompt_tokens
+        totals["cached_prompt_tokens"] += cached_tokens
+        totals["completion_tokens"] += completion_tokens
+        call_span.set(
+            prompt_tokens=prompt_tokens,
+            cached_prompt_tokens=cached_tokens,
+            completion_tokens=completion_tokens,
+            prefix_hash=self.prefix_hash
+        )
+    
     def _convert_tools_to_openai_format(self) -> list[dict]:
-        """Convert our tool definitions to OpenAI's format"""
+        """Convert our tool definitions to OpenAI's format (canonical key order)"""
         openai_tools = []
         for tool in TOOLS:
             openai_tools.append({
@@ -219,7 +472,8 @@ class Orchestrator:
                     "parameters": tool["input_schema"]
                 }
             })
-        return openai_tools
+        # Round-trip through canonical JSON so nested schema keys are sorted too
+        return jsoncodec.loads(canonical_json(openai_tools))
 
 
 # Singleton instance
@@ -0,0 +1,308 @@
+"""
+Intent Router
+Deterministic fast path ahead of the LLM loop for simple commands
+
+Messages such as "show my shopping list", "what leftovers do I have",
+"remove milk from my list" or "plan my week" (when a fresh precomputed
+plan exists) need exactly one existing handler. The router
+matches them with patterns first and a small token-overlap classifier
+second; when confidence clears ROUTER_MIN_CONFIDENCE it runs the handler
+directly and answers from a template. The classifier only scores messages
+whose every content word appears in an exemplar, and messages with a
+negation never route. Anything else falls through to the full
+orchestration loop.
+"""
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable
+
+from config import settings
+from handlers import handle_function_call, function_call_record, FunctionCall, HandlerContext
+from utils import get_logger, counter, get_user_shopping_list
+
+from .meal_plans import get_meal_plan_cache
+
+logger = get_logger(__name__)
+
+ROUTER_DECISIONS = counter("mise_router_decisions_total", "Intent router decisions by intent and outcome")
+
+_STOPWORDS = frozenset({
+    "a", "an", "the", "my", "me", "i", "please", "can", "could", "you", "what", "whats",
+    "is", "are", "do", "does", "any", "on", "in", "of", "to", "for", "now", "currently", "all",
+})
+
+
+# "don't show my list", "not the milk": the model has to read these
+_NEGATIONS = frozenset({
+    "no", "not", "dont", "doesnt", "didnt", "cant", "cannot", "wont", "isnt", "arent",
+    "never", "nothing", "nor", "neither", "without", "except", "instead", "stop",
+})
+
+
+def _words(text: str) -> list[str]:
+    return re.findall(r"[a-z]+", text.lower().replace("'", "").replace("\u2019", ""))
+
+
+def _tokens(text: str) -> frozenset[str]:
+    return frozenset(w for w in _words(text) if w not in _STOPWORDS)
+
+
+def has_negation(text: str) -> bool:
+    """Whether the message negates something (such messages are never routed)"""
+    return not _NEGATIONS.isdisjoint(_words(text))
+
+
+@dataclass
+class Intent:
+    """A command the router can answer without the LLM"""
+    name: str
+    tool: str
+    patterns: list[re.Pattern]
+    # Exemplars for the token-overlap classifier; empty = patterns only
+    exemplars: list[str] = field(default_factory=list)
+    # Build tool args from a pattern match; None means "not confident"
+    build_args: Callable[[re.Match | None, str], dict | None] = lambda match, user_id: {}
+    # Templated answer from the tool args and handler result
+    render: Callable[[dict, str], str] = lambda args, result: result
+
+    def __post_init__(self):
+        self._exemplar_tokens = [_tokens(e) for e in self.exemplars]
+
+    def match(self, message: str) -> tuple[float, re.Match | None]:
+        """Confidence in [0, 1] that the message is this intent"""
+        text = message.strip().lower()
+        for pattern in self.patterns:
+            found = pattern.fullmatch(text)
+            if found:
+                return 1.0, found
+        tokens = _tokens(text)
+        if not tokens or not self._exemplar_tokens:
+            return 0.0, None
+        # Every content word must come from one exemplar: an extra word
+        # ("... in spanish", "... for tomorrow") changes the request
+        covering = [e for e in self._exemplar_tokens if tokens <= e]
+        if not covering:
+            return 0.0, None
+        # Jaccard similarity, which for a subset is the share of the exemplar used
+        return max(len(tokens) / len(e) for e in covering), None
+
+
+def _split_items(text: str) -> list[str]:
+    parts = re.split(r"\s*(?:,|\band\b|&)\s*", text)
+    return [re.sub(r"^(?:the|some|my)\s+", "", p).strip() for p in parts if p.strip()]
+
+
+def _singular(name: str) -> str:
+    return name[:-1] if name.endswith("s") and not name.endswith("ss") else name
+
+
+def _resolve_removals(match: re.Match | None, user_id: str) -> dict | None:
+    """Map requested names onto exact shopping list item names, or None if any is unknown"""
+    if match is None:
+        return None
+    requested = _split_items(match.group("items"))
+    if not requested:
+        return None
+    by_name: dict[str, str] = {}
+    for row in get_user_shopping_list(user_id):
+        item = row.get("item") or ""
+        by_name.setdefault(item.lower(), item)
+        by_name.setdefault(_singular(item.lower()), item)
+
+    resolved = []
+    for name in requested:
+        item = by_name.get(name.lower()) or by_name.get(_singular(name.lower()))
+        if item is None:
+            return None
+        resolved.append(item)
+    return {"item_names": resolved}
+
+
+def _render_removal(args: dict, result: str) -> str:
+    names = args["item_names"]
+    listed = names[0] if len(names) == 1 else ", ".join(names[:-1]) + f" and {names[-1]}"
+    return f"Done! I removed {listed} from your shopping list."
+
+
+def _render_leftovers(args: dict, result: str) -> str:
+    # The handler's empty-state text is written for the model, not the user
+    if result.startswith("No leftovers stored"):
+        return "You don't have any leftovers saved right now."
+    return result
+
+
+def _render_meal_plan(args: dict, result: str) -> str:
+    # The handler's empty-state text is written for the model, not the user
+    if result.startswith("No weekly meal plan saved yet"):
+        return "You don't have a weekly meal plan saved yet. Ask me to plan your week and I'll make one."
+    return result
+
+
+def _cached_meal_plan(match: re.Match | None, user_id: str) -> dict | None:
+    """Serve the stored weekly plan only while it is fresh"""
+    return {} if get_meal_plan_cache().lookup(user_id) else None
+
+
+_LIST = r"(?:(?:my|the)\s+)?(?:shopping|grocery)\s+list"
+_WEEK_PLAN = r"(?:(?:my|the|a)\s+)?(?:weekly\s+)?meal\s+plan"
+
+INTENTS = [
+    Intent(
+        name="show_shopping_list",
+        tool="getShoppingList",
+        patterns=[
+            re.compile(rf"(?:please\s+)?(?:show|view|see|display|get|list|open)\s+(?:me\s+)?{_LIST}[.!?]*"),
+            re.compile(rf"what(?:'s|\s+is)\s+on\s+{_LIST}[.!?]*"),
+            re.compile(rf"{_LIST}[.!?]*"),
+        ],
+        exemplars=["show my shopping list", "what is on my shopping list", "view grocery list"],
+    ),
+    Intent(
+        name="show_leftovers",
+        tool="getLeftovers",
+        patterns=[
+            re.compile(r"(?:please\s+)?(?:show|view|see|display|get|list)\s+(?:me\s+)?(?:(?:my|the)\s+)?leftovers[.!?]*"),
+            re.compile(r"what\s+leftovers\s+do\s+i\s+have(?:\s+left)?[.!?]*"),
+            re.compile(r"do\s+i\s+have\s+any\s+leftovers[.!?]*"),
+            re.compile(r"(?:my\s+)?leftovers[.!?]*"),
+        ],
+        exemplars=["show my leftovers", "what leftovers do i have", "list leftovers"],
+        render=_render_leftovers,
+    ),
+    Intent(
+        name="remove_from_shopping_list",
+        tool="removeFromShoppingList",
+        patterns=[
+            re.compile(
+                rf"(?:please\s+)?(?:remove|delete|take|cross)\s+(?P<items>.+?)\s+(?:off|from|off\s+of)\s+{_LIST}[.!]*"
+            ),
+            re.compile(r"(?:please\s+)?(?:remove|delete|take|cross)\s+(?P<items>.+?)\s+(?:off|from|off\s+of)\s+(?:my|the)\s+list[.!]*"),
+        ],
+        build_args=_resolve_removals,
+        render=_render_removal,
+    ),
+    Intent(
+        name="plan_week",
+        tool="getMealPlan",
+        patterns=[
+            re.compile(r"(?:please\s+)?plan\s+(?:out\s+)?my\s+(?:week|meals\s+for\s+(?:the|this)\s+week)[.!?]*"),
+            re.compile(rf"(?:please\s+)?(?:make|create)\s+(?:me\s+)?{_WEEK_PLAN}(?:\s+for\s+(?:the|this)\s+week)?[.!?]*"),
+            re.compile(r"what\s+should\s+i\s+eat\s+this\s+week[.!?]*"),
+        ],
+        exemplars=["plan my week", "plan my meals for the week"],
+        build_args=_cached_meal_plan,
+    ),
+    Intent(
+        # Shows whatever is saved; never asks for a new plan
+        name="show_meal_plan",
+        tool="getMealPlan",
+        patterns=[
+            re.compile(rf"(?:show|view|see|get)\s+(?:me\s+)?{_WEEK_PLAN}[.!?]*"),
+            re.compile(rf"what(?:'s|\s+is)\s+{_WEEK_PLAN}[.!?]*"),
+        ],
+        exemplars=["show my meal plan", "what is my meal plan"],
+        render=_render_meal_plan,
+    ),
+]
+
+
+class IntentRouter:
+    """Routes confident simple commands straight to their handler"""
+
+    def __init__(self, intents: list[Intent], min_confidence: float = 0.75):
+        self.intents = intents
+        self.min_confidence = min_confidence
+        self._lock = threading.Lock()
+        self._routed: dict[str, int] = {}
+        self._fallbacks = 0
+        self._errors = 0
+
+    def classify(self, message: str) -> tuple[Intent | None, float, re.Match | None]:
+        """Best intent with its confidence and pattern match (if any)"""
+        best: tuple[Intent | None, float, re.Match | None] = (None, 0.0, None)
+        if has_negation(message):
+            return best
+        for intent in self.intents:
+            confidence, found = intent.match(message)
+            if confidence > best[1]:
+                best = (intent, confidence, found)
+        return best
+
+    def route(self, message: str, user_id: str) -> dict | None:
+        """
+        Answer the message directly if a simple intent is recognised
+        Returns an orchestrator-shaped result, or None to use the LLM loop
+        """
+        start = time.perf_counter()
+        intent, confidence, found = self.classify(message)
+        if intent is None or confidence < self.min_confidence:
+            return self._fallback("none")
+
+        thought_steps: list[str] = []
+        ctx = HandlerContext(
+            user_id=user_id,
+            add_thought_step=lambda step, details=None, status="completed": thought_steps.append(step)
+        )
+        try:
+            args = intent.build_args(found, user_id)
+            if args is None:
+                return self._fallback(intent.name)
+
+            call: FunctionCall = {"name": intent.tool, "args": args}
+            result = handle_function_call(call, ctx)
+        except Exception as e:
+            logger.warning(f"Routed {intent.name} failed, using the LLM loop: {e}")
+            with self._lock:
+                self._errors += 1
+            return self._fallback(intent.name)
+
+        failed = any(step.startswith("❌") for step in thought_steps)
+        text = result if failed else intent.render(args, result)
+
+        with self._lock:
+            self._routed[intent.name] = self._routed.get(intent.name, 0) + 1
+        ROUTER_DECISIONS.inc(intent=intent.name, outcome="routed")
+        logger.info(
+            f"Routed '{intent.name}' (confidence {confidence:.2f}) "
+            f"in {(time.perf_counter() - start) * 1000:.1f}ms"
+        )
+
+        return {
+            "text": text,
+            "function_calls": [function_call_record(intent.tool, args, result)],
+            "thought_steps": thought_steps,
+            "iterations": 0,
+            "route": {"intent": intent.name, "confidence": round(confidence, 2)},
+        }
+
+    def _fallback(self, intent_name: str) -> None:
+        with self._lock:
+            self._fallbacks += 1
+        ROUTER_DECISIONS.inc(intent=intent_name, outcome="fallback")
+        return None
+
+    def stats(self) -> dict:
+        """Routing counts for health reporting"""
+        with self._lock:
+            routed = dict(self._routed)
+            total = sum(routed.values()) + self._fallbacks
+            return {
+                "routed": routed,
+                "fallbacks": self._fallbacks,
+                "errors": self._errors,
+                "routed_ratio": round(sum(routed.values()) / total, 3) if total else 0.0,
+            }
+
+
+# Singleton instance
+_router: IntentRouter | None = None
+
+
+def get_router() -> IntentRouter:
+    """Get or create router singleton"""
+    global _router
+    if _router is None:
+        _router = IntentRouter(INTENTS, min_confidence=settings.ROUTER_MIN_CONFIDENCE)
+    return _router
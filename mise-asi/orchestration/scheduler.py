@@ -0,0 +1,285 @@
+"""
+Fair Scheduler
+Admission policy in front of Orchestrator.process_message
+
+This scheduler:
+1. Rate limits each user with a token bucket
+2. Orders waiting requests across users with weighted fair queueing
+3. Caps the number of orchestrations in flight, with queue timeouts
+4. Charges quota by actual work done (LLM iterations + tool calls)
+"""
+import heapq
+import itertools
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Iterator
+
+from config import settings
+from utils import get_logger, gauge
+
+logger = get_logger(__name__)
+
+
+class SchedulerRejected(Exception):
+    """Raised when a user has exhausted their quota"""
+
+    def __init__(self, user_id: str, retry_after: float):
+        super().__init__(f"Rate limit exceeded for user {user_id[:8]}")
+        self.retry_after = retry_after
+
+
+class SchedulerTimeout(Exception):
+    """Raised when a request waits too long for an in-flight slot"""
+
+
+def request_cost(result: dict) -> float:
+    """Quota cost of a completed orchestration: LLM iterations plus tool calls"""
+    return float(result.get("iterations", 1) + len(result.get("function_calls", [])))
+
+
+@dataclass
+class TokenBucket:
+    """Per-user token bucket; may go into debt when actual cost exceeds the estimate"""
+    capacity: float
+    refill_rate: float
+    tokens: float
+    updated: float = field(default_factory=time.monotonic)
+
+    def refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.refill_rate)
+        self.updated = now
+
+    def retry_after(self, cost: float) -> float:
+        if self.refill_rate <= 0:
+            return float("inf")
+        return max(0.0, (cost - self.tokens) / self.refill_rate)
+
+
+@dataclass
+class Ticket:
+    """An admitted request; record actual cost with charge() before release"""
+    user_id: str
+    estimated_cost: float
+    weight: float
+    finish_tag: float
+    seq: int
+    enqueued_at: float
+    actual_cost: float | None = None
+    granted: bool = False
+    abandoned: bool = False
+
+    def charge(self, cost: float):
+        self.actual_cost = cost
+
+
+class FairScheduler:
+    """
+    Token buckets + weighted fair queueing + global in-flight cap
+
+    Each request gets a virtual finish tag of
+    max(virtual_time, user's last tag) + cost / weight; free slots go to
+    the waiting request with the smallest tag. When the real cost is known
+    the user's last tag and bucket are corrected, so heavy tool loops push
+    that user's next requests back behind everyone else.
+    """
+
+    def __init__(
+        self,
+        max_in_flight: int = 16,
+        queue_timeout: float = 30.0,
+        bucket_capacity: float = 30.0,
+        refill_per_second: float = 0.5,
+        max_queue: int = 200,
+    ):
+        self.max_in_flight = max(1, max_in_flight)
+        self.queue_timeout = queue_timeout
+        self.bucket_capacity = bucket_capacity
+        self.refill_per_second = refill_per_second
+        self.max_queue = max_queue
+
+        self._cond = threading.Condition()
+        self._buckets: dict[str, TokenBucket] = {}
+        self._last_finish: dict[str, float] = {}
+        self._virtual_time = 0.0
+        self._waiting: list[tuple[float, int, Ticket]] = []
+        self._queued = 0
+        self._in_flight = 0
+        self._seq = itertools.count()
+
+        # Counters
+        self._admitted = 0
+        self._rejected = 0
+        self._timed_out = 0
+        self._completed = 0
+        self._total_cost = 0.0
+
+    @contextmanager
+    def slot(
+        self,
+        user_id: str,
+        estimated_cost: float = 1.0,
+        weight: float = 1.0,
+        timeout: float | None = None,
+    ) -> Iterator[Ticket]:
+        """Hold an in-flight slot for the duration of the block"""
+        ticket = self.acquire(user_id, estimated_cost, weight, timeout)
+        try:
+            yield ticket
+        finally:
+            self.release(ticket)
+
+    def acquire(
+        self,
+        user_id: str,
+        estimated_cost: float = 1.0,
+        weight: float = 1.0,
+        timeout: float | None = None,
+    ) -> Ticket:
+        """Admit a request and block until it is granted a slot (at most queue_timeout or timeout)"""
+        weight = max(weight, 0.01)
+        queue_timeout = self.queue_timeout if timeout is None else min(timeout, self.queue_timeout)
+        with self._cond:
+            now = time.monotonic()
+            bucket = self._bucket(user_id, now)
+
+            if bucket.tokens < estimated_cost:
+                self._rejected += 1
+                raise SchedulerRejected(user_id, bucket.retry_after(estimated_cost))
+            if self._queued >= self.max_queue:
+                self._rejected += 1
+                raise SchedulerRejected(user_id, 1.0)
+
+            bucket.tokens -= estimated_cost
+            start = max(self._virtual_time, self._last_finish.get(user_id, 0.0))
+            finish = start + estimated_cost / weight
+            self._last_finish[user_id] = finish
+
+            ticket = Ticket(
+                user_id=user_id,
+                estimated_cost=estimated_cost,
+                weight=weight,
+                finish_tag=finish,
+                seq=next(self._seq),
+                enqueued_at=now,
+            )
+            heapq.heappush(self._waiting, (finish, ticket.seq, ticket))
+            self._queued += 1
+            self._admitted += 1
+
+            deadline = now + queue_timeout
+            while not self._try_grant(ticket):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    ticket.abandoned = True
+                    self._queued -= 1
+                    self._timed_out += 1
+                    # Refund the estimate; the request never ran
+                    bucket.tokens = min(bucket.capacity, bucket.tokens + estimated_cost)
+                    self._cond.notify_all()
+                    raise SchedulerTimeout(
+                        f"Timed out after {queue_timeout:.0f}s waiting for capacity"
+                    )
+                self._cond.wait(remaining)
+
+            return ticket
+
+    def release(self, ticket: Ticket):
+        """Free the slot and settle the actual cost against the user's quota"""
+        with self._cond:
+            self._in_flight -= 1
+            self._completed += 1
+
+            actual = ticket.actual_cost if ticket.actual_cost is not None else ticket.estimated_cost
+            self._total_cost += actual
+            extra = actual - ticket.estimated_cost
+            if extra:
+                bucket = self._bucket(ticket.user_id, time.monotonic())
+                bucket.tokens -= extra
+                self._last_finish[ticket.user_id] = (
+                    self._last_finish.get(ticket.user_id, self._virtual_time) + extra / ticket.weight
+                )
+
+            self._cond.notify_all()
+
+    def _try_grant(self, ticket: Ticket) -> bool:
+        """Grant the ticket if it is at the head of the fair queue and a slot is free"""
+        # Drop abandoned entries from the head
+        while self._waiting and self._waiting[0][2].abandoned:
+            heapq.heappop(self._waiting)
+
+        if self._in_flight >= self.max_in_flight:
+            return False
+        if not self._waiting or self._waiting[0][2] is not ticket:
+            return False
+
+        heapq.heappop(self._waiting)
+        self._queued -= 1
+        self._in_flight += 1
+        self._virtual_time = max(self._virtual_time, ticket.finish_tag - ticket.estimated_cost / ticket.weight)
+        ticket.granted = True
+        # Let the next waiter check whether it is now at the head
+        self._cond.notify_all()
+        return True
+
+    def _bucket(self, user_id: str, now: float) -> TokenBucket:
+        bucket = self._buckets.get(user_id)
+        if bucket is None:
+            if len(self._buckets) > 10000:
+                self._prune(now)
+            bucket = TokenBucket(
+                capacity=self.bucket_capacity,
+                refill_rate=self.refill_per_second,
+                tokens=self.bucket_capacity,
+                updated=now,
+            )
+            self._buckets[user_id] = bucket
+        else:
+            bucket.refill(now)
+        return bucket
+
+    def _prune(self, now: float):
+        """Forget users whose bucket is full and whose fair-queue tag has expired"""
+        for user_id, bucket in list(self._buckets.items()):
+            bucket.refill(now)
+            if bucket.tokens >= bucket.capacity and self._last_finish.get(user_id, 0.0) <= self._virtual_time:
+                del self._buckets[user_id]
+                self._last_finish.pop(user_id, None)
+
+    def stats(self) -> dict:
+        """Scheduler metrics for health reporting"""
+        with self._cond:
+            return {
+                "in_flight": self._in_flight,
+                "max_in_flight": self.max_in_flight,
+                "queued": self._queued,
+                "admitted": self._admitted,
+                "rejected": self._rejected,
+                "timed_out": self._timed_out,
+                "completed": self._completed,
+                "total_cost": self._total_cost,
+                "tracked_users": len(self._buckets),
+            }
+
+
+# Singleton instance
+_scheduler: FairScheduler | None = None
+
+
+def get_scheduler() -> FairScheduler:
+    """Get or create scheduler singleton"""
+    global _scheduler
+    if _scheduler is None:
+        _scheduler = FairScheduler(
+            max_in_flight=settings.SCHEDULER_MAX_IN_FLIGHT,
+            queue_timeout=settings.SCHEDULER_QUEUE_TIMEOUT,
+            bucket_capacity=settings.SCHEDULER_BUCKET_CAPACITY,
+            refill_per_second=settings.SCHEDULER_REFILL_PER_SECOND,
+            max_queue=settings.SCHEDULER_MAX_QUEUE,
+        )
+        gauge("mise_scheduler_in_flight", "Chat requests holding a scheduler slot",
+              fn=lambda: _scheduler.stats()["in_flight"])
+        gauge("mise_scheduler_queued", "Chat requests waiting for a scheduler slot",
+              fn=lambda: _scheduler.stats()["queued"])
+    return _scheduler
@@ -0,0 +1,212 @@
+"""
+Conversation Sessions
+Server-side chat history keyed by conversation id
+
+Clients send only the new message plus a conversation_id; the history the
+orchestrator needs is loaded from the session store. Stores:
+1. MemorySessionStore - LRU + TTL, per process
+2. SupabaseSessionStore - orchestrator_sessions table, survives restarts
+3. TieredSessionStore - memory in front of Supabase (read-through, write-through)
+"""
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime
+
+from config import settings
+from utils import get_logger, get_orchestrator_session, save_orchestrator_session
+
+logger = get_logger(__name__)
+
+
+class SessionNotFound(Exception):
+    """Raised when a conversation id is unknown or belongs to another user"""
+
+
+@dataclass
+class Session:
+    """
+    One conversation's history
+    version counts every message ever appended, so it keeps increasing even
+    after old messages are trimmed; clients use it for delta sync.
+    """
+    conversation_id: str
+    user_id: str
+    messages: list[dict] = field(default_factory=list)
+    version: int = 0
+    updated_at: float = field(default_factory=time.time)
+
+    def append(self, new_messages: list[dict], max_messages: int):
+        self.messages.extend(new_messages)
+        self.version += len(new_messages)
+        if len(self.messages) > max_messages:
+            del self.messages[:len(self.messages) - max_messages]
+        self.updated_at = time.time()
+
+    def since(self, version: int) -> list[dict]:
+        """Messages appended after `version` (as far back as is still kept)"""
+        first_kept = self.version - len(self.messages)
+        return self.messages[max(0, version - first_kept):]
+
+    def to_row(self) -> dict:
+        return {
+            "conversation_id": self.conversation_id,
+            "user_id": self.user_id,
+            "messages": self.messages,
+            "version": self.version,
+        }
+
+    @classmethod
+    def from_row(cls, row: dict) -> "Session":
+        return cls(
+            conversation_id=row["conversation_id"],
+            user_id=row["user_id"],
+            messages=list(row.get("messages") or []),
+            version=row.get("version") or 0,
+            updated_at=_timestamp(row.get("updated_at")),
+        )
+
+
+def _timestamp(value) -> float:
+    """Epoch seconds from a row's ISO updated_at (now when missing or unreadable)"""
+    try:
+        return datetime.fromisoformat(value).timestamp()
+    except (TypeError, ValueError):
+        return time.time()
+
+
+class MemorySessionStore:
+    """In-process sessions with LRU eviction and idle TTL"""
+
+    def __init__(self, max_sessions: int = 10000, ttl_seconds: float = 86400):
+        self.max_sessions = max_sessions
+        self.ttl_seconds = ttl_seconds
+        self._sessions: OrderedDict[str, Session] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, conversation_id: str) -> Session | None:
+        with self._lock:
+            session = self._sessions.get(conversation_id)
+            if session is None:
+                return None
+            if time.time() - session.updated_at > self.ttl_seconds:
+                del self._sessions[conversation_id]
+                return None
+            self._sessions.move_to_end(conversation_id)
+            return session
+
+    def save(self, session: Session):
+        with self._lock:
+            self._sessions[session.conversation_id] = session
+            self._sessions.move_to_end(session.conversation_id)
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+
+class SupabaseSessionStore:
+    """
+    Sessions persisted in the orchestrator_sessions table
+    Rows idle longer than ttl_seconds are not resumed; the sessions.prune
+    job deletes them.
+    """
+
+    def __init__(self, ttl_seconds: float = 86400):
+        self.ttl_seconds = ttl_seconds
+
+    def get(self, conversation_id: str) -> Session | None:
+        row = get_orchestrator_session(conversation_id)
+        if not row:
+            return None
+        session = Session.from_row(row)
+        if time.time() - session.updated_at > self.ttl_seconds:
+            return None
+        return session
+
+    def save(self, session: Session):
+        save_orchestrator_session(session.to_row())
+
+
+class TieredSessionStore:
+    """Memory tier in front of a persistent store"""
+
+    def __init__(self, memory: MemorySessionStore, persistent: SupabaseSessionStore):
+        self.memory = memory
+        self.persistent = persistent
+
+    def get(self, conversation_id: str) -> Session | None:
+        session = self.memory.get(conversation_id)
+        if session is not None:
+            return session
+        try:
+            session = self.persistent.get(conversation_id)
+        except Exception as e:
+            logger.warning(f"Session load failed for {conversation_id[:8]}: {e}")
+            return None
+        if session is not None:
+            self.memory.save(session)
+        return session
+
+    def save(self, session: Session):
+        self.memory.save(session)
+        try:
+            self.persistent.save(session)
+        except Exception as e:
+            logger.warning(f"Session persist failed for {session.conversation_id[:8]}: {e}")
+
+
+class SessionManager:
+    """Loads, creates and updates conversation sessions"""
+
+    def __init__(self, store, max_messages: int = 40):
+        self.store = store
+        self.max_messages = max_messages
+        # Serialises appends per process so concurrent turns do not drop messages
+        self._lock = threading.Lock()
+
+    def open(self, user_id: str, conversation_id: str | None = None) -> Session:
+        """Existing session for this user, or a new one when no id is given"""
+        if not conversation_id:
+            return Session(conversation_id=secrets.token_urlsafe(16), user_id=user_id)
+        session = self.store.get(conversation_id)
+        if session is None or session.user_id != user_id:
+            raise SessionNotFound(conversation_id)
+        return session
+
+    def record_turn(self, session: Session, user_message: str, assistant_text: str) -> Session:
+        """Append one user/assistant exchange, persist it and return the updated session"""
+        with self._lock:
+            current = self.store.get(session.conversation_id) or session
+            current.append(
+                [
+                    {"role": "user", "content": user_message},
+                    {"role": "assistant", "content": assistant_text},
+                ],
+                self.max_messages,
+            )
+            self.store.save(current)
+            return current
+
+
+# Singleton instance
+_manager: SessionManager | None = None
+
+
+def get_session_manager() -> SessionManager:
+    """Get or create session manager singleton"""
+    global _manager
+    if _manager is None:
+        memory = MemorySessionStore(
+            max_sessions=settings.SESSION_MAX_SESSIONS,
+            ttl_seconds=settings.SESSION_TTL_SECONDS,
+        )
+        if settings.SESSION_STORE == "supabase":
+            store = TieredSessionStore(memory, SupabaseSessionStore(settings.SESSION_TTL_SECONDS))
+        else:
+            store = memory
+        _manager = SessionManager(store, max_messages=settings.SESSION_MAX_MESSAGES)
+    return _manager
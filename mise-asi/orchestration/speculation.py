@@ -0,0 +1,159 @@
+"""
+Speculative Tool Prefetch
+Starts likely read tools while the first LLM call is in flight
+
+The incoming message is classified locally by keyword. For each predicted
+read tool a background job runs the real handler; when the model asks for
+that tool the tool loop takes the prefetched result instead of running it
+again. Results are discarded if the model never asks for them, and all
+pending results are invalidated as soon as a mutating tool runs.
+"""
+import contextvars
+import re
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from config import settings
+from handlers import handle_function_call, FunctionCall, HandlerContext
+from registry import is_read_only_tool
+from utils import get_logger, counter, span
+
+logger = get_logger(__name__)
+
+SPECULATIONS = counter(
+    "mise_speculative_tools_total",
+    "Speculatively prefetched tools by outcome (hit, unused, invalidated)"
+)
+
+# Tool names the model may use for the same read
+TOOL_ALIASES = {
+    "getInventoryItems": "getInventory",
+    "getUserPreferencesData": "getUserPreferences",
+}
+
+MEAL_PLANNING_PATTERN = re.compile(
+    r"\b(meal|meals|plan|cook|cooking|recipe|recipes|dinner|lunch|breakfast|eat|hungry|suggest|make)\b"
+)
+
+# (pattern, tools) - a message can match several rules
+PREDICTION_RULES: list[tuple[re.Pattern, tuple[str, ...]]] = [
+    (MEAL_PLANNING_PATTERN, ("getInventory", "getUserPreferences", "getLeftovers")),
+    (re.compile(r"\b(inventory|pantry|fridge|freezer|stock|ingredients|have)\b"), ("getInventory",)),
+    (re.compile(r"\bleftovers?\b"), ("getLeftovers",)),
+    (re.compile(r"\b(preferences?|diet|dietary|allerg\w*|goals?|calories)\b"), ("getUserPreferences",)),
+]
+
+
+def predict_tools(message: str) -> list[str]:
+    """Read tools the model is likely to request first for this message"""
+    text = message.lower()
+    predicted: list[str] = []
+    for pattern, tools in PREDICTION_RULES:
+        if pattern.search(text):
+            predicted.extend(t for t in tools if t not in predicted)
+    return predicted
+
+
+class Speculation:
+    """Prefetched tool results for one request"""
+
+    def __init__(self, ctx: HandlerContext, executor: ThreadPoolExecutor):
+        self.ctx = ctx
+        self.executor = executor
+        # tool name -> (future result, buffered thought steps)
+        self._pending: dict[str, tuple[Future, list[tuple]]] = {}
+        self._lock = threading.Lock()
+
+    def start(self, tools: list[str]):
+        """Submit prefetch jobs for the given read tools"""
+        for name in tools:
+            if not is_read_only_tool(name) or name in self._pending:
+                continue
+            steps: list[tuple] = []
+            spec_ctx = HandlerContext(
+                user_id=self.ctx.user_id,
+                add_thought_step=lambda step, details=None, status="completed", steps=steps:
+                    steps.append((step, details, status))
+            )
+            call: FunctionCall = {"name": name, "args": {}}
+            # Run in a copy of the caller's context so spans join the request trace
+            context = contextvars.copy_context()
+            future = self.executor.submit(context.run, self._run, call, spec_ctx)
+            self._pending[name] = (future, steps)
+        if self._pending:
+            logger.info(f"Speculatively prefetching: {', '.join(self._pending)}")
+
+    @staticmethod
+    def _run(call: FunctionCall, ctx: HandlerContext) -> str:
+        with span("speculation", tool=call["name"]):
+            return handle_function_call(call, ctx)
+
+    def take(self, name: str, args: dict) -> str | None:
+        """
+        Return the prefetched result for a tool call, or None to run it normally
+        Waits for a prefetch that is still running since it started earlier
+        """
+        if args:
+            return None
+        name = TOOL_ALIASES.get(name, name)
+        with self._lock:
+            entry = self._pending.pop(name, None)
+        if entry is None:
+            return None
+
+        future, steps = entry
+        try:
+            result = future.result()
+        except Exception as e:
+            logger.warning(f"Speculative {name} failed, running it again: {e}")
+            SPECULATIONS.inc(tool=name, outcome="unused")
+            return None
+
+        for step, details, status in steps:
+            self.ctx.log_step(step, details, status)
+        SPECULATIONS.inc(tool=name, outcome="hit")
+        return result
+
+    def invalidate(self):
+        """Discard every unconsumed prefetch (user state may have changed)"""
+        self._discard("invalidated")
+
+    def finish(self):
+        """Discard prefetches the model never asked for"""
+        self._discard("unused")
+
+    def _discard(self, outcome: str):
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        for name, (future, _) in pending.items():
+            future.cancel()
+            SPECULATIONS.inc(tool=name, outcome=outcome)
+
+
+# Singleton executor shared by all requests
+_executor: ThreadPoolExecutor | None = None
+_executor_lock = threading.Lock()
+
+
+def get_prefetch_executor() -> ThreadPoolExecutor:
+    """Shared pool for short background reads (speculative tools, cache checks)"""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.SPECULATION_MAX_WORKERS,
+                thread_name_prefix="mise-speculate"
+            )
+        return _executor
+
+
+def start_speculation(message: str, ctx: HandlerContext) -> Speculation | None:
+    """Classify the message and start prefetching; None when nothing is predicted"""
+    if not settings.SPECULATION_ENABLED:
+        return None
+    tools = predict_tools(message)
+    if not tools:
+        return None
+    speculation = Speculation(ctx, get_prefetch_executor())
+    speculation.start(tools)
+    return speculation
@@ -2,7 +2,7 @@
 Orchestration Types
 Maps to: src/hooks/chat/types.ts
 """
-from typing import TypedDict, Any
+from typing import TypedDict, Any, NotRequired
 from dataclasses import dataclass
 
 
@@ -16,5 +16,13 @@ class OrchestratorRequest(TypedDict):
 class OrchestratorResponse(TypedDict):
     """Response from the orchestrator"""
     text: str
+    # {"name", "args", "result"} plus "data" (rows/count/version) when the tool attached it
     function_calls: list[dict]
     thought_steps: list[str]
+    iterations: int
+    # Prompt/cached/completion token totals across LLM iterations
+    usage: NotRequired[dict[str, int]]
+    # Set when the intent router answered without the LLM
+    route: NotRequired[dict]
+    # Set when the answer was served from the answer cache
+    cache: NotRequired[dict]
@@ -0,0 +1,93 @@
+"""
+Use-Soon Notes
+Adds the user's near-expiry items to chat turns from the materialized list
+
+The expiry scan job (jobs.use_soon) rebuilds use_soon_items for every user
+in one set-based pass. A chat turn reads only its user's few soonest rows
+(one indexed query), cached in process for USE_SOON_CACHE_SECONDS since the
+list only changes when the job runs. The note goes in as a system message
+just before the user's message, after the stable system prompt and history,
+so the provider's prefix cache is unaffected.
+"""
+import threading
+import time
+from collections import OrderedDict
+from datetime import date
+
+from config import settings
+from handlers.inventory_handlers import render_use_soon_line
+from utils import get_logger, counter, decode_rows, get_use_soon_items, UseSoonRow
+
+logger = get_logger(__name__)
+
+USE_SOON_LOOKUPS = counter("mise_use_soon_lookups_total", "Use-soon note lookups by outcome (cached, loaded, empty, error)")
+
+# Users whose note is kept in memory
+MAX_CACHED_USERS = 10000
+
+
+def format_use_soon_note(items: list[UseSoonRow], today: date) -> str:
+    """Compact system note listing items to use first"""
+    listed = "; ".join(render_use_soon_line(item, today) for item in items)
+    return (
+        f"Use soon (from the last expiry scan): {listed}. "
+        "Prefer these when suggesting meals; check the inventory before relying on exact amounts."
+    )
+
+
+class UseSoonCache:
+    """Per-user use-soon notes with TTL and LRU eviction"""
+
+    def __init__(self, ttl_seconds: float = 300, limit: int = 5, max_users: int = MAX_CACHED_USERS):
+        self.ttl_seconds = ttl_seconds
+        self.limit = limit
+        self.max_users = max_users
+        self._notes: OrderedDict[str, tuple[float, str | None]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def note(self, user_id: str) -> str | None:
+        """The user's note, or None when nothing is close to expiring (or it cannot be read)"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._notes.get(user_id)
+            if entry is not None and now - entry[0] < self.ttl_seconds:
+                self._notes.move_to_end(user_id)
+                USE_SOON_LOOKUPS.inc(outcome="cached")
+                return entry[1]
+
+        try:
+            items = decode_rows(UseSoonRow, get_use_soon_items(user_id, limit=self.limit))
+        except Exception as e:
+            # A missing note only loses a hint, never the turn
+            logger.warning(f"Use-soon lookup failed for {user_id[:8]}: {e}")
+            USE_SOON_LOOKUPS.inc(outcome="error")
+            return None
+
+        note = format_use_soon_note(items, date.today()) if items else None
+        USE_SOON_LOOKUPS.inc(outcome="loaded" if note else "empty")
+        with self._lock:
+            self._notes[user_id] = (now, note)
+            self._notes.move_to_end(user_id)
+            while len(self._notes) > self.max_users:
+                self._notes.popitem(last=False)
+        return note
+
+    def clear(self):
+        """Drop all notes (after the scan job rebuilt the lists)"""
+        with self._lock:
+            self._notes.clear()
+
+
+# Singleton instance
+_cache: UseSoonCache | None = None
+
+
+def get_use_soon_cache() -> UseSoonCache:
+    """Get or create use-soon cache singleton"""
+    global _cache
+    if _cache is None:
+        _cache = UseSoonCache(
+            ttl_seconds=settings.USE_SOON_CACHE_SECONDS,
+            limit=settings.USE_SOON_INJECT_LIMIT,
+        )
+    return _cache
@@ -1,6 +1,22 @@
 """
 Registry Module
 """
-from .tools import TOOLS, get_tool_by_name, get_all_tool_names
+from .tools import (
+    TOOLS,
+    READ_ONLY_TOOLS,
+    USER_INDEPENDENT_TOOLS,
+    VOLATILE_TOOLS,
+    get_tool_by_name,
+    get_all_tool_names,
+    is_read_only_tool,
+)
 
-__all__ = ["TOOLS", "get_tool_by_name", "get_all_tool_names"]
+__all__ = [
+    "TOOLS",
+    "READ_ONLY_TOOLS",
+    "USER_INDEPENDENT_TOOLS",
+    "VOLATILE_TOOLS",
+    "get_tool_by_name",
+    "get_all_tool_names",
+    "is_read_only_tool",
+]
@@ -9,6 +9,8 @@ from .inventory_tools import (
     create_inventory_items_tool,
     update_inventory_item_tool,
     delete_inventory_item_tool,
+    get_use_soon_items_tool,
+    consume_meal_ingredients_tool,
     INVENTORY_CATEGORIES,
 )
 from .shopping_list_tools import (
@@ -19,8 +21,10 @@ from .shopping_list_tools import (
     get_shopping_list_items_tool,
     create_shopping_list_items_tool,
     delete_shopping_list_items_tool,
+    mark_purchased_tool,
+    add_meal_plan_to_shopping_list_tool,
 )
-from .meal_tools import suggest_meal_tool, update_meal_plan_tool
+from .meal_tools import suggest_meal_tool, update_meal_plan_tool, get_meal_plan_tool
 from .preferences_tools import (
     get_user_preferences_tool,
     update_user_preferences_tool,
@@ -56,6 +60,8 @@ __all__ = [
     "create_inventory_items_tool",
     "update_inventory_item_tool",
     "delete_inventory_item_tool",
+    "get_use_soon_items_tool",
+    "consume_meal_ingredients_tool",
     "INVENTORY_CATEGORIES",
     # Shopping List
     "show_shopping_list_tool",
@@ -65,9 +71,12 @@ __all__ = [
     "get_shopping_list_items_tool",
     "create_shopping_list_items_tool",
     "delete_shopping_list_items_tool",
+    "mark_purchased_tool",
+    "add_meal_plan_to_shopping_list_tool",
     # Meals
     "suggest_meal_tool",
     "update_meal_plan_tool",
+    "get_meal_plan_tool",
     # Preferences
     "get_user_preferences_tool",
     "update_user_preferences_tool",
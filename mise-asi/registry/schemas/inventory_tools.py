@@ -132,3 +132,42 @@ delete_inventory_item_tool = {
         "required": ["item_name"]
     }
 }
+
+
+get_use_soon_items_tool = {
+    "name": "getUseSoonItems",
+    "description": "Gets inventory items and leftovers that expire soon or have just expired, soonest first. Use this when the user asks what to use up, what is going off, or for meal ideas that reduce food waste.",
+    "input_schema": {
+        "type": "object",
+        "properties": {},
+        "required": []
+    }
+}
+
+
+consume_meal_ingredients_tool = {
+    "name": "consumeMealIngredients",
+    "description": "Subtracts the ingredients of a meal the user cooked from their inventory in one step, converting units and removing items that are used up. Optionally saves leftover servings. Use this instead of updating or deleting inventory items one by one when the user says they cooked or made a meal.",
+    "input_schema": {
+        "type": "object",
+        "properties": {
+            "meal_name": {"type": "string", "description": "Name of the meal that was cooked."},
+            "ingredients": {
+                "type": "array",
+                "description": "Ingredients used, in the same shape as suggestMeal's meal.ingredients.",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "item": {"type": "string", "description": "Ingredient name as in the recipe."},
+                        "quantity": {"type": "number", "description": "Amount used."},
+                        "unit": {"type": "string", "description": "Unit of the amount (e.g. 'g', 'cups', 'piece')."}
+                    },
+                    "required": ["item", "quantity"]
+                }
+            },
+            "leftover_servings": {"type": "number", "description": "Servings left over to save, if any."},
+            "leftover_notes": {"type": "string", "description": "Optional notes for the saved leftover."}
+        },
+        "required": ["ingredients"]
+    }
+}
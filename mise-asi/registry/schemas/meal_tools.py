@@ -73,6 +73,18 @@ update_meal_plan_tool = {
                             "carbs": {"type": "number"},
                             "fat": {"type": "number"}
                         }
+                    },
+                    "ingredients": {
+                        "type": "array",
+                        "description": "Ingredients, so addMealPlanToShoppingList can shop for the plan",
+                        "items": {
+                            "type": "object",
+                            "properties": {
+                                "item": {"type": "string"},
+                                "quantity": {"type": "number"},
+                                "unit": {"type": "string"}
+                            }
+                        }
                     }
                 }
             }
@@ -80,3 +92,13 @@ update_meal_plan_tool = {
         "required": ["day", "meal_type", "meal"]
     }
 }
+
+get_meal_plan_tool = {
+    "name": "getMealPlan",
+    "description": "Gets the user's saved 7-day meal plan. Use this first when the user asks to plan their week; if no current plan is saved, build one with updateMealPlan.",
+    "input_schema": {
+        "type": "object",
+        "properties": {},
+        "required": []
+    }
+}
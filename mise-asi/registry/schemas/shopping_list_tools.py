@@ -113,3 +113,71 @@ delete_shopping_list_items_tool = {
         "required": ["item_names"]
     }
 }
+
+
+mark_purchased_tool = {
+    "name": "markPurchased",
+    "description": "Moves items the user bought from the shopping list into the inventory in one step, adding to the quantity of items they already have. Use this when the user says they went shopping or bought items, instead of removing list items and updating the inventory separately.",
+    "input_schema": {
+        "type": "object",
+        "properties": {
+            "items": {
+                "type": "array",
+                "description": "Items that were bought. Quantity and unit default to the shopping list entry.",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "item": {"type": "string", "description": "Item name as on the shopping list."},
+                        "quantity": {"type": "number", "description": "Amount actually bought, if different from the list."},
+                        "unit": {"type": "string", "description": "Unit of the amount bought."},
+                        "category": {"type": "string", "description": "Inventory category for items not yet in the inventory."},
+                        "expiry_date": {"type": "string", "description": "Expiry date (YYYY-MM-DD), if known."}
+                    },
+                    "required": ["item"]
+                }
+            },
+            "all": {"type": "boolean", "description": "True when everything on the shopping list was bought."}
+        },
+        "required": []
+    }
+}
+
+add_meal_plan_to_shopping_list_tool = {
+    "name": "addMealPlanToShoppingList",
+    "description": "Adds what planned meals still need to the shopping list: totals the ingredients, subtracts what is in the inventory and already on the list (converting units), and adds only the shortfall. Use this instead of working out missing ingredients yourself. Without meals it uses the saved weekly meal plan.",
+    "input_schema": {
+        "type": "object",
+        "properties": {
+            "meals": {
+                "type": "array",
+                "description": "Meals to shop for. Omit to use the saved meal plan.",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "name": {"type": "string"},
+                        "ingredients": {
+                            "type": "array",
+                            "items": {
+                                "type": "object",
+                                "properties": {
+                                    "item": {"type": "string"},
+                                    "quantity": {"type": "number"},
+                                    "unit": {"type": "string"}
+                                },
+                                "required": ["item"]
+                            }
+                        }
+                    },
+                    "required": ["name", "ingredients"]
+                }
+            },
+            "days": {
+                "type": "array",
+                "items": {"type": "string"},
+                "description": "Only these days of the saved meal plan (default: the whole week)."
+            },
+            "dry_run": {"type": "boolean", "description": "True to only report what would be added."}
+        },
+        "required": []
+    }
+}
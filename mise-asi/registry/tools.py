@@ -12,6 +12,8 @@ from .schemas import (
     create_inventory_items_tool,
     update_inventory_item_tool,
     delete_inventory_item_tool,
+    get_use_soon_items_tool,
+    consume_meal_ingredients_tool,
     # Shopping List
     show_shopping_list_tool,
     get_shopping_list_tool,
@@ -20,9 +22,12 @@ from .schemas import (
     get_shopping_list_items_tool,
     create_shopping_list_items_tool,
     delete_shopping_list_items_tool,
+    mark_purchased_tool,
+    add_meal_plan_to_shopping_list_tool,
     # Meals
     suggest_meal_tool,
     update_meal_plan_tool,
+    get_meal_plan_tool,
     # Preferences
     get_user_preferences_tool,
     update_user_preferences_tool,
@@ -74,11 +79,17 @@ TOOLS = [
     create_inventory_items_tool,
     update_inventory_item_tool,
     delete_inventory_item_tool,
+    consume_meal_ingredients_tool,
+    
+    # Expiry
+    get_use_soon_items_tool,
     
     # CRUD tools for Shopping List
     get_shopping_list_items_tool,
     create_shopping_list_items_tool,
     delete_shopping_list_items_tool,
+    mark_purchased_tool,
+    add_meal_plan_to_shopping_list_tool,
     
     # CRUD tools for Preferences
     get_user_preferences_data_tool,
@@ -91,6 +102,7 @@ TOOLS = [
     
     # Meal Plan
     update_meal_plan_tool,
+    get_meal_plan_tool,
     
     # Amazon search tools
     search_amazon_product_tool,
@@ -100,6 +112,45 @@ TOOLS = [
 ]
 
 
+# Tools that only read user state; every other tool may change it
+READ_ONLY_TOOLS = frozenset({
+    "getCurrentTime",
+    "getInventory",
+    "getInventoryItems",
+    "getUseSoonItems",
+    "showShoppingList",
+    "getShoppingList",
+    "getShoppingListItems",
+    "suggestMeal",
+    "getMealPlan",
+    "getUserPreferences",
+    "getUserPreferencesData",
+    "getLeftovers",
+    "showLeftovers",
+    "searchAmazonProduct",
+    "searchMultipleAmazonProducts",
+    "getAmazonSearchResults",
+})
+
+
+# Read-only tools whose result depends only on their arguments (catalog
+# searches), so one result can serve every user
+USER_INDEPENDENT_TOOLS = frozenset({
+    "searchAmazonProduct",
+    "searchMultipleAmazonProducts",
+})
+
+# Read-only tools whose result changes between calls; never reuse one
+VOLATILE_TOOLS = frozenset({
+    "getCurrentTime",
+})
+
+
+def is_read_only_tool(name: str) -> bool:
+    """True if the tool never changes user state"""
+    return name in READ_ONLY_TOOLS
+
+
 def get_tool_by_name(name: str) -> dict | None:
     """Get a tool definition by name"""
     for tool in TOOLS:
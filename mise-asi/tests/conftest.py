@@ -0,0 +1,9 @@
+"""
+Test setup for mise-asi
+Modules import each other as top-level packages (config, utils, handlers...),
+the way main.py runs them, so the service directory goes on sys.path.
+"""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
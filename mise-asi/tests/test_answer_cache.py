@@ -0,0 +1,80 @@
+"""Answer cache: what may be cached and what the key depends on"""
+import pytest
+
+from orchestration import answer_cache as answer_cache_module
+from orchestration.answer_cache import AnswerCache, cache_key, cacheable
+
+
+def _answer(*tools):
+    return {"text": "ok", "function_calls": [{"name": name, "args": {}} for name in tools]}
+
+
+@pytest.mark.parametrize("tools", [(), ("getInventory",), ("getShoppingList", "getLeftovers", "suggestMeal")])
+def test_answers_from_synced_tables_are_cacheable(tools):
+    assert cacheable(_answer(*tools))
+
+
+@pytest.mark.parametrize("tools", [
+    ("getCurrentTime",),
+    ("searchAmazonProduct",),
+    # Written by background jobs without bumping the sync version
+    ("getMealPlan",),
+    ("getInventory", "getUseSoonItems"),
+    ("addToShoppingList",),
+])
+def test_other_answers_are_not_cacheable(tools):
+    assert not cacheable(_answer(*tools))
+
+
+def test_answers_without_text_are_not_cacheable():
+    assert not cacheable({"text": "", "function_calls": []})
+
+
+def test_cache_key():
+    history = [{"role": "system", "content": "prompt"}, {"role": "user", "content": "hi"}]
+    key = cache_key("u", "What can I cook?", history, 7, None, 0)
+    assert key == cache_key("u", "  what can i cook ", history[1:], 7, None, 0)
+    assert key != cache_key("u2", "What can I cook?", history, 7, None, 0)
+    assert key != cache_key("u", "What can I cook?", history, 8, None, 0)
+    assert key != cache_key("u", "What can I cook?", history, 7, "Use soon: milk", 0)
+    assert key != cache_key("u", "What can I cook?", history, 7, None, 1)
+    assert key != cache_key("u", "What can I cook?", [], 7, None, 0)
+
+
+class _Notes:
+    def __init__(self, note):
+        self.value = note
+
+    def note(self, user_id):
+        return self.value
+
+
+def test_lookup_reads_only_the_sync_version(monkeypatch):
+    reads = []
+    notes = _Notes(None)
+    monkeypatch.setattr(answer_cache_module, "get_sync_state", lambda user_id: reads.append(user_id) or {"version": 3})
+    monkeypatch.setattr(answer_cache_module, "get_use_soon_cache", lambda: notes)
+    monkeypatch.setattr(answer_cache_module.settings, "USE_SOON_INJECT", True)
+    cache = AnswerCache()
+
+    first = cache.lookup("what can i cook", "u", [])
+    assert reads == ["u"]
+    assert first.state == 3 and first.hit is None
+
+    notes.value = "Use soon: milk"
+    assert cache.lookup("what can i cook", "u", []).key != first.key
+
+
+def test_store_requires_an_unchanged_version(monkeypatch):
+    versions = iter([3, 3, 4])
+    monkeypatch.setattr(answer_cache_module, "get_sync_state", lambda user_id: {"version": next(versions)})
+    monkeypatch.setattr(answer_cache_module.settings, "USE_SOON_INJECT", False)
+    cache = AnswerCache()
+
+    lookup = cache.lookup("what can i cook", "u", [])
+    cache._store_if_unchanged(lookup, answer_cache_module._Entry("u", _answer(), 0.0))
+    assert len(cache) == 1
+
+    lookup = cache.lookup("what else", "u", [])
+    cache._store_if_unchanged(lookup, answer_cache_module._Entry("u", _answer(), 0.0))
+    assert len(cache) == 1
@@ -0,0 +1,38 @@
+"""Response content types in the ASGI adapter"""
+import asyncio
+
+import pytest
+
+from adapters import asgi_app
+from utils import METRICS_CONTENT_TYPE
+
+
+def _get(path: str, query: bytes = b"") -> dict:
+    app = asgi_app.create_asgi_app(run_agent=False)
+    sent = []
+
+    async def receive():
+        return {"type": "http.request", "body": b""}
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {"type": "http", "method": "GET", "path": path, "query_string": query, "headers": []}
+    try:
+        asyncio.run(app(scope, receive, send))
+    finally:
+        app.executor.shutdown(wait=False)
+    return dict(sent[0]["headers"])
+
+
+def test_metrics_use_the_prometheus_type():
+    assert _get("/metrics")[b"content-type"] == METRICS_CONTENT_TYPE.encode("latin-1")
+
+
+@pytest.mark.parametrize("payload, content_type", [
+    ("main;handle 3", b"text/plain; charset=utf-8"),
+    ({"profiles": []}, b"application/json"),
+])
+def test_profiles_match_the_flask_content_types(monkeypatch, payload, content_type):
+    monkeypatch.setattr(asgi_app, "profile_payload", lambda profile_id, headers, fmt: (payload, 200))
+    assert _get("/profile/abc", b"format=collapsed")[b"content-type"].startswith(content_type)
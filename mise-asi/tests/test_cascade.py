@@ -0,0 +1,53 @@
+"""Model cascade tier choice and tool-call validation"""
+from types import SimpleNamespace
+
+import pytest
+
+from orchestration.cascade import ModelCascade, validate_tool_call
+
+
+@pytest.fixture
+def cascade():
+    return ModelCascade("small", "large", simple_max_words=12)
+
+
+def _message(*calls):
+    return SimpleNamespace(tool_calls=[
+        SimpleNamespace(function=SimpleNamespace(name=name, arguments=arguments))
+        for name, arguments in calls
+    ] or None)
+
+
+def test_simple_requests_stay_on_the_small_model(cascade):
+    assert cascade.is_simple("what is in my inventory")
+    assert cascade.model_for(simple=True, after_tools=False) == "small"
+    assert cascade.model_for(simple=True, after_tools=True) == "small"
+
+
+def test_answers_to_complex_requests_go_straight_to_the_large_model(cascade):
+    assert not cascade.is_simple("plan my meals for the week")
+    assert cascade.model_for(simple=False, after_tools=False) == "small"
+    assert cascade.model_for(simple=False, after_tools=True) == "large"
+
+
+def test_final_answers_are_never_escalated(cascade):
+    assert cascade.escalation_reason(_message()) is None
+
+
+def test_invalid_tool_calls_escalate(cascade):
+    assert cascade.escalation_reason(_message(("getInventory", "{}"))) is None
+    assert cascade.escalation_reason(_message(("noSuchTool", "{}"))) == "invalid_tool_call"
+    assert cascade.escalation_reason(_message(("getInventory", "{}"), ("addToShoppingList", "{}"))) == "invalid_tool_call"
+
+
+@pytest.mark.parametrize("name, arguments, problem", [
+    ("getInventory", "", None),
+    ("getInventory", {}, None),
+    ("addToShoppingList", '{"items": []}', None),
+    ("addToShoppingList", "{}", "addToShoppingList missing items"),
+    ("addToShoppingList", "{not json", "unparseable arguments for addToShoppingList"),
+    ("addToShoppingList", "[1, 2]", "arguments for addToShoppingList are not an object"),
+    ("noSuchTool", "{}", "unknown tool noSuchTool"),
+])
+def test_validate_tool_call(name, arguments, problem):
+    assert validate_tool_call(name, arguments) == problem
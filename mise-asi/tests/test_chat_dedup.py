@@ -0,0 +1,49 @@
+"""/chat retry de-duplication keys"""
+import pytest
+
+from adapters import service
+from orchestration.sessions import MemorySessionStore, Session, SessionManager
+
+
+@pytest.fixture
+def sessions(monkeypatch):
+    manager = SessionManager(MemorySessionStore())
+    monkeypatch.setattr(service, "get_session_manager", lambda: manager)
+    return manager
+
+
+def test_not_a_chat_request():
+    assert service.chat_dedup_key({"user_id": "u"}, None) is None
+    assert service.chat_dedup_key({"message": "hi"}, None) is None
+
+
+def test_idempotency_key_identifies_the_request():
+    key = service.chat_dedup_key({"user_id": "u", "message": "hi", "history": []}, {"idempotency-key": "k1"})
+    assert key == ("u", "key", "k1")
+    assert service.chat_dedup_key({"user_id": "u", "message": "hi", "idempotency_key": "k1"}, None) == key
+
+
+def test_stateless_requests_key_on_message_and_history():
+    body = {"user_id": "u", "message": "yes", "history": [{"role": "assistant", "content": "Add milk?"}]}
+    key = service.chat_dedup_key(body, None)
+    assert key == service.chat_dedup_key(dict(body), {})
+    assert key != service.chat_dedup_key({**body, "message": "no"}, None)
+    assert key != service.chat_dedup_key({**body, "history": []}, None)
+    assert key != service.chat_dedup_key({**body, "user_id": "v"}, None)
+
+
+def test_a_repeated_reply_in_a_later_session_turn_is_a_new_request(sessions):
+    session = Session("c", "u")
+    sessions.store.save(session)
+    body = {"user_id": "u", "message": "yes", "conversation_id": "c"}
+
+    retry = service.chat_dedup_key(body, None)
+    assert service.chat_dedup_key(body, None) == retry
+
+    sessions.record_turn(session, "yes", "Added milk. Anything else?")
+    assert service.chat_dedup_key(body, None) != retry
+
+
+def test_unknown_conversation_ids_still_key(sessions):
+    assert service.chat_dedup_key({"user_id": "u", "message": "yes", "conversation_id": "missing"}, None)
+    assert service.chat_dedup_key({"user_id": "u", "message": "yes", "conversation_id": ["c"]}, None)
@@ -0,0 +1,68 @@
+"""Planning inventory decrements for a cooked meal"""
+import pytest
+
+from handlers.inventory_handlers import plan_consumption
+from utils import InventoryRow, convert, ingredient_key, normalize_unit, parse_quantity
+
+
+def _row(id, name, quantity, unit):
+    return InventoryRow(id, name, quantity, unit, "Other", None, None, None)
+
+
+INVENTORY = [
+    _row("rice", "Basmati Rice", 1, "kg"),
+    _row("chicken", "chicken breast", 600, "g"),
+    _row("eggs", "Eggs", 12, "pcs"),
+    _row("milk", "milk", 1, "l"),
+]
+
+
+@pytest.mark.parametrize("value, expected", [("2", 2.0), (2, 2.0), ("0.5", 0.5), (None, None), ("", None), ("a pinch", None)])
+def test_parse_quantity(value, expected):
+    assert parse_quantity(value) == expected
+
+
+def test_units_and_names():
+    assert normalize_unit("Tablespoons") == "tbsp"
+    assert normalize_unit(None) == "piece"
+    assert normalize_unit("Cans") == "can"
+    assert convert(2, "kg", "g") == 2000
+    assert convert(1, "cup", "g") is None
+    assert ingredient_key("Fresh Tomatoes") == "fresh tomato"
+
+
+def test_amounts_are_converted_to_the_row_unit_and_summed():
+    amounts, skipped = plan_consumption(
+        [
+            {"item": "rice", "quantity": "200", "unit": "g"},
+            {"item": "basmati rice", "quantity": 0.1, "unit": "kg"},
+            {"item": "Chicken", "quantity": 1, "unit": "lb"},
+            {"item": "egg", "quantity": "2"},
+        ],
+        INVENTORY,
+    )
+    assert skipped == []
+    assert amounts["rice"] == pytest.approx(0.3)
+    assert amounts["chicken"] == pytest.approx(453.59237)
+    assert amounts["eggs"] == 2
+
+
+def test_ingredients_that_cannot_be_applied_are_reported():
+    amounts, skipped = plan_consumption(
+        [
+            {"item": "saffron", "quantity": 1, "unit": "g"},
+            {"item": "milk", "quantity": "a splash"},
+            {"item": "milk", "quantity": 0},
+            {"item": "milk", "quantity": 200, "unit": "g"},
+            {"quantity": 1},
+        ],
+        INVENTORY,
+    )
+    assert amounts == {}
+    assert skipped == [
+        "saffron: not in your inventory",
+        "milk: no amount given",
+        "milk: no amount given",
+        "milk: recipe uses g, inventory tracks l",
+        "unnamed ingredient: not in your inventory",
+    ]
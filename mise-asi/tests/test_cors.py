@@ -0,0 +1,24 @@
+"""CORS allow-list matching in the ASGI adapter"""
+import pytest
+
+from adapters.asgi_app import _allowed_origin
+
+
+@pytest.mark.parametrize("origin", [
+    "http://localhost:5173",
+    "https://mise-ai.vercel.app",
+    "https://mise-ai-git-feature-team.vercel.app",
+])
+def test_listed_origins_are_allowed(origin):
+    assert _allowed_origin(origin)
+
+
+@pytest.mark.parametrize("origin", [
+    None,
+    "",
+    "https://mise-aiXvercel.app",
+    "http://localhostX5173",
+    "https://mise-ai.vercel.app.evil.com",
+])
+def test_literal_origins_match_exactly(origin):
+    assert not _allowed_origin(origin)
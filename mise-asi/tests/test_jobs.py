@@ -0,0 +1,48 @@
+"""Background job scheduling and the off-peak window"""
+from datetime import datetime, timezone
+
+from jobs.scheduler import JobScheduler, parse_hour_window
+
+
+def _closed_window() -> tuple[int, int]:
+    """A one-hour window starting two hours from now"""
+    hour = datetime.now(timezone.utc).hour
+    return ((hour + 2) % 24, (hour + 3) % 24)
+
+
+def test_parse_hour_window():
+    assert parse_hour_window("1-6") == (1, 6)
+    assert parse_hour_window("22-4") == (22, 4)
+    assert parse_hour_window("") is None
+    assert parse_hour_window("3-3") is None
+    assert parse_hour_window("a-b") is None
+
+
+def test_seconds_until_off_peak():
+    scheduler = JobScheduler(off_peak_hours=(1, 6))
+    assert scheduler.seconds_until_off_peak(datetime(2026, 10, 19, 3, tzinfo=timezone.utc)) == 0
+    assert scheduler.seconds_until_off_peak(datetime(2026, 10, 19, 0, 30, tzinfo=timezone.utc)) == 1800
+    assert scheduler.seconds_until_off_peak(datetime(2026, 10, 19, 6, tzinfo=timezone.utc)) == 19 * 3600
+    assert JobScheduler().seconds_until_off_peak() == 0
+
+
+def test_due_off_peak_job_waits_for_the_window():
+    runs = []
+    scheduler = JobScheduler(off_peak_hours=_closed_window())
+    scheduler.add("sweep", lambda: runs.append(1), interval_seconds=600, off_peak_only=True)
+
+    delay = scheduler.run_pending()
+    assert runs == []
+    # Sleeps until the window opens (the loop caps each wait), not a busy loop
+    assert delay > 3600
+
+
+def test_other_jobs_still_run_and_set_the_delay():
+    runs = []
+    scheduler = JobScheduler(off_peak_hours=_closed_window())
+    scheduler.add("sweep", lambda: runs.append("sweep"), interval_seconds=600, off_peak_only=True)
+    scheduler.add("scan", lambda: runs.append("scan"), interval_seconds=30)
+
+    delay = scheduler.run_pending()
+    assert runs == ["scan"]
+    assert 0 < delay <= 30
@@ -0,0 +1,97 @@
+"""Precomputed weekly plans: freshness, routing and background runs"""
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from handlers.meal_handlers import DAYS
+from orchestration import batch as batch_module
+from orchestration import meal_plans as meal_plans_module
+from orchestration import router as router_module
+from orchestration.batch import BatchJob, run_batch
+from orchestration.meal_plans import MealPlanCache, plan_from_function_calls, plan_is_fresh
+from orchestration.router import INTENTS, IntentRouter
+
+NOW = datetime(2026, 10, 19, 12, tzinfo=timezone.utc)
+
+
+def _row(**overrides):
+    row = {
+        "plan": {day: {"dinner": {"name": f"{day} dinner"}} for day in DAYS},
+        "source": "precomputed",
+        "stale": False,
+        "generated_at": (NOW - timedelta(hours=1)).isoformat(),
+    }
+    return {**row, **overrides}
+
+
+def test_complete_recent_precomputed_plan_is_fresh():
+    assert plan_is_fresh(_row(), NOW)
+
+
+@pytest.mark.parametrize("row", [
+    None,
+    _row(stale=True),
+    # updateMealPlan from chat: one slot, never generated
+    _row(plan={"Monday": {"dinner": {"name": "Tacos"}}}, source="chat", generated_at=None),
+    _row(source="chat"),
+    _row(generated_at=None),
+    _row(plan={day: {"dinner": {}} for day in DAYS[:6]}),
+    _row(generated_at=(NOW - timedelta(days=30)).isoformat()),
+])
+def test_other_plans_are_not_served_as_a_week(row):
+    assert not plan_is_fresh(row, NOW)
+
+
+def test_plan_from_function_calls_normalizes_days():
+    calls = [
+        {"name": "updateMealPlan", "args": {"day": "monday ", "meal_type": "Dinner", "meal": {"name": "Soup"}}},
+        {"name": "getInventory", "args": {}},
+        {"name": "updateMealPlan", "args": {"day": "Tuesday", "meal_type": "lunch"}},
+    ]
+    assert plan_from_function_calls(calls) == {"Monday": {"dinner": {"name": "Soup"}}}
+
+
+@pytest.fixture
+def plan_cache(monkeypatch):
+    cache = MealPlanCache()
+    monkeypatch.setattr(router_module, "get_meal_plan_cache", lambda: cache)
+    monkeypatch.setattr(meal_plans_module, "touch_meal_plan_request", lambda user_id, at: None)
+    monkeypatch.setattr(router_module, "handle_function_call", lambda call, ctx: "No weekly meal plan saved yet. ...")
+    return cache
+
+
+def test_showing_the_plan_never_queues_a_generation(plan_cache, monkeypatch):
+    lookups = []
+    monkeypatch.setattr(meal_plans_module, "get_meal_plan", lambda user_id: lookups.append(user_id))
+    router = IntentRouter(INTENTS)
+
+    result = router.route("show my meal plan", "user-1")
+    assert result["route"]["intent"] == "show_meal_plan"
+    assert result["text"].startswith("You don't have a weekly meal plan saved yet")
+    assert lookups == []
+    assert plan_cache.pending() == 0
+
+
+def test_planning_miss_uses_the_llm_and_queues_a_refresh(plan_cache, monkeypatch):
+    single_slot = _row(plan={"Monday": {"dinner": {"name": "Tacos"}}}, source="chat", generated_at=None)
+    monkeypatch.setattr(meal_plans_module, "get_meal_plan", lambda user_id: single_slot)
+    router = IntentRouter(INTENTS)
+
+    assert router.route("plan my week", "user-1") is None
+    assert plan_cache.take_refresh_requests(10) == ["user-1"]
+
+
+def test_background_batches_do_not_use_the_chat_scheduler(monkeypatch):
+    class Orchestrator:
+        def process_message(self, message, user_id, history, deadline):
+            return {"text": "ok", "function_calls": [], "iterations": 1}
+
+    def no_scheduler():
+        raise AssertionError("background work must not take interactive quota")
+
+    monkeypatch.setattr(batch_module, "get_orchestrator", Orchestrator)
+    monkeypatch.setattr(batch_module, "get_scheduler", no_scheduler)
+    monkeypatch.setattr(batch_module.settings, "SCHEDULER_ENABLED", True)
+
+    run = run_batch([BatchJob("a", "user-1", "plan"), BatchJob("b", "user-2", "plan")], background=True)
+    assert sorted(result["status"] for result in run.results(timeout=5)) == ["ok", "ok"]
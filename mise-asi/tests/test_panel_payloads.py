@@ -0,0 +1,43 @@
+"""Row payloads attached to read and panel tool results"""
+import pytest
+
+from handlers import HandlerContext, handle_function_call
+from handlers import leftovers_handlers, shopping_list_handlers, types
+
+
+@pytest.fixture
+def reads(monkeypatch):
+    log = []
+    rows = [{"id": "1", "item": "milk", "quantity": 1, "unit": "l"}]
+    monkeypatch.setattr(types, "get_sync_state", lambda user_id: log.append("version") or {"version": 9})
+    monkeypatch.setattr(shopping_list_handlers, "get_user_shopping_list", lambda user_id: log.append("rows") or rows)
+    monkeypatch.setattr(leftovers_handlers, "get_user_leftovers", lambda user_id: log.append("rows") or [])
+    return log
+
+
+def _call(name):
+    return handle_function_call({"name": name, "args": {}}, HandlerContext("u", lambda *args: None))
+
+
+@pytest.mark.parametrize("name", ["showShoppingList", "showLeftovers"])
+def test_panels_read_the_version_before_the_rows(reads, name):
+    assert _call(name).data["version"] == 9
+    assert reads == ["version", "rows"]
+
+
+@pytest.mark.parametrize("name", ["getShoppingList", "getLeftovers"])
+def test_model_reads_skip_the_version_query(reads, name):
+    result = _call(name)
+    assert result.data["version"] is None
+    assert result.data["table"] in ("shopping_lists", "user_leftovers")
+    assert reads == ["rows"]
+
+
+def test_unreadable_version_still_attaches_rows(reads, monkeypatch):
+    def down(user_id):
+        raise RuntimeError("down")
+
+    monkeypatch.setattr(types, "get_sync_state", down)
+    data = _call("showShoppingList").data
+    assert data["version"] is None
+    assert data["count"] == 1
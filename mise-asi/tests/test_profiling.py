@@ -0,0 +1,27 @@
+"""On-demand request profiling"""
+import tracemalloc
+
+from utils.profiling import get_profile_store, profiled
+
+
+def _work():
+    return [str(i) * 10 for i in range(20000)]
+
+
+def test_stack_sampling_leaves_tracemalloc_off():
+    with profiled("plain") as profile:
+        assert not tracemalloc.is_tracing()
+        _work()
+    assert profile.traced_peak_kb is None
+    assert profile.allocations == []
+    assert get_profile_store().get(profile.id) is profile
+
+
+def test_allocations_are_traced_only_on_request():
+    with profiled("allocations", allocations=True) as profile:
+        assert tracemalloc.is_tracing()
+        data = _work()
+    assert not tracemalloc.is_tracing()
+    assert profile.traced_peak_kb > 0
+    assert profile.allocations
+    del data
@@ -0,0 +1,69 @@
+"""Moving bought shopping list items into the inventory"""
+import pytest
+
+from handlers.shopping_list_handlers import _purchases, plan_purchase
+from utils import InventoryRow, ShoppingListRow
+
+SHOPPING_LIST = [
+    ShoppingListRow("s1", "Milk", 1, "l"),
+    ShoppingListRow("s2", "milk", 500, "ml"),
+    ShoppingListRow("s3", "flour", 2, "cups"),
+    ShoppingListRow("s4", "Basil", None, None),
+]
+INVENTORY = [
+    InventoryRow("i1", "whole milk", 1, "l", "Dairy", None, None, None),
+    InventoryRow("i2", "flour", 500, "g", "Pantry", None, None, None),
+]
+
+
+def test_listed_amounts_are_summed_and_merged_into_matching_items():
+    purchases = _purchases({"items": [{"item": "milk"}]}, SHOPPING_LIST)
+    increments, new_items, list_ids, skipped = plan_purchase(purchases, INVENTORY)
+    assert increments == {"i1": pytest.approx(1.5)}
+    assert new_items == []
+    assert sorted(list_ids) == ["s1", "s2"]
+    assert skipped == []
+
+
+def test_the_amount_bought_wins_over_the_list():
+    purchases = _purchases({"items": [{"item": "milk", "quantity": "2", "unit": "l"}]}, SHOPPING_LIST)
+    increments, _, list_ids, _ = plan_purchase(purchases, INVENTORY)
+    assert increments == {"i1": 2.0}
+    assert sorted(list_ids) == ["s1", "s2"]
+
+
+def test_incompatible_units_stay_on_the_list():
+    purchases = _purchases({"items": [{"item": "flour"}]}, SHOPPING_LIST)
+    increments, new_items, list_ids, skipped = plan_purchase(purchases, INVENTORY)
+    assert (increments, new_items, list_ids) == ({}, [], [])
+    assert skipped == ["flour: bought in cups, inventory tracks flour in g"]
+
+
+def test_unknown_items_become_new_inventory_rows():
+    purchases = _purchases({"items": [{"item": "basil"}, {"item": "lemons", "quantity": 3, "category": "Produce"}]}, SHOPPING_LIST)
+    increments, new_items, list_ids, skipped = plan_purchase(purchases, INVENTORY)
+    assert increments == {}
+    assert new_items == [
+        {"item_name": "Basil", "quantity": 1.0, "unit": "piece", "category": "Other", "expiry_date": None},
+        {"item_name": "lemons", "quantity": 3.0, "unit": "piece", "category": "Produce", "expiry_date": None},
+    ]
+    assert list_ids == ["s4"]
+    assert skipped == []
+
+
+def test_rows_named_twice_are_moved_once():
+    purchases = _purchases({"items": [{"item": "milk"}, {"item": "Milk"}]}, SHOPPING_LIST)
+    _, _, list_ids, _ = plan_purchase(purchases, INVENTORY)
+    assert sorted(list_ids) == ["s1", "s2"]
+
+
+def test_all_moves_every_row():
+    purchases = _purchases({"all": True}, SHOPPING_LIST)
+    assert [rows[0].id for _, rows in purchases] == ["s1", "s2", "s3", "s4"]
+
+
+def test_a_unit_no_list_row_converts_to_moves_nothing():
+    purchases = _purchases({"items": [{"item": "milk", "unit": "g"}]}, [ShoppingListRow("s1", "Milk", 1, "l")])
+    increments, new_items, list_ids, skipped = plan_purchase(purchases, [])
+    assert (increments, new_items, list_ids) == ({}, [], [])
+    assert skipped == ["Milk: listed in l and g, move it separately"]
@@ -0,0 +1,37 @@
+"""Tool result text rendered from response rows"""
+from handlers.inventory_handlers import render_inventory
+from handlers.leftovers_handlers import render_leftovers
+from handlers.shopping_list_handlers import render_shopping_list
+
+
+def test_inventory_groups_by_category_in_first_seen_order():
+    text = render_inventory([
+        {"id": "1", "item_name": "milk", "quantity": 1, "unit": "l", "category": "Dairy", "location": "fridge", "notes": None},
+        {"id": "2", "item_name": "rice", "quantity": 2, "unit": "kg", "category": "Pantry", "notes": "basmati"},
+        {"id": "3", "item_name": "salt"},
+        {"id": "4", "item_name": "butter", "quantity": 250, "unit": "g", "category": "Dairy"},
+    ])
+    assert text == (
+        "Current pantry and refrigerator inventory:\n\n"
+        "**Dairy:**\n- 1 l of milk (stored in fridge)\n- 250 g of butter\n\n"
+        "**Pantry:**\n- 2 kg of rice - Notes: basmati\n\n"
+        "**Other:**\n-   of salt\n\n"
+        "Use these ingredients to suggest meals that maximize the use of available items and minimize food waste."
+    )
+
+
+def test_shopping_list_lines():
+    assert render_shopping_list([
+        {"item": "milk", "quantity": 2, "unit": "l"},
+        {"item": "eggs", "quantity": 12, "unit": None},
+        {"item": "basil", "quantity": None},
+        {},
+    ]) == "Current shopping list:\n- 2 l milk\n- 12 eggs\n- basil\n- Unknown\n"
+
+
+def test_leftover_lines():
+    assert render_leftovers([
+        {"meal_name": "chili", "servings": 3, "notes": "spicy"},
+        {"meal_name": "soup", "servings": 1, "notes": None},
+        {},
+    ]) == "**Current Leftovers:**\n- chili: 3 servings (spicy)\n- soup: 1 servings\n- Unknown: 0 servings\n"
@@ -0,0 +1,94 @@
+"""Intent router classification and routing decisions"""
+import pytest
+
+from orchestration import router as router_module
+from orchestration.router import INTENTS, IntentRouter, has_negation
+
+
+@pytest.fixture
+def router():
+    return IntentRouter(INTENTS, min_confidence=0.75)
+
+
+def _routed_intent(router, message):
+    intent, confidence, _ = router.classify(message)
+    if intent is None or confidence < router.min_confidence:
+        return None
+    return intent.name
+
+
+@pytest.mark.parametrize("message, intent", [
+    ("show my shopping list", "show_shopping_list"),
+    ("What's on my grocery list?", "show_shopping_list"),
+    ("shopping list", "show_shopping_list"),
+    ("view my grocery list", "show_shopping_list"),
+    ("what leftovers do I have", "show_leftovers"),
+    ("leftovers!", "show_leftovers"),
+    ("remove milk from my shopping list", "remove_from_shopping_list"),
+    ("plan my week", "plan_week"),
+])
+def test_simple_commands_are_recognised(router, message, intent):
+    assert _routed_intent(router, message) == intent
+
+
+@pytest.mark.parametrize("message", [
+    "don't show my shopping list",
+    "do not show my shopping list",
+    "I don’t want my leftovers",
+    "show my shopping list without the milk",
+    "remove nothing from my shopping list",
+])
+def test_negated_messages_never_route(router, message):
+    assert has_negation(message)
+    assert router.classify(message)[0] is None
+
+
+@pytest.mark.parametrize("message", [
+    "show my shopping list in spanish",
+    "show my shopping list for tomorrow",
+    "what leftovers do I have that are vegan",
+    "suggest a dinner with my leftovers",
+    "add eggs to my shopping list",
+])
+def test_extra_content_words_fall_through(router, message):
+    assert _routed_intent(router, message) is None
+
+
+def test_classifier_requires_every_word_covered():
+    intent = next(i for i in INTENTS if i.name == "show_shopping_list")
+    # Neither message fits a pattern, so these are classifier scores
+    assert intent.match("view the grocery list please")[0] == 1.0
+    assert intent.match("view grocery list totals")[0] == 0.0
+
+
+def test_removal_needs_every_item_on_the_list(router, monkeypatch):
+    rows = [{"item": "Milk"}, {"item": "Eggs"}]
+    monkeypatch.setattr(router_module, "get_user_shopping_list", lambda user_id: rows)
+    calls = []
+    monkeypatch.setattr(
+        router_module, "handle_function_call",
+        lambda call, ctx: calls.append(call) or "Removed",
+    )
+
+    result = router.route("remove milk and egg from my shopping list", "user-1")
+    assert calls == [{"name": "removeFromShoppingList", "args": {"item_names": ["Milk", "Eggs"]}}]
+    assert result["text"] == "Done! I removed Milk and Eggs from your shopping list."
+    assert result["iterations"] == 0
+
+    assert router.route("remove bread from my shopping list", "user-1") is None
+    assert len(calls) == 1
+
+
+def test_failed_handler_text_is_passed_through(router, monkeypatch):
+    def failing(call, ctx):
+        ctx.log_step("❌ getShoppingList failed")
+        return "Failed to get shopping list: boom"
+
+    monkeypatch.setattr(router_module, "handle_function_call", failing)
+    result = router.route("show my shopping list", "user-1")
+    assert result["text"] == "Failed to get shopping list: boom"
+
+
+def test_unrecognised_messages_use_the_llm(router):
+    assert router.route("what should I cook with chickpeas?", "user-1") is None
+    assert router.stats()["fallbacks"] == 1
@@ -0,0 +1,79 @@
+"""FairScheduler admission, quota settlement and fair ordering"""
+import threading
+import time
+
+import pytest
+
+from orchestration.scheduler import FairScheduler, SchedulerRejected, SchedulerTimeout, request_cost
+
+
+def test_request_cost_counts_iterations_and_tool_calls():
+    assert request_cost({"iterations": 2, "function_calls": [{}, {}, {}]}) == 5.0
+    assert request_cost({}) == 1.0
+
+
+def test_rejects_when_bucket_is_empty():
+    scheduler = FairScheduler(bucket_capacity=3, refill_per_second=0)
+    with scheduler.slot("u", estimated_cost=3):
+        pass
+    with pytest.raises(SchedulerRejected) as excinfo:
+        scheduler.acquire("u", estimated_cost=1)
+    assert excinfo.value.retry_after == float("inf")
+
+
+def test_actual_cost_is_settled_on_release():
+    scheduler = FairScheduler(bucket_capacity=10, refill_per_second=0)
+    with scheduler.slot("u", estimated_cost=1) as ticket:
+        ticket.charge(8)
+    # 10 - 8 left: an estimate of 3 no longer fits
+    with pytest.raises(SchedulerRejected):
+        scheduler.acquire("u", estimated_cost=3)
+    assert scheduler.stats()["total_cost"] == 8
+
+
+def test_users_have_separate_buckets():
+    scheduler = FairScheduler(bucket_capacity=1, refill_per_second=0)
+    with scheduler.slot("a"):
+        pass
+    with scheduler.slot("b"):
+        pass
+    with pytest.raises(SchedulerRejected):
+        scheduler.acquire("a")
+
+
+def test_queue_timeout_refunds_the_estimate():
+    scheduler = FairScheduler(max_in_flight=1, queue_timeout=0.05, bucket_capacity=2, refill_per_second=0)
+    held = scheduler.acquire("a", estimated_cost=1)
+    with pytest.raises(SchedulerTimeout):
+        scheduler.acquire("b", estimated_cost=2)
+    scheduler.release(held)
+    # b's bucket was refunded, so the same request now fits
+    with scheduler.slot("b", estimated_cost=2):
+        pass
+    assert scheduler.stats()["timed_out"] == 1
+
+
+def test_full_queue_rejects():
+    scheduler = FairScheduler(max_in_flight=1, queue_timeout=1, max_queue=0)
+    with pytest.raises(SchedulerRejected):
+        scheduler.acquire("u")
+
+
+def test_free_slot_goes_to_the_lighter_user():
+    scheduler = FairScheduler(max_in_flight=1, queue_timeout=5, bucket_capacity=100, refill_per_second=0)
+    held = scheduler.acquire("heavy", estimated_cost=1)
+    order = []
+
+    def run(user_id):
+        with scheduler.slot(user_id, estimated_cost=1):
+            order.append(user_id)
+
+    # heavy queues twice before light arrives; light's finish tag is still the smallest
+    threads = [threading.Thread(target=run, args=(user_id,)) for user_id in ("heavy", "heavy", "light")]
+    for thread in threads:
+        thread.start()
+        time.sleep(0.02)
+    scheduler.release(held)
+    for thread in threads:
+        thread.join(2)
+    assert order == ["light", "heavy", "heavy"]
@@ -0,0 +1,107 @@
+"""Conversation sessions: versioning, stores and the Supabase table they use"""
+import pytest
+
+from orchestration import sessions
+from orchestration.sessions import (
+    MemorySessionStore,
+    Session,
+    SessionManager,
+    SessionNotFound,
+    SupabaseSessionStore,
+    TieredSessionStore,
+)
+from utils import supabase_client
+
+
+def test_version_keeps_counting_after_trimming():
+    session = Session("c", "u")
+    for i in range(5):
+        session.append([{"role": "user", "content": str(i)}], max_messages=3)
+    assert session.version == 5
+    assert [m["content"] for m in session.messages] == ["2", "3", "4"]
+    assert [m["content"] for m in session.since(3)] == ["3", "4"]
+    # Older than what is kept: everything still available
+    assert len(session.since(0)) == 3
+
+
+def test_sessions_belong_to_their_user():
+    manager = SessionManager(MemorySessionStore())
+    session = manager.open("u1")
+    manager.record_turn(session, "hi", "hello")
+    assert manager.open("u1", session.conversation_id).version == 2
+    with pytest.raises(SessionNotFound):
+        manager.open("u2", session.conversation_id)
+    with pytest.raises(SessionNotFound):
+        manager.open("u1", "unknown")
+
+
+class _FakeQuery:
+    def __init__(self, log, table):
+        self.log = log
+        self.table = table
+
+    def __getattr__(self, name):
+        def call(*args, **kwargs):
+            self.log.append((self.table, name, args, kwargs))
+            return self
+        return call
+
+    def execute(self):
+        return type("Response", (), {"data": []})()
+
+
+def test_supabase_store_uses_the_orchestrator_sessions_table(monkeypatch):
+    log = []
+    client = type("Client", (), {"table": lambda self, name: _FakeQuery(log, name)})()
+    monkeypatch.setattr(supabase_client, "get_supabase_client", lambda: client)
+
+    store = SupabaseSessionStore()
+    assert store.get("c") is None
+    store.save(Session("c", "u"))
+
+    # chat_sessions is the frontend's history table (keyed by user_id)
+    assert {table for table, *_ in log} == {"orchestrator_sessions"}
+    upsert = next(entry for entry in log if entry[1] == "upsert")
+    assert upsert[3] == {"on_conflict": "conversation_id"}
+
+
+def test_prune_deletes_idle_rows_by_updated_at(monkeypatch):
+    log = []
+    client = type("Client", (), {"table": lambda self, name: _FakeQuery(log, name)})()
+    monkeypatch.setattr(supabase_client, "get_supabase_client", lambda: client)
+
+    assert supabase_client.prune_orchestrator_sessions(86400) == 0
+    assert [entry[1] for entry in log] == ["delete", "lt"]
+    assert log[1][2][0] == "updated_at"
+
+
+def test_tiered_store_survives_persist_failures(monkeypatch):
+    class Failing:
+        def get(self, conversation_id):
+            raise RuntimeError("down")
+
+        def save(self, session):
+            raise RuntimeError("down")
+
+    store = TieredSessionStore(MemorySessionStore(), Failing())
+    store.save(Session("c", "u"))
+    assert store.get("c").user_id == "u"
+    assert store.get("missing") is None
+
+
+def test_expired_persisted_sessions_are_not_resumed(monkeypatch):
+    rows = {
+        "old": {"conversation_id": "old", "user_id": "u", "messages": [], "version": 2,
+                "updated_at": "2026-10-01T12:00:00+00:00"},
+        "new": {"conversation_id": "new", "user_id": "u", "messages": [], "version": 2,
+                "updated_at": "2026-10-19T11:00:00+00:00"},
+    }
+    monkeypatch.setattr(sessions, "get_orchestrator_session", rows.get)
+    monkeypatch.setattr(sessions.time, "time", lambda: 1792411200.0)  # 2026-10-19T12:00:00Z
+
+    manager = SessionManager(TieredSessionStore(MemorySessionStore(ttl_seconds=86400), SupabaseSessionStore(86400)))
+    with pytest.raises(SessionNotFound):
+        manager.open("u", "old")
+    resumed = manager.open("u", "new")
+    # The stored timestamp is kept, so the memory tier expires it on schedule too
+    assert resumed.updated_at == 1792407600.0
@@ -0,0 +1,54 @@
+"""Sharing read-only tool results between requests in one scope (batches)"""
+from handlers import HandlerContext, SharedToolResults, handle_function_call, sharing_tool_results
+from handlers.shared_results import share_key
+
+
+def _ctx(user_id, steps):
+    return HandlerContext(user_id=user_id, add_thought_step=lambda step, *args, **kwargs: steps.append(step))
+
+
+def test_share_keys():
+    search = {"product_query": "oat milk"}
+    assert share_key("a", "searchAmazonProduct", search) == share_key("b", "searchAmazonProduct", dict(search))
+    assert share_key("a", "getInventory", None) == ("a", "getInventory", "")
+    # Per-user reads are only shared without arguments
+    assert share_key("a", "getInventory", {"category": "Dairy"}) is None
+    assert share_key("a", "getCurrentTime", None) is None
+    assert share_key("a", "addToShoppingList", None) is None
+
+
+def test_user_independent_results_are_shared_across_users():
+    shared = SharedToolResults()
+    call = {"name": "searchAmazonProduct", "args": {"product_query": "oat milk"}}
+    first, second = [], []
+    with sharing_tool_results(shared):
+        a = handle_function_call(call, _ctx("user-a", first))
+        b = handle_function_call(call, _ctx("user-b", second))
+        other = handle_function_call(
+            {"name": "searchAmazonProduct", "args": {"product_query": "rice"}}, _ctx("user-b", [])
+        )
+    assert a == b
+    assert second == ["✅ Executed: searchAmazonProduct (shared)"]
+    assert "rice" in other
+    assert shared.hits == 1
+
+
+def test_current_time_is_never_shared():
+    shared = SharedToolResults()
+    steps = []
+    with sharing_tool_results(shared):
+        for user_id in ("user-a", "user-a", "user-b"):
+            handle_function_call({"name": "getCurrentTime", "args": {}}, _ctx(user_id, steps))
+    assert shared.hits == 0
+    assert not any("(shared)" in step for step in steps)
+
+
+def test_invalidation_keeps_user_independent_results():
+    shared = SharedToolResults()
+    catalog = share_key("a", "searchAmazonProduct", {"product_query": "rice"})
+    inventory = share_key("a", "getInventory", None)
+    shared.put(catalog, "catalog")
+    shared.put(inventory, "inventory")
+    shared.invalidate_user("a")
+    assert shared.get(catalog) == "catalog"
+    assert shared.get(inventory) is None
@@ -0,0 +1,60 @@
+"""Meal plan -> shopping list diff"""
+from utils import InventoryRow, ShoppingListRow
+from utils.shopping_diff import aggregate_ingredients, shopping_list_deficit
+
+
+def _inventory(name, quantity, unit):
+    return InventoryRow(name, name, quantity, unit, "Other", None, None, None)
+
+
+def _meal(*ingredients):
+    return {"ingredients": [{"item": item, "quantity": quantity, "unit": unit} for item, quantity, unit in ingredients]}
+
+
+def test_ingredients_are_aggregated_per_base_unit():
+    requirements, lines = aggregate_ingredients([
+        _meal(("Tomatoes", 200, "g"), ("olive oil", 2, "tbsp")),
+        _meal(("tomato", "0.3", "kg"), ("olive oil", None, None)),
+        {"name": "no ingredients"},
+    ])
+    assert lines == 4
+    tomato = next(r for r in requirements if r.key == "tomato")
+    assert (tomato.name, tomato.unit, tomato.amount, tomato.meals) == ("Tomatoes", "g", 500.0, 2)
+    # No amount and no unit counts as pieces, a different base than tablespoons
+    assert [(r.key, r.base) for r in requirements if r.key == "olive oil"] == [("olive oil", "ml"), ("olive oil", "piece")]
+
+
+def test_inventory_and_list_amounts_are_subtracted():
+    diff = shopping_list_deficit(
+        [_meal(("rice", 500, "g"), ("chicken", 1, "kg"), ("eggs", 6, None))],
+        [_inventory("rice", 1, "kg"), _inventory("chicken breast", 400, "g")],
+        [ShoppingListRow("s1", "eggs", 2, "pcs")],
+    )
+    assert diff["covered"] == ["rice"]
+    assert diff["to_buy"] == [
+        {"item": "chicken", "quantity": 0.6, "unit": "kg"},
+        {"item": "eggs", "quantity": 4.0, "unit": "piece"},
+    ]
+    assert (diff["lines"], diff["ingredients"]) == (3, 3)
+
+
+def test_open_ended_needs_and_list_entries():
+    diff = shopping_list_deficit(
+        [_meal(("salt", None, None), ("basil", None, None), ("lemons", 3, None))],
+        [_inventory("sea salt", 1, "kg")],
+        [ShoppingListRow("s1", "lemon", None, None)],
+    )
+    assert diff["covered"] == ["salt", "lemons"]
+    assert diff["to_buy"] == [{"item": "basil", "quantity": None, "unit": None}]
+
+
+def test_incomparable_units_are_reported_not_bought():
+    diff = shopping_list_deficit([_meal(("flour", 2, "cups"))], [_inventory("flour", 500, "g")], [])
+    assert diff["to_buy"] == []
+    assert diff["check"] == ["flour: recipes use cup, inventory has it in g"]
+
+
+def test_deficits_round_up():
+    diff = shopping_list_deficit([_meal(("milk", 1, "cup"))], [_inventory("milk", 100, "ml")], [])
+    # 236.588 ml needed, 100 ml on hand -> 0.5773 cup
+    assert diff["to_buy"] == [{"item": "milk", "quantity": 0.58, "unit": "cup"}]
@@ -0,0 +1,59 @@
+"""Delta sync responses"""
+import pytest
+
+from utils import sync
+
+
+def _change(version, table, row_id, op, **row):
+    return {"version": version, "table_name": table, "row_id": row_id, "op": op, "row_data": row or None}
+
+
+@pytest.fixture
+def log(monkeypatch):
+    entries = []
+    monkeypatch.setattr(sync, "get_user_changes", lambda user_id, since, limit: [e for e in entries if e["version"] > since][:limit])
+    monkeypatch.setattr(sync, "get_user_table_rows", lambda table, user_id: [{"id": f"{table}-row"}])
+    return entries
+
+
+def test_up_to_date_clients_get_nothing(log):
+    assert sync.build_delta("u", 5, 100, {"version": 5, "floor_version": 0}) == {
+        "version": 5, "reset": False, "has_more": False, "changes": {},
+    }
+
+
+@pytest.mark.parametrize("since", [0, 2, 9])
+def test_unknown_or_pruned_versions_get_a_snapshot(log, since):
+    delta = sync.build_delta("u", since, 100, {"version": 5, "floor_version": 3})
+    assert delta["reset"] and delta["version"] == 5
+    assert set(delta["changes"]) == set(sync.SYNC_TABLES)
+
+
+def test_only_the_final_row_state_is_sent(log):
+    log.extend([
+        _change(2, "user_inventory", "a", "insert", quantity=1),
+        _change(3, "user_inventory", "a", "update", quantity=2),
+        _change(4, "user_inventory", "b", "insert", quantity=1),
+        _change(5, "user_inventory", "b", "delete"),
+        _change(6, "shopping_lists", "c", "delete"),
+        _change(7, "shopping_lists", "c", "insert", item="milk"),
+    ])
+    delta = sync.build_delta("u", 1, 100, {"version": 7, "floor_version": 0})
+    assert delta == {
+        "version": 7,
+        "reset": False,
+        "has_more": False,
+        "changes": {
+            "user_inventory": {"upserted": [{"quantity": 2}], "deleted": ["b"]},
+            "shopping_lists": {"upserted": [{"item": "milk"}], "deleted": []},
+        },
+    }
+
+
+def test_long_logs_are_paged(log):
+    log.extend(_change(v, "user_leftovers", str(v), "insert", servings=v) for v in range(2, 8))
+    first = sync.build_delta("u", 1, 4, {"version": 7, "floor_version": 0})
+    assert first["has_more"] and first["version"] == 5
+    rest = sync.build_delta("u", first["version"], 4, {"version": 7, "floor_version": 0})
+    assert not rest["has_more"] and rest["version"] == 7
+    assert len(rest["changes"]["user_leftovers"]["upserted"]) == 2
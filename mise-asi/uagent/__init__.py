@@ -3,7 +3,7 @@ uAgent Module for Mise AI
 Provides decentralized agent capabilities without modifying existing functionality
 """
 from .agent import get_mise_agent, create_mise_agent
-from .models import ChatRequest, ChatResponse, HealthResponse, ToolsResponse
+from .models import ChatRequest, ChatResponse, HealthResponse, ToolsResponse, MetricsResponse
 
 __all__ = [
     "get_mise_agent",
@@ -12,4 +12,5 @@ __all__ = [
     "ChatResponse",
     "HealthResponse",
     "ToolsResponse",
+    "MetricsResponse",
 ]
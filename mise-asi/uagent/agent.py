@@ -7,7 +7,11 @@ This agent:
 2. Implements chat protocol for agent-to-agent communication
 3. Routes all requests through the existing Orchestrator
 4. Does NOT modify any existing functionality
+
+Chat messages are admitted through a MessageDispatcher so bursts from other
+agents run on a bounded worker pool with per-sender ordering.
 """
+import asyncio
 import os
 from datetime import datetime, timezone
 from typing import Optional
@@ -23,15 +27,20 @@ from uagents_core.contrib.protocols.chat import (
 from config import settings
 from orchestration import get_orchestrator
 from registry import get_all_tool_names
-from utils import get_logger
+from utils import get_logger, gauge, render_metrics, METRICS_CONTENT_TYPE, Deadline
 
-from .models import ChatRequest, ChatResponse, HealthResponse, ToolsResponse
+from .dispatcher import MessageDispatcher
+from .models import ChatRequest, ChatResponse, HealthResponse, ToolsResponse, MetricsResponse
 
 logger = get_logger(__name__)
 
 # Agent configuration from settings
 AGENT_PORT = int(os.getenv("AGENT_PORT", "8010"))
 AGENT_MAILBOX = os.getenv("AGENT_MAILBOX", "true").lower() == "true"
+AGENT_MAX_WORKERS = int(os.getenv("AGENT_MAX_WORKERS", "4"))
+AGENT_MAX_QUEUE_DEPTH = int(os.getenv("AGENT_MAX_QUEUE_DEPTH", "100"))
+
+BUSY_MESSAGE = "I'm handling a lot of requests right now. Please try again in a moment."
 
 # Singleton agent instance
 _mise_agent: Optional[Agent] = None
@@ -49,11 +58,20 @@ def create_mise_agent() -> Agent:
     # Include chat protocol
     chat_proto = Protocol(spec=chat_protocol_spec)
     
+    # Bounded worker pool for orchestrations
+    dispatcher = MessageDispatcher(
+        max_workers=AGENT_MAX_WORKERS,
+        max_queue_depth=AGENT_MAX_QUEUE_DEPTH,
+    )
+    gauge("mise_agent_queue_depth", "Queued uAgent chat jobs", fn=lambda: dispatcher.stats()["queue_depth"])
+    gauge("mise_agent_active_jobs", "Running uAgent chat jobs", fn=lambda: dispatcher.stats()["active"])
+    
     @agent.on_event("startup")
     async def on_startup(ctx: Context):
         """Initialize agent state on startup"""
         ctx.storage.set("total_messages", 0)
         ctx.storage.set("conversations", {})
+        dispatcher.start()
         ctx.logger.info(f"🚀 Mise Agent started at {agent.address}")
         ctx.logger.info(f"📍 REST endpoint: http://127.0.0.1:{AGENT_PORT}")
     
@@ -61,42 +79,22 @@ def create_mise_agent() -> Agent:
     async def on_shutdown(ctx: Context):
         """Cleanup on agent shutdown"""
         ctx.logger.info("Shutting down Mise Agent")
+        await dispatcher.stop()
     
-    @chat_proto.on_message(ChatMessage)
-    async def handle_chat_message(ctx: Context, sender: str, msg: ChatMessage):
-        """Handle incoming chat messages from other agents"""
+    async def process_chat_message(ctx: Context, sender: str, user_text: str):
+        """Run one queued chat message through the orchestrator and reply"""
         try:
-            # Extract text content from message
-            user_text = next(
-                (item.text for item in msg.content if isinstance(item, TextContent)), 
-                ""
-            ).strip()
-            
-            if not user_text:
-                ctx.logger.warning("No text content in message")
-                return
-            
-            ctx.logger.info(f"Chat message from {sender}: {user_text[:80]}...")
-            
-            # Send acknowledgement
-            await ctx.send(
-                sender,
-                ChatAcknowledgement(
-                    timestamp=datetime.now(timezone.utc),
-                    acknowledged_msg_id=msg.msg_id,
-                ),
-            )
-            
             # Get conversation history for this sender
             conversations = ctx.storage.get("conversations") or {}
             history = conversations.get(sender, [])
             
-            # Use existing orchestrator to process the message
+            # Use existing orchestrator to process the message off the event loop
             orchestrator = get_orchestrator()
-            result = orchestrator.process_message(
+            result = await asyncio.to_thread(
+                orchestrator.process_message,
                 message=user_text,
                 user_id=sender,
-                history=history
+                history=list(history)
             )
             
             response_text = result.get("text", "I couldn't generate a response.")
@@ -104,6 +102,7 @@ def create_mise_agent() -> Agent:
             # Update conversation history
             history.append({"role": "user", "content": user_text})
             history.append({"role": "assistant", "content": response_text})
+            conversations = ctx.storage.get("conversations") or {}
             conversations[sender] = history[-10:]  # Keep last 10 messages
             ctx.storage.set("conversations", conversations)
             
@@ -126,6 +125,50 @@ def create_mise_agent() -> Agent:
                 ChatMessage(content=[TextContent(text=fallback, type="text")])
             )
     
+    @chat_proto.on_message(ChatMessage)
+    async def handle_chat_message(ctx: Context, sender: str, msg: ChatMessage):
+        """Handle incoming chat messages from other agents"""
+        try:
+            # Extract text content from message
+            user_text = next(
+                (item.text for item in msg.content if isinstance(item, TextContent)), 
+                ""
+            ).strip()
+            
+            if not user_text:
+                ctx.logger.warning("No text content in message")
+                return
+            
+            ctx.logger.info(f"Chat message from {sender}: {user_text[:80]}...")
+            
+            # Send acknowledgement
+            await ctx.send(
+                sender,
+                ChatAcknowledgement(
+                    timestamp=datetime.now(timezone.utc),
+                    acknowledged_msg_id=msg.msg_id,
+                ),
+            )
+            
+            # Queue for processing; replies are sent by the worker in order
+            queued = dispatcher.submit(
+                sender, lambda: process_chat_message(ctx, sender, user_text)
+            )
+            
+            if queued is None:
+                await ctx.send(
+                    sender,
+                    ChatMessage(content=[TextContent(text=BUSY_MESSAGE, type="text")]),
+                )
+            
+        except Exception as exc:
+            ctx.logger.error(f"Error processing chat message: {exc}")
+            fallback = "I encountered an error while processing your request."
+            await ctx.send(
+                sender, 
+                ChatMessage(content=[TextContent(text=fallback, type="text")])
+            )
+    
     @chat_proto.on_message(ChatAcknowledgement)
     async def handle_acknowledgement(ctx: Context, sender: str, msg: ChatAcknowledgement):
         """Handle message acknowledgements"""
@@ -144,6 +187,8 @@ def create_mise_agent() -> Agent:
         sender_id = req.sender or req.user_id or "rest_client"
         user_text = (req.message or "").strip()
         history = req.history or []
+        # Budget starts on arrival so time spent queued for a worker counts
+        deadline = Deadline.for_request(req.deadline_ms)
         
         if not user_text:
             return ChatResponse(
@@ -157,14 +202,30 @@ def create_mise_agent() -> Agent:
         try:
             ctx.logger.info(f"REST chat from {sender_id}: {user_text[:80]}...")
             
-            # Use existing orchestrator
+            # Use existing orchestrator through the bounded worker pool
             orchestrator = get_orchestrator()
-            result = orchestrator.process_message(
-                message=user_text,
-                user_id=sender_id,
-                history=history
+            queued = dispatcher.submit(
+                sender_id,
+                lambda: asyncio.to_thread(
+                    orchestrator.process_message,
+                    message=user_text,
+                    user_id=sender_id,
+                    history=history,
+                    deadline=deadline
+                )
             )
             
+            if queued is None:
+                return ChatResponse(
+                    text=BUSY_MESSAGE,
+                    function_calls=[],
+                    thought_steps=[],
+                    sender=sender_id,
+                    error="busy",
+                )
+            
+            result = await queued
+            
             # Update counter
             total = ctx.storage.get("total_messages") or 0
             ctx.storage.set("total_messages", total + 1)
@@ -194,6 +255,7 @@ def create_mise_agent() -> Agent:
             agent_name=agent.name,
             agent_address=agent.address,
             version="1.0.0",
+            queue=dispatcher.stats(),
         )
     
     @agent.on_rest_get("/tools", ToolsResponse)
@@ -201,6 +263,11 @@ def create_mise_agent() -> Agent:
         """List available tools"""
         return ToolsResponse(tools=get_all_tool_names())
     
+    @agent.on_rest_get("/metrics", MetricsResponse)
+    async def rest_metrics(ctx: Context) -> MetricsResponse:
+        """Prometheus-style metrics for this process"""
+        return MetricsResponse(content_type=METRICS_CONTENT_TYPE, text=render_metrics())
+    
     return agent
 
 
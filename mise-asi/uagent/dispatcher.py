@@ -0,0 +1,163 @@
+"""
+Message dispatcher for the Mise uAgent
+Admission control for orchestrations triggered by agent messages
+
+This dispatcher:
+1. Runs orchestrations on a bounded pool of async workers
+2. Keeps a FIFO queue per sender so one sender's messages run in order
+3. Rejects new work once the global queue depth limit is reached
+4. Exposes queue metrics for the /health endpoint
+"""
+import asyncio
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Optional
+
+from utils import get_logger
+
+logger = get_logger(__name__)
+
+# A job is a zero-argument coroutine factory
+Job = Callable[[], Awaitable[Any]]
+
+
+class MessageDispatcher:
+    """
+    Bounded worker pool with per-sender FIFO queues
+
+    Senders with pending work are scheduled round-robin through a ready
+    queue. A sender is never in the ready queue while one of its jobs is
+    running, which guarantees per-sender ordering.
+    """
+
+    def __init__(self, max_workers: int = 4, max_queue_depth: int = 100):
+        self.max_workers = max(1, max_workers)
+        self.max_queue_depth = max(1, max_queue_depth)
+
+        self._pending: dict[str, deque] = {}
+        self._active: set[str] = set()
+        self._ready: Optional[asyncio.Queue] = None
+        self._workers: list[asyncio.Task] = []
+        self._depth = 0
+
+        # Counters
+        self._accepted = 0
+        self._rejected = 0
+        self._started = 0
+        self._completed = 0
+        self._failed = 0
+        self._max_wait = 0.0
+        self._total_wait = 0.0
+
+    @property
+    def running(self) -> bool:
+        return bool(self._workers)
+
+    def start(self):
+        """Start the worker tasks on the running event loop"""
+        if self.running:
+            return
+        self._ready = asyncio.Queue()
+        self._workers = [
+            asyncio.create_task(self._worker(i)) for i in range(self.max_workers)
+        ]
+        logger.info(
+            f"Dispatcher started with {self.max_workers} workers "
+            f"(max queue depth {self.max_queue_depth})"
+        )
+
+    async def stop(self):
+        """Cancel workers and drop any queued work"""
+        for task in self._workers:
+            task.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+        for queue in self._pending.values():
+            for _, future, _ in queue:
+                if not future.done():
+                    future.cancel()
+        self._pending.clear()
+        self._active.clear()
+        self._depth = 0
+
+    def submit(self, sender: str, job: Job) -> Optional[asyncio.Future]:
+        """
+        Queue a job for a sender
+        Returns a future resolving to the job result, or None when the
+        dispatcher is at capacity and the job was rejected
+        """
+        if not self.running:
+            self.start()
+
+        if self._depth >= self.max_queue_depth:
+            self._rejected += 1
+            logger.warning(f"Dispatcher busy, rejecting message from {sender}")
+            return None
+
+        future = asyncio.get_running_loop().create_future()
+        queue = self._pending.setdefault(sender, deque())
+        queue.append((job, future, time.monotonic()))
+        self._depth += 1
+        self._accepted += 1
+
+        # Schedule the sender unless it is already waiting or running
+        if len(queue) == 1 and sender not in self._active:
+            self._ready.put_nowait(sender)
+
+        return future
+
+    async def _worker(self, index: int):
+        while True:
+            sender = await self._ready.get()
+            queue = self._pending.get(sender)
+            if not queue:
+                continue
+
+            job, future, enqueued_at = queue.popleft()
+            self._depth -= 1
+            self._active.add(sender)
+
+            wait = time.monotonic() - enqueued_at
+            self._started += 1
+            self._total_wait += wait
+            self._max_wait = max(self._max_wait, wait)
+
+            try:
+                if not future.cancelled():
+                    result = await job()
+                    if not future.done():
+                        future.set_result(result)
+                self._completed += 1
+            except asyncio.CancelledError:
+                if not future.done():
+                    future.cancel()
+                raise
+            except Exception as exc:
+                self._failed += 1
+                logger.error(f"Dispatcher job for {sender} failed: {exc}")
+                if not future.done():
+                    future.set_exception(exc)
+            finally:
+                self._active.discard(sender)
+                if queue:
+                    self._ready.put_nowait(sender)
+                else:
+                    self._pending.pop(sender, None)
+
+    def stats(self) -> dict:
+        """Queue metrics for health reporting"""
+        waiting = sum(1 for s, q in self._pending.items() if q and s not in self._active)
+        return {
+            "workers": self.max_workers,
+            "active": len(self._active),
+            "queue_depth": self._depth,
+            "max_queue_depth": self.max_queue_depth,
+            "senders_waiting": waiting,
+            "accepted": self._accepted,
+            "rejected": self._rejected,
+            "completed": self._completed,
+            "failed": self._failed,
+            "avg_wait_seconds": round(self._total_wait / self._started, 4) if self._started else 0.0,
+            "max_wait_seconds": round(self._max_wait, 4),
+        }
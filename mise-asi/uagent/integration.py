@@ -10,17 +10,23 @@ Usage in main.py (optional):
     
     # At shutdown
     stop_agent()
+
+Usage in the ASGI server (same event loop):
+    task = start_agent_task()
+    ...
+    await stop_agent_task(task)
 """
-import os
+import asyncio
 import threading
 from typing import Optional
 
+from config import settings
 from utils import get_logger
 
 logger = get_logger(__name__)
 
 # Environment variable to control agent startup
-UAGENT_ENABLED = os.getenv("UAGENT_ENABLED", "false").lower() == "true"
+UAGENT_ENABLED = settings.UAGENT_ENABLED
 
 # Thread for running agent
 _agent_thread: Optional[threading.Thread] = None
@@ -80,6 +86,51 @@ def stop_agent():
     # The daemon thread will be killed when the main process exits
 
 
+def start_agent_task() -> Optional[asyncio.Task]:
+    """
+    Start the uAgent as a task on the running event loop
+    Used by the ASGI server so the agent shares its loop and orchestrator
+    """
+    global _running
+    
+    if _running:
+        logger.warning("uAgent already running")
+        return None
+    
+    from .agent import get_mise_agent
+    
+    agent = get_mise_agent()
+    
+    async def run_agent():
+        global _running
+        _running = True
+        try:
+            logger.info(f"Starting uAgent on port {agent._port} (shared event loop)...")
+            await agent.run_async()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"uAgent error: {e}")
+        finally:
+            _running = False
+    
+    task = asyncio.create_task(run_agent())
+    logger.info(f"uAgent started at {agent.address}")
+    return task
+
+
+async def stop_agent_task(task: asyncio.Task, timeout: float = 10.0):
+    """Cancel an agent task started with start_agent_task and wait for it"""
+    logger.info("Stopping uAgent...")
+    task.cancel()
+    try:
+        await asyncio.wait_for(task, timeout=timeout)
+    except (asyncio.CancelledError, asyncio.TimeoutError):
+        pass
+    except Exception as e:
+        logger.error(f"uAgent shutdown error: {e}")
+
+
 def is_agent_running() -> bool:
     """Check if the agent is currently running"""
     return _running
@@ -12,6 +12,7 @@ class ChatRequest(Model):
     user_id: str
     sender: Optional[str] = None
     history: Optional[List[Dict[str, str]]] = None
+    deadline_ms: Optional[int] = None
 
 
 class ChatResponse(Model):
@@ -29,8 +30,15 @@ class HealthResponse(Model):
     agent_name: str
     agent_address: str
     version: str
+    queue: Optional[Dict] = None
 
 
 class ToolsResponse(Model):
     """Response model for /tools endpoint"""
     tools: List[str]
+
+
+class MetricsResponse(Model):
+    """Response model for /metrics endpoint - Prometheus text exposition"""
+    content_type: str
+    text: str
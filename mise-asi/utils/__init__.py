@@ -1,4 +1,32 @@
 from .logger import get_logger
+from . import jsoncodec
+from .metrics import counter, gauge, histogram, render_metrics, CONTENT_TYPE as METRICS_CONTENT_TYPE
+from .tracing import start_trace, span, current_span
+from .profiling import profiled, get_profile_store
+from .deadline import Deadline, DeadlineExceeded, current_deadline, deadline_scope, check_deadline
+from .sync import SYNC_TABLES, build_delta
+from .singleflight import SingleFlight
+from .units import (
+    normalize_unit,
+    to_base,
+    convert,
+    parse_quantity,
+    format_quantity,
+    ingredient_key,
+    match_ingredient,
+    IngredientIndex,
+)
+from .rows import (
+    HIDDEN_FIELDS,
+    InventoryRow,
+    ShoppingListRow,
+    LeftoverRow,
+    PreferencesRow,
+    UseSoonRow,
+    DisplayView,
+    decode_rows,
+)
+from .shopping_diff import Requirement, aggregate_ingredients, shopping_list_deficit
 from .supabase_client import (
     get_supabase_client,
     get_user_inventory,
@@ -13,10 +41,64 @@ from .supabase_client import (
     update_leftover_item,
     delete_leftover_item,
     update_user_notes,
+    get_orchestrator_session,
+    save_orchestrator_session,
+    prune_orchestrator_sessions,
+    get_meal_plan,
+    set_meal_plan_slot,
+    save_precomputed_meal_plan,
+    touch_meal_plan_request,
+    get_meal_plan_candidates,
+    get_sync_state,
+    get_user_changes,
+    get_user_table_rows,
+    prune_user_change_log,
+    refresh_use_soon_items,
+    get_use_soon_items,
+    consume_inventory_items,
+    mark_shopping_items_purchased,
 )
 
 __all__ = [
     "get_logger",
+    "jsoncodec",
+    "counter",
+    "gauge",
+    "histogram",
+    "render_metrics",
+    "METRICS_CONTENT_TYPE",
+    "start_trace",
+    "span",
+    "current_span",
+    "profiled",
+    "get_profile_store",
+    "Deadline",
+    "DeadlineExceeded",
+    "current_deadline",
+    "deadline_scope",
+    "check_deadline",
+    "SYNC_TABLES",
+    "build_delta",
+    "SingleFlight",
+    "normalize_unit",
+    "to_base",
+    "convert",
+    "parse_quantity",
+    "format_quantity",
+    "ingredient_key",
+    "match_ingredient",
+    "IngredientIndex",
+    "HIDDEN_FIELDS",
+    "InventoryRow",
+    "ShoppingListRow",
+    "LeftoverRow",
+    "PreferencesRow",
+    "UseSoonRow",
+    "DisplayView",
+    "decode_rows",
+    "Requirement",
+    "aggregate_ingredients",
+    "shopping_list_deficit",
     "get_supabase_client",
     "get_user_inventory",
     "update_user_inventory", 
@@ -30,4 +112,20 @@ __all__ = [
     "update_leftover_item",
     "delete_leftover_item",
     "update_user_notes",
+    "get_orchestrator_session",
+    "save_orchestrator_session",
+    "prune_orchestrator_sessions",
+    "get_meal_plan",
+    "set_meal_plan_slot",
+    "save_precomputed_meal_plan",
+    "touch_meal_plan_request",
+    "get_meal_plan_candidates",
+    "get_sync_state",
+    "get_user_changes",
+    "get_user_table_rows",
+    "prune_user_change_log",
+    "refresh_use_soon_items",
+    "get_use_soon_items",
+    "consume_inventory_items",
+    "mark_shopping_items_purchased",
 ]
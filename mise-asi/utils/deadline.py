@@ -0,0 +1,76 @@
+"""
+Per-request deadlines for mise-asi
+A time budget that travels with the request to the LLM, tools and database
+
+The active deadline lives in a context variable, so code running inside a
+request (including speculative prefetch threads, which copy the context)
+can ask how much time is left without it being threaded through every call.
+"""
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator
+
+from config import settings
+
+_current_deadline: ContextVar["Deadline | None"] = ContextVar("mise_deadline", default=None)
+
+
+class DeadlineExceeded(Exception):
+    """Raised when work is attempted after the request deadline"""
+
+
+class Deadline:
+    """Absolute point in (monotonic) time by which a request must answer"""
+
+    __slots__ = ("budget", "expires_at")
+
+    def __init__(self, seconds: float):
+        self.budget = seconds
+        self.expires_at = time.monotonic() + seconds
+
+    @classmethod
+    def for_request(cls, deadline_ms: int | float | None = None) -> "Deadline":
+        """Deadline from a client-supplied budget, clamped to server limits"""
+        if deadline_ms is None:
+            seconds = settings.CHAT_DEADLINE_SECONDS
+        else:
+            seconds = float(deadline_ms) / 1000
+        return cls(min(max(seconds, settings.CHAT_MIN_DEADLINE_SECONDS), settings.CHAT_MAX_DEADLINE_SECONDS))
+
+    def remaining(self) -> float:
+        """Seconds left (never negative)"""
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def expired(self) -> bool:
+        return time.monotonic() >= self.expires_at
+
+    def can_fit(self, seconds: float) -> bool:
+        """True if work expected to take `seconds` should finish in time"""
+        return self.remaining() >= seconds
+
+    def expire(self):
+        """End the budget now; in-flight work stops at its next deadline check"""
+        self.expires_at = time.monotonic()
+
+
+def current_deadline() -> Deadline | None:
+    """Deadline of the request being processed, if any"""
+    return _current_deadline.get()
+
+
+@contextmanager
+def deadline_scope(deadline: Deadline) -> Iterator[Deadline]:
+    """Make `deadline` the active deadline for the block"""
+    token = _current_deadline.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _current_deadline.reset(token)
+
+
+def check_deadline(operation: str):
+    """Raise DeadlineExceeded if the active deadline has passed"""
+    deadline = _current_deadline.get()
+    if deadline is not None and deadline.expired():
+        raise DeadlineExceeded(f"Deadline exceeded before {operation}")
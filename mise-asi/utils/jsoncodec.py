@@ -0,0 +1,63 @@
+"""
+JSON codec for mise-asi
+Uses orjson when it is installed, the standard library otherwise
+
+JSON_CODEC=auto (default) picks orjson if importable; "json" forces the
+standard library. Both produce compact output with unescaped unicode, so
+sort_keys=True output is byte-stable for a given codec.
+"""
+import json
+from typing import Any
+
+from config import settings
+
+
+def _load_orjson():
+    if settings.JSON_CODEC == "json":
+        return None
+    try:
+        import orjson
+        return orjson
+    except ImportError:
+        if settings.JSON_CODEC == "orjson":
+            raise
+        return None
+
+
+_orjson = _load_orjson()
+
+CODEC_NAME = "orjson" if _orjson is not None else "json"
+
+
+if _orjson is not None:
+    _OPTIONS = _orjson.OPT_NON_STR_KEYS
+    _SORTED_OPTIONS = _OPTIONS | _orjson.OPT_SORT_KEYS
+
+    def dumps(value: Any, sort_keys: bool = False) -> bytes:
+        """Encode to UTF-8 JSON bytes"""
+        return _orjson.dumps(value, default=str, option=_SORTED_OPTIONS if sort_keys else _OPTIONS)
+
+    def loads(data: str | bytes) -> Any:
+        """Decode JSON text or bytes"""
+        return _orjson.loads(data)
+
+else:
+
+    def dumps(value: Any, sort_keys: bool = False) -> bytes:
+        """Encode to UTF-8 JSON bytes"""
+        return json.dumps(
+            value, default=str, sort_keys=sort_keys, separators=(",", ":"), ensure_ascii=False
+        ).encode("utf-8")
+
+    def loads(data: str | bytes) -> Any:
+        """Decode JSON text or bytes"""
+        return json.loads(data)
+
+
+def dumps_str(value: Any, sort_keys: bool = False) -> str:
+    """Encode to a JSON string"""
+    return dumps(value, sort_keys=sort_keys).decode("utf-8")
+
+
+# Raised by loads() for malformed input with either codec
+JSONDecodeError = _orjson.JSONDecodeError if _orjson is not None else json.JSONDecodeError
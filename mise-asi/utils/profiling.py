@@ -0,0 +1,224 @@
+"""
+On-demand request profiling for mise-asi
+Sampling profiler + tracemalloc snapshots around a single chat request
+
+Only requests that opt in pay for stack sampling. A background thread
+samples the profiled thread's stack every PROFILE_INTERVAL_MS and folds the
+stacks into collapsed format ("frame;frame;frame count"), ready for
+flamegraph.pl or speedscope. Finished profiles are stored under an id and
+can be fetched later from /profile.
+
+Allocation tracking is a separate opt-in (allocations=True). tracemalloc is
+process-wide: while it runs, every allocation in every thread is traced, so
+concurrent requests that did not opt in slow down too. Its snapshots also
+cover the whole process rather than the profiled request. Use it on a quiet
+instance.
+"""
+import os
+import secrets
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter, OrderedDict
+from contextlib import contextmanager
+from typing import Iterator
+
+from config import settings
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+# Frames tracemalloc keeps per allocation; deeper costs more memory
+TRACEMALLOC_FRAMES = 8
+
+
+class SamplingProfiler:
+    """Samples one thread's Python stack from a background thread"""
+
+    def __init__(self, thread_id: int, interval: float = 0.005, max_depth: int = 64):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.max_depth = max_depth
+        self.stacks: Counter[str] = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="mise-profiler", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            names = []
+            while frame is not None and len(names) < self.max_depth:
+                code = frame.f_code
+                names.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            self.stacks[";".join(reversed(names))] += 1
+            self.samples += 1
+
+    def collapsed(self) -> str:
+        """Collapsed stacks, one "stack count" line each, hottest first"""
+        return "\n".join(f"{stack} {count}" for stack, count in self.stacks.most_common())
+
+
+class _Tracemalloc:
+    """Reference-counted tracemalloc so overlapping profiles share one tracer"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._users = 0
+        self._started_here = False
+
+    def acquire(self):
+        with self._lock:
+            if self._users == 0 and not tracemalloc.is_tracing():
+                tracemalloc.start(TRACEMALLOC_FRAMES)
+                self._started_here = True
+            self._users += 1
+
+    def release(self):
+        with self._lock:
+            self._users -= 1
+            if self._users == 0 and self._started_here:
+                tracemalloc.stop()
+                self._started_here = False
+
+
+_tracemalloc = _Tracemalloc()
+
+
+class Profile:
+    """Result of one profiled request"""
+
+    def __init__(self, label: str):
+        self.id = secrets.token_hex(8)
+        self.label = label
+        self.created_at = time.time()
+        self.duration_ms = 0.0
+        self.samples = 0
+        self.interval_ms = 0.0
+        self.collapsed = ""
+        self.allocations: list[dict] = []
+        # None when allocations were not traced
+        self.traced_peak_kb: float | None = None
+
+    def to_dict(self, include_stacks: bool = True) -> dict:
+        data = {
+            "id": self.id,
+            "label": self.label,
+            "created_at": self.created_at,
+            "duration_ms": self.duration_ms,
+            "samples": self.samples,
+            "interval_ms": self.interval_ms,
+            "traced_peak_kb": self.traced_peak_kb,
+            "top_allocations": self.allocations,
+        }
+        if include_stacks:
+            data["collapsed_stacks"] = self.collapsed
+        return data
+
+
+@contextmanager
+def profiled(label: str = "", allocations: bool = False) -> Iterator[Profile]:
+    """
+    Profile the calling thread for the duration of the block and store the result
+    allocations=True also traces allocations, which slows the whole process (see above)
+    """
+    profile = Profile(label)
+    profile.interval_ms = settings.PROFILE_INTERVAL_MS
+    sampler = SamplingProfiler(threading.get_ident(), interval=settings.PROFILE_INTERVAL_MS / 1000)
+
+    before = None
+    if allocations:
+        _tracemalloc.acquire()
+        before = tracemalloc.take_snapshot()
+        tracemalloc.reset_peak()
+    start = time.perf_counter()
+    sampler.start()
+    try:
+        yield profile
+    finally:
+        sampler.stop()
+        profile.duration_ms = round((time.perf_counter() - start) * 1000, 3)
+        if before is not None:
+            after = tracemalloc.take_snapshot()
+            profile.traced_peak_kb = round(tracemalloc.get_traced_memory()[1] / 1024, 1)
+            _tracemalloc.release()
+            profile.allocations = _top_allocations(before, after, settings.PROFILE_TOP_ALLOCATIONS)
+
+        profile.samples = sampler.samples
+        profile.collapsed = sampler.collapsed()
+        get_profile_store().put(profile)
+
+
+def _top_allocations(before: tracemalloc.Snapshot, after: tracemalloc.Snapshot, limit: int) -> list[dict]:
+    """Allocation sites that grew the most between two snapshots"""
+    ignore = [
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+    ]
+    diffs = after.filter_traces(ignore).compare_to(before.filter_traces(ignore), "lineno")
+    top = []
+    for diff in diffs[:limit]:
+        frame = diff.traceback[0]
+        top.append({
+            "site": f"{frame.filename}:{frame.lineno}",
+            "size_kb": round(diff.size_diff / 1024, 1),
+            "count": diff.count_diff,
+        })
+    return top
+
+
+class ProfileStore:
+    """Keeps the most recent profiles in memory, optionally mirrored to disk"""
+
+    def __init__(self, max_profiles: int = 50, directory: str = ""):
+        self.max_profiles = max_profiles
+        self.directory = directory
+        self._profiles: OrderedDict[str, Profile] = OrderedDict()
+        self._lock = threading.Lock()
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def put(self, profile: Profile):
+        with self._lock:
+            self._profiles[profile.id] = profile
+            while len(self._profiles) > self.max_profiles:
+                self._profiles.popitem(last=False)
+        if self.directory:
+            try:
+                path = os.path.join(self.directory, f"{profile.id}.collapsed")
+                with open(path, "w", encoding="utf-8") as f:
+                    f.write(profile.collapsed + "\n")
+            except OSError as e:
+                logger.warning(f"Could not write profile {profile.id}: {e}")
+        logger.info(f"Stored profile {profile.id} ({profile.samples} samples, {profile.duration_ms:.0f}ms)")
+
+    def get(self, profile_id: str) -> Profile | None:
+        with self._lock:
+            return self._profiles.get(profile_id)
+
+    def list(self) -> list[dict]:
+        with self._lock:
+            return [p.to_dict(include_stacks=False) for p in reversed(self._profiles.values())]
+
+
+# Singleton instance
+_store: ProfileStore | None = None
+
+
+def get_profile_store() -> ProfileStore:
+    """Get or create profile store singleton"""
+    global _store
+    if _store is None:
+        _store = ProfileStore(max_profiles=settings.PROFILE_MAX_STORED, directory=settings.PROFILE_DIR)
+    return _store
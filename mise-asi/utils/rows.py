@@ -0,0 +1,167 @@
+"""
+Typed row models for user data tables
+Decoded straight from Supabase response data
+
+Each class keeps only the columns the handlers read, in __slots__, for
+code that keeps rows around and reads them repeatedly (matching, planning);
+to_dict() is for callers that need a plain payload. Text renderers read the
+response dicts directly instead: building one object per row costs as much
+CPU as the render itself (benchmarks/row_rendering.py).
+
+Missing columns decode to the same defaults the handlers use with
+dict.get().
+"""
+from collections.abc import Iterable, Iterator, Mapping
+from typing import Any
+
+
+# Columns never shown to the user or the model
+HIDDEN_FIELDS = frozenset({"id", "user_id", "created_at", "updated_at"})
+
+
+class InventoryRow:
+    """One user_inventory row"""
+    __slots__ = ("id", "item_name", "quantity", "unit", "category", "location", "notes", "expiry_date")
+
+    def __init__(self, id, item_name, quantity, unit, category, location, notes, expiry_date):
+        self.id = id
+        self.item_name = item_name
+        self.quantity = quantity
+        self.unit = unit
+        self.category = category
+        self.location = location
+        self.notes = notes
+        self.expiry_date = expiry_date
+
+    @classmethod
+    def from_dict(cls, row: dict) -> "InventoryRow":
+        get = row.get
+        return cls(
+            get("id"), get("item_name", ""), get("quantity", ""), get("unit", ""),
+            get("category", "Other"), get("location"), get("notes"), get("expiry_date"),
+        )
+
+    def to_dict(self) -> dict:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __repr__(self) -> str:
+        return f"InventoryRow({self.item_name!r}, {self.quantity!r} {self.unit!r})"
+
+
+class ShoppingListRow:
+    """One shopping_lists row"""
+    __slots__ = ("id", "item", "quantity", "unit")
+
+    def __init__(self, id, item, quantity, unit):
+        self.id = id
+        self.item = item
+        self.quantity = quantity
+        self.unit = unit
+
+    @classmethod
+    def from_dict(cls, row: dict) -> "ShoppingListRow":
+        get = row.get
+        return cls(get("id"), get("item", "Unknown"), get("quantity", ""), get("unit", ""))
+
+    def to_dict(self) -> dict:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __repr__(self) -> str:
+        return f"ShoppingListRow({self.item!r}, {self.quantity!r} {self.unit!r})"
+
+
+class LeftoverRow:
+    """One user_leftovers row"""
+    __slots__ = ("id", "meal_name", "servings", "notes", "date_created")
+
+    def __init__(self, id, meal_name, servings, notes, date_created):
+        self.id = id
+        self.meal_name = meal_name
+        self.servings = servings
+        self.notes = notes
+        self.date_created = date_created
+
+    @classmethod
+    def from_dict(cls, row: dict) -> "LeftoverRow":
+        get = row.get
+        return cls(get("id"), get("meal_name", "Unknown"), get("servings", 0), get("notes"), get("date_created"))
+
+    def to_dict(self) -> dict:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __repr__(self) -> str:
+        return f"LeftoverRow({self.meal_name!r}, {self.servings!r})"
+
+
+class PreferencesRow:
+    """The single user_preferences row"""
+    __slots__ = ("dietary_restrictions", "allergies", "calorie_goal", "protein_goal", "cuisine_preferences")
+
+    def __init__(self, dietary_restrictions, allergies, calorie_goal, protein_goal, cuisine_preferences):
+        self.dietary_restrictions = dietary_restrictions
+        self.allergies = allergies
+        self.calorie_goal = calorie_goal
+        self.protein_goal = protein_goal
+        self.cuisine_preferences = cuisine_preferences
+
+    @classmethod
+    def from_dict(cls, row: dict) -> "PreferencesRow":
+        get = row.get
+        return cls(
+            get("dietary_restrictions"), get("allergies"), get("calorie_goal"),
+            get("protein_goal"), get("cuisine_preferences"),
+        )
+
+    def to_dict(self) -> dict:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class UseSoonRow:
+    """One use_soon_items row (an inventory item or leftover near its use-by date)"""
+    __slots__ = ("use_by", "source", "name", "quantity", "unit")
+
+    def __init__(self, use_by, source, name, quantity, unit):
+        self.use_by = use_by
+        self.source = source
+        self.name = name
+        self.quantity = quantity
+        self.unit = unit
+
+    @classmethod
+    def from_dict(cls, row: dict) -> "UseSoonRow":
+        get = row.get
+        return cls(get("use_by"), get("source", "inventory"), get("name", ""), get("quantity"), get("unit"))
+
+    def to_dict(self) -> dict:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __repr__(self) -> str:
+        return f"UseSoonRow({self.name!r}, {self.use_by!r})"
+
+
+def decode_rows(row_type, data: Iterable[dict] | None) -> list:
+    """Decode a response's data list into row objects"""
+    from_dict = row_type.from_dict
+    return [from_dict(row) for row in data or ()]
+
+
+class DisplayView(Mapping):
+    """Read-only view of a row dict without the HIDDEN_FIELDS; nothing is copied"""
+    __slots__ = ("_row",)
+
+    def __init__(self, row: dict):
+        self._row = row
+
+    def __getitem__(self, key: str) -> Any:
+        if key in HIDDEN_FIELDS:
+            raise KeyError(key)
+        return self._row[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return (key for key in self._row if key not in HIDDEN_FIELDS)
+
+    def __len__(self) -> int:
+        return sum(1 for key in self._row if key not in HIDDEN_FIELDS)
+
+    def __repr__(self) -> str:
+        return f"DisplayView({dict(self)!r})"
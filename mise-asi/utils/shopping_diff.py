@@ -0,0 +1,158 @@
+"""
+Meal plan -> shopping list diff
+What to buy for a set of planned meals, given the inventory and the current list
+
+Ingredient lines are aggregated per (ingredient key, base unit) using
+utils/units.py, then inventory and shopping-list amounts in the same base
+unit are subtracted. Names match exactly first, then by a unique partial
+match ('chicken' -> 'chicken breast') through a word index. An ingredient stocked only in an
+incomparable unit (cups of flour vs grams in the pantry) is reported for
+the user to check instead of being bought twice. Everything is dict
+lookups per distinct ingredient, so thousands of lines take milliseconds.
+"""
+import math
+from collections.abc import Iterable
+from dataclasses import dataclass
+
+from .rows import InventoryRow, ShoppingListRow
+from .units import IngredientIndex, convert, ingredient_key, normalize_unit, parse_quantity, to_base
+
+# Deficits below this (in base units) are rounding noise
+_EPSILON = 1e-6
+
+
+@dataclass(slots=True)
+class Requirement:
+    """Total need for one ingredient in one base unit"""
+    key: str
+    name: str
+    base: str
+    # Unit the deficit is written in (first unit seen for this ingredient)
+    unit: str
+    # In base units; None when no line gave an amount (the item just has to be there)
+    amount: float | None
+    meals: int = 1
+
+
+def aggregate_ingredients(meals: Iterable[dict]) -> tuple[list[Requirement], int]:
+    """(requirements in first-seen order, number of ingredient lines read)"""
+    requirements: dict[tuple[str, str], Requirement] = {}
+    # Plans repeat names and units a lot; normalize each once
+    keys: dict[str, str] = {}
+    units: dict[str | None, tuple[float, str]] = {}
+    lines = 0
+    for meal in meals:
+        for ingredient in meal.get("ingredients") or ():
+            lines += 1
+            name = ingredient.get("item") or ingredient.get("item_name") or ""
+            key = keys.get(name)
+            if key is None:
+                key = keys[name] = ingredient_key(name)
+            if not key:
+                continue
+            unit = ingredient.get("unit")
+            scale = units.get(unit)
+            if scale is None:
+                scale = units[unit] = to_base(1.0, unit)
+            factor, base = scale
+            quantity = parse_quantity(ingredient.get("quantity"))
+            amount = quantity * factor if quantity is not None else None
+            requirement = requirements.get((key, base))
+            if requirement is None:
+                requirements[(key, base)] = Requirement(key, name, base, normalize_unit(unit), amount)
+                continue
+            requirement.meals += 1
+            if amount is not None:
+                requirement.amount = (requirement.amount or 0.0) + amount
+    return list(requirements.values()), lines
+
+
+def _stock(rows: Iterable[tuple[str, object, str | None]]) -> dict[str, IngredientIndex]:
+    """base unit -> index of ingredient key -> amount, from (name, quantity, unit) triples with a quantity"""
+    stock: dict[str, dict[str, float]] = {}
+    for name, quantity, unit in rows:
+        key = ingredient_key(name)
+        value = parse_quantity(quantity)
+        if not key or value is None:
+            continue
+        amount, base = to_base(value, unit)
+        by_key = stock.setdefault(base, {})
+        by_key[key] = by_key.get(key, 0.0) + amount
+    return {base: IngredientIndex(by_key) for base, by_key in stock.items()}
+
+
+def _available(stock: dict[str, IngredientIndex], requirement: Requirement) -> float | None:
+    index = stock.get(requirement.base)
+    return index.match(requirement.key) if index is not None else None
+
+
+def shopping_list_deficit(
+    meals: Iterable[dict],
+    inventory: list[InventoryRow],
+    shopping_list: list[ShoppingListRow],
+) -> dict:
+    """
+    Shopping list rows to add so the meals can be cooked
+    Returns {"to_buy": [{"item", "quantity", "unit"}], "covered": [names],
+    "check": [reasons], "lines": ingredient lines read, "ingredients": distinct ingredients}
+    """
+    requirements, lines = aggregate_ingredients(meals)
+    on_hand = _stock((item.item_name, item.quantity, item.unit) for item in inventory)
+    listed = _stock((row.item, row.quantity, row.unit) for row in shopping_list)
+    # Names only, for needs without an amount: anything in stock or on the list
+    present = IngredientIndex({
+        key: True for index in (*on_hand.values(), *listed.values())
+        for key, amount in index.keys.items() if amount > 0
+    })
+    # A list entry without an amount covers whatever is needed
+    open_ended = IngredientIndex({
+        ingredient_key(row.item): True for row in shopping_list if parse_quantity(row.quantity) is None
+    })
+    stocked_units = {
+        key: base for base, index in on_hand.items() for key in index.keys
+    }
+
+    to_buy: list[dict] = []
+    covered: list[str] = []
+    check: list[str] = []
+    for requirement in requirements:
+        if open_ended.match(requirement.key):
+            covered.append(requirement.name)
+            continue
+
+        if requirement.amount is None:
+            if present.match(requirement.key):
+                covered.append(requirement.name)
+            else:
+                to_buy.append({"item": requirement.name, "quantity": None, "unit": None})
+            continue
+
+        have = _available(on_hand, requirement)
+        pending = _available(listed, requirement)
+        if have is None and pending is None:
+            other_base = stocked_units.get(requirement.key)
+            if other_base is not None and other_base != requirement.base:
+                check.append(
+                    f"{requirement.name}: recipes use {requirement.unit}, inventory has it in {other_base}"
+                )
+                continue
+
+        deficit = requirement.amount - (have or 0.0) - (pending or 0.0)
+        if deficit <= _EPSILON:
+            covered.append(requirement.name)
+            continue
+        quantity = convert(deficit, requirement.base, requirement.unit)
+        to_buy.append({
+            "item": requirement.name,
+            # Round up so the list never asks for slightly less than needed
+            "quantity": math.ceil(quantity * 100 - _EPSILON) / 100,
+            "unit": requirement.unit,
+        })
+
+    return {
+        "to_buy": to_buy,
+        "covered": covered,
+        "check": check,
+        "lines": lines,
+        "ingredients": len(requirements),
+    }
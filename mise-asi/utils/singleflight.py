@@ -0,0 +1,74 @@
+"""
+Single-flight execution for mise-asi
+Collapses concurrent calls with the same key into one and replays recent results
+
+The first caller for a key runs the function; callers arriving while it
+runs wait for and share its result. Results accepted by `replayable` are
+kept for a short window so late retries get the same answer without
+running again.
+"""
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Callable, Hashable
+
+
+class SingleFlight:
+    """Per-key de-duplication of in-flight work plus a short replay window"""
+
+    def __init__(self, replay_seconds: float = 30, max_replays: int = 1000):
+        self.replay_seconds = replay_seconds
+        self.max_replays = max_replays
+        self._in_flight: dict[Hashable, Future] = {}
+        self._replays: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def do(
+        self,
+        key: Hashable,
+        fn: Callable[[], Any],
+        replayable: Callable[[Any], bool] = lambda result: True,
+        timeout: float | None = None,
+    ) -> tuple[Any, str | None]:
+        """
+        Run fn once per key; returns (result, how) where how is None for the
+        caller that ran it, "joined" for one that waited on it and "replayed"
+        for one served from the replay window
+        Raises TimeoutError if a joined call does not finish within `timeout`
+        """
+        with self._lock:
+            replay = self._replays.get(key)
+            if replay is not None:
+                if replay[0] > time.monotonic():
+                    return replay[1], "replayed"
+                del self._replays[key]
+            future = self._in_flight.get(key)
+            leader = future is None
+            if leader:
+                future = self._in_flight[key] = Future()
+
+        if not leader:
+            return future.result(timeout), "joined"
+
+        try:
+            result = fn()
+        except BaseException as e:
+            future.set_exception(e)
+            with self._lock:
+                del self._in_flight[key]
+            raise
+
+        with self._lock:
+            del self._in_flight[key]
+            if self.replay_seconds > 0 and replayable(result):
+                self._replays[key] = (time.monotonic() + self.replay_seconds, result)
+                self._replays.move_to_end(key)
+                while len(self._replays) > self.max_replays:
+                    self._replays.popitem(last=False)
+        future.set_result(result)
+        return result, None
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._in_flight)
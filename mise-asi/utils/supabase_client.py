@@ -2,23 +2,70 @@
 Supabase client for database access
 Mirrors the connection pattern used in the root application
 """
-from supabase import create_client, Client
+import functools
+import time
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING
+
 from config import settings
+from .metrics import counter, histogram
+from .tracing import span
+from .deadline import check_deadline, DeadlineExceeded
+
+if TYPE_CHECKING:
+    from supabase import Client
+
+
+_client: "Client | None" = None
 
+DB_QUERIES = counter("mise_db_queries_total", "Supabase data function calls by operation and status")
+DB_QUERY_SECONDS = histogram("mise_db_query_seconds", "Supabase data function latency in seconds")
 
-_client: Client | None = None
 
+def instrumented(func):
+    """
+    Record call count, errors, latency and a trace span for a data function
+    Raises DeadlineExceeded instead of querying once the request deadline has passed
+    """
+    operation = func.__name__
 
-def get_supabase_client() -> Client:
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        status = "ok"
+        try:
+            check_deadline(f"db.{operation}")
+            with span(f"db.{operation}") as db_span:
+                result = func(*args, **kwargs)
+                if isinstance(result, list):
+                    db_span.set(rows=len(result))
+                return result
+        except DeadlineExceeded:
+            status = "deadline"
+            raise
+        except Exception:
+            status = "error"
+            raise
+        finally:
+            DB_QUERY_SECONDS.observe(time.perf_counter() - start, operation=operation)
+            DB_QUERIES.inc(operation=operation, status=status)
+
+    return wrapper
+
+
+def get_supabase_client() -> "Client":
     """Get or create Supabase client singleton"""
     global _client
     if _client is None:
         if not settings.SUPABASE_URL or not settings.SUPABASE_KEY:
             raise ValueError("Supabase URL and Key must be configured")
+        # Imported here so the SDK only loads on the first database call
+        from supabase import create_client
         _client = create_client(settings.SUPABASE_URL, settings.SUPABASE_KEY)
     return _client
 
 
+@instrumented
 def get_user_inventory(user_id: str) -> list[dict]:
     """Get inventory items for a user"""
     client = get_supabase_client()
@@ -26,6 +73,7 @@ def get_user_inventory(user_id: str) -> list[dict]:
     return response.data or []
 
 
+@instrumented
 def update_user_inventory(user_id: str, items: list[dict]) -> None:
     """Update or insert inventory items"""
     client = get_supabase_client()
@@ -35,6 +83,7 @@ def update_user_inventory(user_id: str, items: list[dict]) -> None:
         client.table("user_inventory").upsert(item, on_conflict="user_id,item_name").execute()
 
 
+@instrumented
 def get_user_shopping_list(user_id: str) -> list[dict]:
     """Get shopping list items for a user"""
     client = get_supabase_client()
@@ -42,14 +91,16 @@ def get_user_shopping_list(user_id: str) -> list[dict]:
     return response.data or []
 
 
+@instrumented
 def add_shopping_list_items(user_id: str, items: list[dict]) -> None:
-    """Add items to shopping list"""
+    """Add items to shopping list (one bulk insert)"""
+    if not items:
+        return
     client = get_supabase_client()
-    for item in items:
-        item["user_id"] = user_id
-        client.table("shopping_lists").insert(item).execute()
+    client.table("shopping_lists").insert([{**item, "user_id": user_id} for item in items]).execute()
 
 
+@instrumented
 def remove_shopping_list_items(user_id: str, item_names: list[str]) -> None:
     """Remove items from shopping list by name"""
     client = get_supabase_client()
@@ -57,6 +108,7 @@ def remove_shopping_list_items(user_id: str, item_names: list[str]) -> None:
         client.table("shopping_lists").delete().eq("user_id", user_id).eq("item", name).execute()
 
 
+@instrumented
 def get_user_preferences(user_id: str) -> dict | None:
     """Get user preferences"""
     client = get_supabase_client()
@@ -64,6 +116,7 @@ def get_user_preferences(user_id: str) -> dict | None:
     return response.data
 
 
+@instrumented
 def update_user_preferences(user_id: str, updates: dict) -> None:
     """Update user preferences"""
     client = get_supabase_client()
@@ -71,6 +124,7 @@ def update_user_preferences(user_id: str, updates: dict) -> None:
     client.table("user_preferences").upsert(updates, on_conflict="user_id").execute()
 
 
+@instrumented
 def get_user_leftovers(user_id: str) -> list[dict]:
     """Get leftover items for a user"""
     client = get_supabase_client()
@@ -78,6 +132,7 @@ def get_user_leftovers(user_id: str) -> list[dict]:
     return response.data or []
 
 
+@instrumented
 def add_leftover_item(user_id: str, item: dict) -> None:
     """Add a leftover item"""
     client = get_supabase_client()
@@ -85,18 +140,21 @@ def add_leftover_item(user_id: str, item: dict) -> None:
     client.table("user_leftovers").insert(item).execute()
 
 
+@instrumented
 def update_leftover_item(leftover_id: str, updates: dict) -> None:
     """Update a leftover item"""
     client = get_supabase_client()
     client.table("user_leftovers").update(updates).eq("id", leftover_id).execute()
 
 
+@instrumented
 def delete_leftover_item(leftover_id: str) -> None:
     """Delete a leftover item"""
     client = get_supabase_client()
     client.table("user_leftovers").delete().eq("id", leftover_id).execute()
 
 
+@instrumented
 def update_user_notes(user_id: str, notes: str) -> None:
     """Update user notes (overwrites)"""
     client = get_supabase_client()
@@ -104,3 +162,210 @@ def update_user_notes(user_id: str, notes: str) -> None:
         {"user_id": user_id, "notes": notes}, 
         on_conflict="user_id"
     ).execute()
+
+
+@instrumented
+def get_orchestrator_session(conversation_id: str) -> dict | None:
+    """Get a stored conversation session"""
+    client = get_supabase_client()
+    response = (
+        client.table("orchestrator_sessions")
+        .select("conversation_id,user_id,messages,version,updated_at")
+        .eq("conversation_id", conversation_id)
+        .limit(1)
+        .execute()
+    )
+    return response.data[0] if response.data else None
+
+
+@instrumented
+def save_orchestrator_session(session: dict) -> None:
+    """Insert or replace a conversation session"""
+    client = get_supabase_client()
+    client.table("orchestrator_sessions").upsert(session, on_conflict="conversation_id").execute()
+
+
+@instrumented
+def prune_orchestrator_sessions(idle_seconds: float) -> int:
+    """Delete sessions idle for longer than idle_seconds; returns how many were removed"""
+    client = get_supabase_client()
+    cutoff = datetime.fromtimestamp(time.time() - idle_seconds, timezone.utc).isoformat()
+    response = client.table("orchestrator_sessions").delete().lt("updated_at", cutoff).execute()
+    return len(response.data or [])
+
+
+@instrumented
+def get_meal_plan(user_id: str) -> dict | None:
+    """Get a user's precomputed weekly meal plan row"""
+    client = get_supabase_client()
+    response = (
+        client.table("precomputed_meal_plans")
+        .select("plan,summary,source,stale,generated_at,requested_at,updated_at")
+        .eq("user_id", user_id)
+        .limit(1)
+        .execute()
+    )
+    return response.data[0] if response.data else None
+
+
+@instrumented
+def set_meal_plan_slot(user_id: str, day: str, meal_type: str, meal: dict) -> None:
+    """Set one day/meal slot of the weekly plan (creates the plan if needed)"""
+    client = get_supabase_client()
+    client.rpc("set_meal_plan_slot", {
+        "p_user_id": user_id,
+        "p_day": day,
+        "p_meal_type": meal_type,
+        "p_meal": meal,
+    }).execute()
+
+
+@instrumented
+def save_precomputed_meal_plan(user_id: str, plan: dict, summary: str, started_at: str) -> None:
+    """Replace a weekly plan generated by a run that started at `started_at` (ISO timestamp)"""
+    client = get_supabase_client()
+    client.rpc("save_precomputed_meal_plan", {
+        "p_user_id": user_id,
+        "p_plan": plan,
+        "p_summary": summary,
+        "p_started_at": started_at,
+    }).execute()
+
+
+@instrumented
+def touch_meal_plan_request(user_id: str, requested_at: str) -> None:
+    """Record that a user asked for their weekly plan (keeps them in the precompute sweep)"""
+    client = get_supabase_client()
+    client.table("precomputed_meal_plans").upsert(
+        {"user_id": user_id, "requested_at": requested_at},
+        on_conflict="user_id"
+    ).execute()
+
+
+@instrumented
+def get_meal_plan_candidates(active_since: str, generated_before: str, limit: int) -> list[str]:
+    """Users who asked for a plan since `active_since` whose plan is stale, missing or old"""
+    client = get_supabase_client()
+    response = (
+        client.table("precomputed_meal_plans")
+        .select("user_id")
+        .gte("requested_at", active_since)
+        .or_(f"stale.eq.true,generated_at.is.null,generated_at.lt.{generated_before}")
+        .order("requested_at", desc=True)
+        .limit(limit)
+        .execute()
+    )
+    return [row["user_id"] for row in response.data or []]
+
+
+@instrumented
+def get_sync_state(user_id: str) -> dict:
+    """Current change version and pruned-below floor for a user (0/0 before any change)"""
+    client = get_supabase_client()
+    response = (
+        client.table("user_sync_versions")
+        .select("version,floor_version")
+        .eq("user_id", user_id)
+        .limit(1)
+        .execute()
+    )
+    if not response.data:
+        return {"version": 0, "floor_version": 0}
+    return response.data[0]
+
+
+@instrumented
+def get_user_changes(user_id: str, since: int, limit: int) -> list[dict]:
+    """Logged changes after version `since`, oldest first"""
+    client = get_supabase_client()
+    response = (
+        client.table("user_change_log")
+        .select("version,table_name,row_id,op,row_data")
+        .eq("user_id", user_id)
+        .gt("version", since)
+        .order("version")
+        .limit(limit)
+        .execute()
+    )
+    return response.data or []
+
+
+@instrumented
+def get_user_table_rows(table: str, user_id: str) -> list[dict]:
+    """All of a user's rows in one table"""
+    client = get_supabase_client()
+    response = client.table(table).select("*").eq("user_id", user_id).execute()
+    return response.data or []
+
+
+@instrumented
+def prune_user_change_log(keep_days: float) -> int:
+    """Drop sync log entries older than keep_days; returns how many were removed"""
+    client = get_supabase_client()
+    response = client.rpc("prune_user_change_log", {"p_keep": f"{keep_days} days"}).execute()
+    return response.data or 0
+
+
+@instrumented
+def refresh_use_soon_items(within_days: int, leftover_shelf_days: int, expired_days: int) -> int:
+    """Rebuild every user's use-soon list in one pass; returns how many items it holds"""
+    client = get_supabase_client()
+    response = client.rpc("refresh_use_soon_items", {
+        "p_within_days": within_days,
+        "p_leftover_shelf_days": leftover_shelf_days,
+        "p_expired_days": expired_days,
+    }).execute()
+    return response.data or 0
+
+
+@instrumented
+def get_use_soon_items(user_id: str, limit: int | None = None) -> list[dict]:
+    """A user's materialized use-soon items, soonest first"""
+    client = get_supabase_client()
+    query = (
+        client.table("use_soon_items")
+        .select("use_by,source,name,quantity,unit,refreshed_at")
+        .eq("user_id", user_id)
+        .order("use_by")
+    )
+    if limit:
+        query = query.limit(limit)
+    return query.execute().data or []
+
+
+@instrumented
+def consume_inventory_items(user_id: str, items: list[dict], leftover: dict | None = None) -> dict:
+    """
+    Subtract amounts from inventory rows and optionally add a leftover, in one transaction
+    items are {"id", "amount"} in each row's own unit; rows reaching zero are deleted.
+    Returns {"updated": [{id, item_name, quantity, unit}], "deleted": [{id, item_name}], "leftover_id"}
+    """
+    client = get_supabase_client()
+    response = client.rpc("consume_inventory_items", {
+        "p_user_id": user_id,
+        "p_items": items,
+        "p_leftover": leftover,
+    }).execute()
+    return response.data or {"updated": [], "deleted": [], "leftover_id": None}
+
+
+@instrumented
+def mark_shopping_items_purchased(
+    user_id: str,
+    increments: list[dict],
+    new_items: list[dict],
+    list_ids: list[str],
+) -> dict:
+    """
+    Move bought shopping-list rows into the inventory in one transaction
+    increments are {"id", "amount"} added to existing inventory rows (in their unit);
+    new_items are inventory rows to insert. Returns {"merged", "added", "removed"}
+    """
+    client = get_supabase_client()
+    response = client.rpc("mark_shopping_items_purchased", {
+        "p_user_id": user_id,
+        "p_increments": increments,
+        "p_new_items": new_items,
+        "p_list_ids": list_ids,
+    }).execute()
+    return response.data or {"merged": [], "added": [], "removed": 0}
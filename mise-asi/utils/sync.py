@@ -0,0 +1,76 @@
+"""
+Delta sync for mise-asi
+Changed and deleted pantry rows since a client's last known version
+
+Database triggers give every user a version that increases by one on each
+insert, update or delete in the synced tables and log the changed row
+(see user_change_log). A client keeps the version from its last response
+and sends it back as `since`:
+1. since == current version - nothing to send
+2. since inside the retained log - the changes after it, newest row state only
+3. since == 0, below the pruned floor or ahead of the server - a full
+   snapshot with reset=true, which replaces the client's copy
+"""
+from .supabase_client import get_sync_state, get_user_changes, get_user_table_rows
+
+SYNC_TABLES = ("user_inventory", "shopping_lists", "user_leftovers", "user_preferences")
+
+
+def build_delta(user_id: str, since: int, limit: int, state: dict | None = None) -> dict:
+    """
+    Sync response for a client at version `since`
+    At most `limit` log entries are read; has_more=true means call again
+    with the returned version. `state` may be passed when already fetched.
+    """
+    state = state or get_sync_state(user_id)
+    current = state["version"]
+
+    if since == current:
+        return {"version": current, "reset": False, "has_more": False, "changes": {}}
+
+    if since <= 0 or since < state["floor_version"] or since > current:
+        return _snapshot(user_id, current)
+
+    entries = get_user_changes(user_id, since, limit + 1)
+    has_more = len(entries) > limit
+    entries = entries[:limit]
+
+    # Replay in version order so only each row's final state is sent
+    upserted: dict[str, dict[str, dict]] = {}
+    deleted: dict[str, set[str]] = {}
+    for entry in entries:
+        table, row_id = entry["table_name"], entry["row_id"]
+        if entry["op"] == "delete":
+            upserted.get(table, {}).pop(row_id, None)
+            deleted.setdefault(table, set()).add(row_id)
+        else:
+            deleted.get(table, set()).discard(row_id)
+            upserted.setdefault(table, {})[row_id] = entry["row_data"]
+
+    changes = {}
+    for table in SYNC_TABLES:
+        rows = list(upserted.get(table, {}).values())
+        gone = sorted(deleted.get(table, ()))
+        if rows or gone:
+            changes[table] = {"upserted": rows, "deleted": gone}
+
+    return {
+        "version": entries[-1]["version"] if entries else current,
+        "reset": False,
+        "has_more": has_more,
+        "changes": changes,
+    }
+
+
+def _snapshot(user_id: str, version: int) -> dict:
+    # The version is read before the rows, so a change landing in between is
+    # sent again on the next sync rather than lost
+    return {
+        "version": version,
+        "reset": True,
+        "has_more": False,
+        "changes": {
+            table: {"upserted": get_user_table_rows(table, user_id), "deleted": []}
+            for table in SYNC_TABLES
+        },
+    }
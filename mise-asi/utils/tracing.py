@@ -0,0 +1,262 @@
+"""
+Structured tracing for mise-asi
+Span trees per orchestration: request -> LLM iterations -> tool calls -> DB queries
+
+Spans are only recorded inside an active trace (started with start_trace),
+so instrumented code called outside a chat request costs almost nothing.
+Finished traces are handed to the configured exporter:
+    TRACE_EXPORTER=jsonl  -> one JSON line per trace in TRACE_FILE
+    TRACE_EXPORTER=otlp   -> OTLP/HTTP JSON POST to TRACE_OTLP_ENDPOINT
+"""
+import os
+import queue
+import secrets
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Iterator
+
+from config import settings
+from . import jsoncodec
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+_current_span: ContextVar["Span | None"] = ContextVar("mise_current_span", default=None)
+
+
+class Span:
+    """A timed unit of work with attributes, events and child spans"""
+
+    __slots__ = (
+        "name", "trace_id", "span_id", "parent_id", "start_time", "end_time",
+        "_start_perf", "duration_ms", "attributes", "events", "status", "error", "children",
+    )
+
+    def __init__(self, name: str, trace_id: str, parent_id: str | None = None, **attributes):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent_id
+        self.start_time = time.time()
+        self.end_time: float | None = None
+        self._start_perf = time.perf_counter()
+        self.duration_ms: float | None = None
+        self.attributes: dict[str, Any] = dict(attributes)
+        self.events: list[dict] = []
+        self.status = "ok"
+        self.error: str | None = None
+        self.children: list[Span] = []
+
+    def set(self, **attributes):
+        """Set attributes on the span"""
+        self.attributes.update(attributes)
+
+    def add_event(self, name: str, **attributes):
+        """Record a timestamped event on the span"""
+        self.events.append({"name": name, "timestamp": time.time(), **attributes})
+
+    def set_error(self, error: Exception | str):
+        self.status = "error"
+        self.error = str(error)
+
+    def finish(self):
+        if self.end_time is None:
+            self.duration_ms = round((time.perf_counter() - self._start_perf) * 1000, 3)
+            self.end_time = self.start_time + self.duration_ms / 1000
+
+    def to_dict(self) -> dict:
+        """Nested span tree"""
+        return {
+            "name": self.name,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start_time": self.start_time,
+            "duration_ms": self.duration_ms,
+            "status": self.status,
+            "error": self.error,
+            "attributes": self.attributes,
+            "events": self.events,
+            "children": [child.to_dict() for child in self.children],
+        }
+
+    def walk(self) -> Iterator["Span"]:
+        yield self
+        for child in self.children:
+            yield from child.walk()
+
+
+class _NoopSpan:
+    """Stand-in yielded when there is no active trace"""
+
+    def set(self, **attributes):
+        pass
+
+    def add_event(self, name: str, **attributes):
+        pass
+
+    def set_error(self, error: Exception | str):
+        pass
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+def current_span() -> Span | None:
+    """The innermost active span, if any"""
+    return _current_span.get()
+
+
+@contextmanager
+def start_trace(name: str, **attributes) -> Iterator[Span]:
+    """Open a root span; the finished trace is exported when the block exits"""
+    root = Span(name, trace_id=secrets.token_hex(16), **attributes)
+    token = _current_span.set(root)
+    try:
+        yield root
+    except Exception as e:
+        root.set_error(e)
+        raise
+    finally:
+        root.finish()
+        _current_span.reset(token)
+        export_trace(root)
+
+
+@contextmanager
+def span(name: str, **attributes) -> Iterator[Span | _NoopSpan]:
+    """Open a child span of the current span; no-op outside a trace"""
+    parent = _current_span.get()
+    if parent is None:
+        yield NOOP_SPAN
+        return
+
+    child = Span(name, trace_id=parent.trace_id, parent_id=parent.span_id, **attributes)
+    parent.children.append(child)
+    token = _current_span.set(child)
+    try:
+        yield child
+    except Exception as e:
+        child.set_error(e)
+        raise
+    finally:
+        child.finish()
+        _current_span.reset(token)
+
+
+# Exporters
+
+class JsonlExporter:
+    """Append each finished trace as one JSON line"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def export(self, root: Span):
+        line = jsoncodec.dumps_str({"trace_id": root.trace_id, "root": root.to_dict()})
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+
+
+class OtlpHttpExporter:
+    """
+    POST traces as OTLP/HTTP JSON from a background thread
+    Works with an OpenTelemetry collector or any stand-in accepting /v1/traces
+    """
+
+    def __init__(self, endpoint: str, service_name: str = "mise-asi", max_queue: int = 1000):
+        self.endpoint = endpoint
+        self.service_name = service_name
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue)
+        self._thread = threading.Thread(target=self._run, name="mise-otlp-export", daemon=True)
+        self._thread.start()
+
+    def export(self, root: Span):
+        try:
+            self._queue.put_nowait(root)
+        except queue.Full:
+            logger.warning("Trace export queue full, dropping trace")
+
+    def _run(self):
+        import requests
+
+        while True:
+            root = self._queue.get()
+            try:
+                requests.post(self.endpoint, json=self._payload(root), timeout=5)
+            except Exception as e:
+                logger.warning(f"Trace export failed: {e}")
+
+    def _payload(self, root: Span) -> dict:
+        spans = []
+        for s in root.walk():
+            spans.append({
+                "traceId": s.trace_id,
+                "spanId": s.span_id,
+                "parentSpanId": s.parent_id or "",
+                "name": s.name,
+                "startTimeUnixNano": str(int(s.start_time * 1e9)),
+                "endTimeUnixNano": str(int((s.end_time or s.start_time) * 1e9)),
+                "attributes": [_otlp_attribute(k, v) for k, v in s.attributes.items()],
+                "events": [
+                    {
+                        "name": e["name"],
+                        "timeUnixNano": str(int(e["timestamp"] * 1e9)),
+                        "attributes": [
+                            _otlp_attribute(k, v) for k, v in e.items() if k not in ("name", "timestamp")
+                        ],
+                    }
+                    for e in s.events
+                ],
+                "status": {"code": 2, "message": s.error or ""} if s.status == "error" else {"code": 1},
+            })
+        return {
+            "resourceSpans": [{
+                "resource": {"attributes": [_otlp_attribute("service.name", self.service_name)]},
+                "scopeSpans": [{"scope": {"name": "mise-asi"}, "spans": spans}],
+            }]
+        }
+
+
+def _otlp_attribute(key: str, value: Any) -> dict:
+    if isinstance(value, bool):
+        return {"key": key, "value": {"boolValue": value}}
+    if isinstance(value, int):
+        return {"key": key, "value": {"intValue": str(value)}}
+    if isinstance(value, float):
+        return {"key": key, "value": {"doubleValue": value}}
+    return {"key": key, "value": {"stringValue": str(value)}}
+
+
+_exporter: JsonlExporter | OtlpHttpExporter | None = None
+_exporter_configured = False
+
+
+def get_exporter() -> JsonlExporter | OtlpHttpExporter | None:
+    """Get the configured exporter singleton (None when tracing export is off)"""
+    global _exporter, _exporter_configured
+    if not _exporter_configured:
+        _exporter_configured = True
+        kind = settings.TRACE_EXPORTER
+        if kind == "jsonl":
+            _exporter = JsonlExporter(settings.TRACE_FILE)
+        elif kind == "otlp":
+            _exporter = OtlpHttpExporter(settings.TRACE_OTLP_ENDPOINT)
+    return _exporter
+
+
+def export_trace(root: Span):
+    """Send a finished trace to the configured exporter"""
+    exporter = get_exporter()
+    if exporter is None:
+        return
+    try:
+        exporter.export(root)
+    except Exception as e:
+        logger.warning(f"Trace export failed: {e}")
@@ -0,0 +1,164 @@
+"""
+Units and ingredient names for mise-asi
+Normalizes cooking units so quantities in different units can be compared
+
+Mass converts through grams, volume through millilitres and counts through
+"piece". Any other unit (can, clove, bunch...) is its own dimension and
+only matches itself. There is no density table, so mass and volume never
+convert into each other.
+"""
+import re
+
+# unit -> (base unit, factor to base)
+_UNITS: dict[str, tuple[str, float]] = {
+    # Mass
+    "g": ("g", 1.0),
+    "mg": ("g", 0.001),
+    "kg": ("g", 1000.0),
+    "oz": ("g", 28.349523125),
+    "lb": ("g", 453.59237),
+    # Volume
+    "ml": ("ml", 1.0),
+    "cl": ("ml", 10.0),
+    "dl": ("ml", 100.0),
+    "l": ("ml", 1000.0),
+    "tsp": ("ml", 4.92892159375),
+    "tbsp": ("ml", 14.78676478125),
+    "fl oz": ("ml", 29.5735295625),
+    "cup": ("ml", 236.5882365),
+    "pint": ("ml", 473.176473),
+    "quart": ("ml", 946.352946),
+    "gallon": ("ml", 3785.411784),
+    # Count
+    "piece": ("piece", 1.0),
+    "dozen": ("piece", 12.0),
+}
+
+_ALIASES = {
+    "gram": "g", "grams": "g", "gr": "g",
+    "milligram": "mg", "milligrams": "mg",
+    "kilogram": "kg", "kilograms": "kg", "kgs": "kg", "kilo": "kg", "kilos": "kg",
+    "ounce": "oz", "ounces": "oz",
+    "pound": "lb", "pounds": "lb", "lbs": "lb",
+    "milliliter": "ml", "milliliters": "ml", "millilitre": "ml", "millilitres": "ml",
+    "liter": "l", "liters": "l", "litre": "l", "litres": "l", "ltr": "l",
+    "teaspoon": "tsp", "teaspoons": "tsp", "tsps": "tsp",
+    "tablespoon": "tbsp", "tablespoons": "tbsp", "tbsps": "tbsp", "tbs": "tbsp",
+    "fluid ounce": "fl oz", "fluid ounces": "fl oz", "floz": "fl oz",
+    "cups": "cup", "c": "cup",
+    "pints": "pint", "pt": "pint",
+    "quarts": "quart", "qt": "quart",
+    "gallons": "gallon", "gal": "gallon",
+    "": "piece", "pieces": "piece", "pc": "piece", "pcs": "piece", "each": "piece", "ea": "piece",
+    "item": "piece", "items": "piece", "unit": "piece", "units": "piece", "whole": "piece", "x": "piece",
+    "dozens": "dozen",
+}
+
+_WORD = re.compile(r"[a-z0-9]+")
+
+
+def normalize_unit(unit: str | None) -> str:
+    """Canonical unit name: 'Tablespoons' -> 'tbsp', None/'' -> 'piece', 'Cans' -> 'can'"""
+    name = " ".join((unit or "").lower().replace(".", " ").split())
+    name = _ALIASES.get(name, name)
+    if name in _UNITS:
+        return name
+    # Unknown units still compare equal across singular/plural
+    return _singular(name)
+
+
+def to_base(quantity: float, unit: str | None) -> tuple[float, str]:
+    """(quantity in the base unit, base unit), e.g. (2, 'kg') -> (2000.0, 'g')"""
+    name = normalize_unit(unit)
+    base, factor = _UNITS.get(name, (name, 1.0))
+    return quantity * factor, base
+
+
+def convert(quantity: float, from_unit: str | None, to_unit: str | None) -> float | None:
+    """quantity expressed in to_unit, or None when the units are not comparable"""
+    amount, base = to_base(quantity, from_unit)
+    per_unit, to_base_unit = to_base(1.0, to_unit)
+    if base != to_base_unit:
+        return None
+    return amount / per_unit
+
+
+def parse_quantity(value) -> float | None:
+    """Number from a tool argument or row value ('2', 2, None -> None)"""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def format_quantity(quantity: float) -> str:
+    """2.0 -> '2', 0.3333 -> '0.33'"""
+    return f"{round(quantity, 2):g}"
+
+
+def _singular(word: str) -> str:
+    if word.endswith("ies") and len(word) > 4:
+        return word[:-3] + "y"
+    if word.endswith(("ches", "shes", "oes", "sses", "xes")):
+        return word[:-2]
+    if word.endswith("s") and not word.endswith("ss") and len(word) > 3:
+        return word[:-1]
+    return word
+
+
+def ingredient_key(name: str | None) -> str:
+    """Key for matching ingredient names: lower case, singular words ('Fresh Tomatoes' -> 'fresh tomato')"""
+    return " ".join(_singular(word) for word in _WORD.findall((name or "").lower()))
+
+
+def match_ingredient(name: str, keys: dict[str, object]):
+    """
+    The value in `keys` (ingredient_key -> value) that `name` refers to, or None
+    An exact key wins; otherwise a single key whose words contain the name's
+    words, or the other way round ('chicken' -> 'chicken breast')
+    """
+    key = ingredient_key(name)
+    if not key:
+        return None
+    if key in keys:
+        return keys[key]
+    padded = f" {key} "
+    candidates = [
+        value for other, value in keys.items()
+        if padded in f" {other} " or f" {other} " in padded
+    ]
+    return candidates[0] if len(candidates) == 1 else None
+
+
+class IngredientIndex:
+    """
+    match_ingredient over a fixed dict, without scanning every key
+    Shorter names inside the looked-up name are found by trying its word
+    runs as keys; longer names containing it come from the keys sharing
+    its rarest word
+    """
+
+    def __init__(self, keys: dict[str, object]):
+        self.keys = keys
+        self._by_word: dict[str, list[str]] = {}
+        for key in keys:
+            for word in set(key.split()):
+                self._by_word.setdefault(word, []).append(key)
+
+    def match(self, name: str):
+        """Same result as match_ingredient(name, keys)"""
+        key = ingredient_key(name)
+        if not key:
+            return None
+        keys = self.keys
+        if key in keys:
+            return keys[key]
+        words = key.split()
+        found = {
+            run for i in range(len(words)) for j in range(i + 1, len(words) + 1)
+            if (run := " ".join(words[i:j])) in keys
+        }
+        rarest = min(words, key=lambda word: len(self._by_word.get(word, ())))
+        padded = f" {key} "
+        found.update(other for other in self._by_word.get(rarest, ()) if padded in f" {other} ")
+        return keys[found.pop()] if len(found) == 1 else None
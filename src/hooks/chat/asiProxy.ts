@@ -22,6 +22,13 @@ export interface ASIResponse {
         name: string;
         args: Record<string, unknown>;
         result: string;
+        // Rows from the tool's own fetch (inventory, shopping list, leftovers, preferences)
+        data?: {
+            table: string;
+            rows: Record<string, unknown>[];
+            count: number;
+            version: number | null;
+        };
     }>;
     thought_steps: string[];
     error?: string;
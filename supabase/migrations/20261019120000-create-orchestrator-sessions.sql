@@ -0,0 +1,41 @@
+-- Server-side conversation sessions for the mise-asi orchestrator
+-- (separate from chat_sessions, the frontend's per-user chat history)
+CREATE TABLE public.orchestrator_sessions (
+  conversation_id TEXT NOT NULL PRIMARY KEY,
+  user_id UUID REFERENCES auth.users ON DELETE CASCADE NOT NULL,
+  messages JSONB NOT NULL DEFAULT '[]'::jsonb,
+  version INTEGER NOT NULL DEFAULT 0,
+  created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now(),
+  updated_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now()
+);
+
+-- Add Row Level Security (the orchestrator uses the service key)
+ALTER TABLE public.orchestrator_sessions ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "Users can view their own orchestrator sessions"
+  ON public.orchestrator_sessions
+  FOR SELECT
+  USING (auth.uid() = user_id);
+
+CREATE POLICY "Users can delete their own orchestrator sessions"
+  ON public.orchestrator_sessions
+  FOR DELETE
+  USING (auth.uid() = user_id);
+
+-- Keep updated_at current on every save
+CREATE OR REPLACE FUNCTION public.touch_orchestrator_session()
+RETURNS TRIGGER AS $$
+BEGIN
+  NEW.updated_at = now();
+  RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER touch_orchestrator_sessions_updated_at
+  BEFORE UPDATE ON public.orchestrator_sessions
+  FOR EACH ROW
+  EXECUTE FUNCTION public.touch_orchestrator_session();
+
+-- Indexes for per-user listing and expiry cleanup
+CREATE INDEX idx_orchestrator_sessions_user_id ON public.orchestrator_sessions(user_id);
+CREATE INDEX idx_orchestrator_sessions_updated_at ON public.orchestrator_sessions(updated_at);
@@ -0,0 +1,108 @@
+-- Weekly meal plans precomputed by the mise-asi orchestrator
+-- (separate from the frontend's meal_plans table)
+CREATE TABLE public.precomputed_meal_plans (
+  user_id UUID NOT NULL PRIMARY KEY REFERENCES auth.users ON DELETE CASCADE,
+  plan JSONB NOT NULL DEFAULT '{}'::jsonb,
+  summary TEXT,
+  source TEXT NOT NULL DEFAULT 'chat',
+  stale BOOLEAN NOT NULL DEFAULT false,
+  stale_since TIMESTAMP WITH TIME ZONE,
+  generated_at TIMESTAMP WITH TIME ZONE,
+  requested_at TIMESTAMP WITH TIME ZONE,
+  created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now(),
+  updated_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now()
+);
+
+-- Add Row Level Security (the orchestrator uses the service key)
+ALTER TABLE public.precomputed_meal_plans ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "Users can view their own precomputed meal plans"
+  ON public.precomputed_meal_plans
+  FOR SELECT
+  USING (auth.uid() = user_id);
+
+-- Set one day/meal slot in a single round trip (used by updateMealPlan)
+CREATE OR REPLACE FUNCTION public.set_meal_plan_slot(
+  p_user_id UUID,
+  p_day TEXT,
+  p_meal_type TEXT,
+  p_meal JSONB
+)
+RETURNS void AS $$
+BEGIN
+  INSERT INTO public.precomputed_meal_plans (user_id, plan)
+  VALUES (p_user_id, jsonb_build_object(p_day, jsonb_build_object(p_meal_type, p_meal)))
+  ON CONFLICT (user_id) DO UPDATE
+  SET plan = precomputed_meal_plans.plan || jsonb_build_object(
+        p_day,
+        COALESCE(precomputed_meal_plans.plan -> p_day, '{}'::jsonb) || jsonb_build_object(p_meal_type, p_meal)
+      ),
+      updated_at = now();
+END;
+$$ LANGUAGE plpgsql;
+
+-- Replace a whole plan from a background run started at p_started_at.
+-- If inventory, leftovers or preferences changed while it ran, the plan is
+-- saved but stays stale so the next sweep recomputes it.
+CREATE OR REPLACE FUNCTION public.save_precomputed_meal_plan(
+  p_user_id UUID,
+  p_plan JSONB,
+  p_summary TEXT,
+  p_started_at TIMESTAMP WITH TIME ZONE
+)
+RETURNS void AS $$
+BEGIN
+  INSERT INTO public.precomputed_meal_plans (user_id, plan, summary, source, generated_at)
+  VALUES (p_user_id, p_plan, p_summary, 'precomputed', now())
+  ON CONFLICT (user_id) DO UPDATE
+  SET plan = EXCLUDED.plan,
+      summary = EXCLUDED.summary,
+      source = EXCLUDED.source,
+      generated_at = EXCLUDED.generated_at,
+      stale = precomputed_meal_plans.stale_since IS NOT NULL
+              AND precomputed_meal_plans.stale_since > p_started_at,
+      updated_at = now();
+END;
+$$ LANGUAGE plpgsql;
+
+-- Mark a user's plan stale whenever the data it was planned from changes.
+-- SECURITY DEFINER so edits made by the frontend (under RLS) still reach the plan row.
+CREATE OR REPLACE FUNCTION public.mark_meal_plan_stale()
+RETURNS TRIGGER
+SECURITY DEFINER
+SET search_path = public
+AS $$
+DECLARE
+  changed_user UUID;
+BEGIN
+  IF TG_OP = 'DELETE' THEN
+    changed_user := OLD.user_id;
+  ELSE
+    changed_user := NEW.user_id;
+  END IF;
+
+  UPDATE public.precomputed_meal_plans
+  SET stale = true, stale_since = now()
+  WHERE user_id = changed_user;
+
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER mark_meal_plan_stale_on_inventory
+  AFTER INSERT OR UPDATE OR DELETE ON public.user_inventory
+  FOR EACH ROW
+  EXECUTE FUNCTION public.mark_meal_plan_stale();
+
+CREATE TRIGGER mark_meal_plan_stale_on_leftovers
+  AFTER INSERT OR UPDATE OR DELETE ON public.user_leftovers
+  FOR EACH ROW
+  EXECUTE FUNCTION public.mark_meal_plan_stale();
+
+CREATE TRIGGER mark_meal_plan_stale_on_preferences
+  AFTER INSERT OR UPDATE OR DELETE ON public.user_preferences
+  FOR EACH ROW
+  EXECUTE FUNCTION public.mark_meal_plan_stale();
+
+-- Index for the background sweep (recently requested plans that need work)
+CREATE INDEX idx_precomputed_meal_plans_requested_at ON public.precomputed_meal_plans(requested_at);
@@ -0,0 +1,136 @@
+-- Per-user change versions for delta sync of pantry data.
+-- Every insert/update/delete on the synced tables bumps the user's version
+-- and logs the row, so clients can ask for "everything after version N".
+CREATE TABLE public.user_sync_versions (
+  user_id UUID NOT NULL PRIMARY KEY REFERENCES auth.users ON DELETE CASCADE,
+  version BIGINT NOT NULL DEFAULT 0,
+  -- Changes at or below floor_version have been pruned from the log
+  floor_version BIGINT NOT NULL DEFAULT 0,
+  updated_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now()
+);
+
+CREATE TABLE public.user_change_log (
+  user_id UUID NOT NULL REFERENCES auth.users ON DELETE CASCADE,
+  version BIGINT NOT NULL,
+  table_name TEXT NOT NULL,
+  row_id TEXT NOT NULL,
+  op TEXT NOT NULL CHECK (op IN ('upsert', 'delete')),
+  row_data JSONB,
+  changed_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now(),
+  PRIMARY KEY (user_id, version)
+);
+
+-- Add Row Level Security (the orchestrator uses the service key)
+ALTER TABLE public.user_sync_versions ENABLE ROW LEVEL SECURITY;
+ALTER TABLE public.user_change_log ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "Users can view their own sync version"
+  ON public.user_sync_versions
+  FOR SELECT
+  USING (auth.uid() = user_id);
+
+CREATE POLICY "Users can view their own changes"
+  ON public.user_change_log
+  FOR SELECT
+  USING (auth.uid() = user_id);
+
+-- Bump the user's version and log the changed row.
+-- The version row lock serialises concurrent changes for one user, so
+-- versions are gap-free and increase in commit order per user.
+-- SECURITY DEFINER so edits made by the frontend (under RLS) are logged too.
+CREATE OR REPLACE FUNCTION public.record_user_change()
+RETURNS TRIGGER
+SECURITY DEFINER
+SET search_path = public
+AS $$
+DECLARE
+  changed_user UUID;
+  changed_id TEXT;
+  next_version BIGINT;
+BEGIN
+  IF TG_OP = 'DELETE' THEN
+    changed_user := OLD.user_id;
+    changed_id := OLD.id::text;
+  ELSE
+    changed_user := NEW.user_id;
+    changed_id := NEW.id::text;
+  END IF;
+
+  INSERT INTO public.user_sync_versions AS v (user_id, version)
+  VALUES (changed_user, 1)
+  ON CONFLICT (user_id) DO UPDATE
+  SET version = v.version + 1, updated_at = now()
+  RETURNING v.version INTO next_version;
+
+  INSERT INTO public.user_change_log (user_id, version, table_name, row_id, op, row_data)
+  VALUES (
+    changed_user,
+    next_version,
+    TG_TABLE_NAME,
+    changed_id,
+    CASE WHEN TG_OP = 'DELETE' THEN 'delete' ELSE 'upsert' END,
+    CASE WHEN TG_OP = 'DELETE' THEN NULL ELSE to_jsonb(NEW) END
+  );
+
+  -- A row moved to another user (should not happen) is a delete for the old owner
+  IF TG_OP = 'UPDATE' AND OLD.user_id IS DISTINCT FROM NEW.user_id THEN
+    INSERT INTO public.user_sync_versions AS v (user_id, version)
+    VALUES (OLD.user_id, 1)
+    ON CONFLICT (user_id) DO UPDATE
+    SET version = v.version + 1, updated_at = now()
+    RETURNING v.version INTO next_version;
+
+    INSERT INTO public.user_change_log (user_id, version, table_name, row_id, op, row_data)
+    VALUES (OLD.user_id, next_version, TG_TABLE_NAME, OLD.id::text, 'delete', NULL);
+  END IF;
+
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER record_user_change_on_inventory
+  AFTER INSERT OR UPDATE OR DELETE ON public.user_inventory
+  FOR EACH ROW
+  EXECUTE FUNCTION public.record_user_change();
+
+CREATE TRIGGER record_user_change_on_shopping_lists
+  AFTER INSERT OR UPDATE OR DELETE ON public.shopping_lists
+  FOR EACH ROW
+  EXECUTE FUNCTION public.record_user_change();
+
+CREATE TRIGGER record_user_change_on_leftovers
+  AFTER INSERT OR UPDATE OR DELETE ON public.user_leftovers
+  FOR EACH ROW
+  EXECUTE FUNCTION public.record_user_change();
+
+CREATE TRIGGER record_user_change_on_preferences
+  AFTER INSERT OR UPDATE OR DELETE ON public.user_preferences
+  FOR EACH ROW
+  EXECUTE FUNCTION public.record_user_change();
+
+-- Drop log entries older than p_keep and raise each affected user's floor;
+-- clients syncing from below the floor get a full snapshot instead.
+CREATE OR REPLACE FUNCTION public.prune_user_change_log(p_keep INTERVAL DEFAULT interval '30 days')
+RETURNS BIGINT AS $$
+DECLARE
+  pruned BIGINT;
+BEGIN
+  WITH removed AS (
+    DELETE FROM public.user_change_log
+    WHERE changed_at < now() - p_keep
+    RETURNING user_id, version
+  ), floors AS (
+    SELECT user_id, max(version) AS floor_version, count(*) AS n
+    FROM removed
+    GROUP BY user_id
+  ), raised AS (
+    UPDATE public.user_sync_versions v
+    SET floor_version = GREATEST(v.floor_version, floors.floor_version)
+    FROM floors
+    WHERE v.user_id = floors.user_id
+    RETURNING floors.n
+  )
+  SELECT COALESCE(sum(n), 0) INTO pruned FROM raised;
+  RETURN pruned;
+END;
+$$ LANGUAGE plpgsql;
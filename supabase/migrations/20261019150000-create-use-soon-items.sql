@@ -0,0 +1,66 @@
+-- Per-user "use soon" lists: inventory items near their expiry date and
+-- leftovers near the end of their shelf life, across all users.
+-- Rebuilt by refresh_use_soon_items() on a schedule; the orchestrator and
+-- the getUseSoonItems tool only read it.
+
+-- Range scans for the refresh (only rows with a date in the window are read)
+CREATE INDEX IF NOT EXISTS idx_user_inventory_expiry_date
+  ON public.user_inventory(expiry_date)
+  WHERE expiry_date IS NOT NULL;
+
+CREATE INDEX IF NOT EXISTS idx_user_leftovers_date_created
+  ON public.user_leftovers(date_created);
+
+-- No foreign key to auth.users: every row is rewritten on each refresh and
+-- per-row FK checks would dominate the bulk insert
+CREATE TABLE public.use_soon_items (
+  user_id UUID NOT NULL,
+  use_by DATE NOT NULL,
+  source TEXT NOT NULL CHECK (source IN ('inventory', 'leftover')),
+  source_id UUID NOT NULL,
+  name TEXT NOT NULL,
+  quantity NUMERIC,
+  unit TEXT,
+  refreshed_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now(),
+  -- Leading (user_id, use_by) serves the per-user, soonest-first read
+  PRIMARY KEY (user_id, use_by, source, source_id)
+);
+
+-- Add Row Level Security (the orchestrator uses the service key)
+ALTER TABLE public.use_soon_items ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "Users can view their own use soon items"
+  ON public.use_soon_items
+  FOR SELECT
+  USING (auth.uid() = user_id);
+
+-- Rebuild every user's list in one set-based pass.
+-- Inventory: expiry_date from p_expired_days ago up to p_within_days ahead.
+-- Leftovers: use_by = date_created + p_leftover_shelf_days, same window.
+-- Runs in one transaction, so readers keep seeing the previous list until it commits.
+CREATE OR REPLACE FUNCTION public.refresh_use_soon_items(
+  p_within_days INTEGER DEFAULT 3,
+  p_leftover_shelf_days INTEGER DEFAULT 4,
+  p_expired_days INTEGER DEFAULT 7
+)
+RETURNS BIGINT AS $$
+DECLARE
+  window_start DATE := CURRENT_DATE - p_expired_days;
+  window_end DATE := CURRENT_DATE + p_within_days;
+  refreshed BIGINT;
+BEGIN
+  DELETE FROM public.use_soon_items;
+
+  INSERT INTO public.use_soon_items (user_id, use_by, source, source_id, name, quantity, unit)
+  SELECT user_id, expiry_date, 'inventory', id, item_name, quantity, unit
+  FROM public.user_inventory
+  WHERE expiry_date BETWEEN window_start AND window_end
+  UNION ALL
+  SELECT user_id, date_created + p_leftover_shelf_days, 'leftover', id, meal_name, servings, 'servings'
+  FROM public.user_leftovers
+  WHERE date_created BETWEEN window_start - p_leftover_shelf_days AND window_end - p_leftover_shelf_days;
+
+  GET DIAGNOSTICS refreshed = ROW_COUNT;
+  RETURN refreshed;
+END;
+$$ LANGUAGE plpgsql;
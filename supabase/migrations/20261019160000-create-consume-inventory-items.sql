@@ -0,0 +1,60 @@
+-- Apply the ingredients used by a cooked meal in one transaction (consumeMealIngredients).
+-- p_items is [{"id": inventory row id, "amount": quantity to subtract in that row's unit}].
+-- Rows that would drop to zero or below are deleted, the rest are decremented;
+-- the subtraction happens here so concurrent edits are not overwritten.
+-- p_leftover ({"meal_name", "servings", "notes"}) optionally saves the leftover.
+CREATE OR REPLACE FUNCTION public.consume_inventory_items(
+  p_user_id UUID,
+  p_items JSONB,
+  p_leftover JSONB DEFAULT NULL
+)
+RETURNS JSONB AS $$
+DECLARE
+  updated_rows JSONB;
+  deleted_rows JSONB;
+  leftover_id UUID;
+BEGIN
+  WITH used AS (
+    SELECT (x ->> 'id')::uuid AS id, sum((x ->> 'amount')::numeric) AS amount
+    FROM jsonb_array_elements(COALESCE(p_items, '[]'::jsonb)) AS x
+    GROUP BY 1
+  ), updated AS (
+    UPDATE public.user_inventory i
+    SET quantity = i.quantity - used.amount,
+        updated_at = now()
+    FROM used
+    WHERE i.id = used.id
+      AND i.user_id = p_user_id
+      AND i.quantity - used.amount > 0
+    RETURNING i.id, i.item_name, i.quantity, i.unit
+  ), deleted AS (
+    DELETE FROM public.user_inventory i
+    USING used
+    WHERE i.id = used.id
+      AND i.user_id = p_user_id
+      AND i.quantity - used.amount <= 0
+    RETURNING i.id, i.item_name
+  )
+  SELECT
+    (SELECT COALESCE(jsonb_agg(to_jsonb(updated)), '[]'::jsonb) FROM updated),
+    (SELECT COALESCE(jsonb_agg(to_jsonb(deleted)), '[]'::jsonb) FROM deleted)
+  INTO updated_rows, deleted_rows;
+
+  IF p_leftover IS NOT NULL THEN
+    INSERT INTO public.user_leftovers (user_id, meal_name, servings, notes)
+    VALUES (
+      p_user_id,
+      p_leftover ->> 'meal_name',
+      COALESCE((p_leftover ->> 'servings')::numeric, 1),
+      p_leftover ->> 'notes'
+    )
+    RETURNING id INTO leftover_id;
+  END IF;
+
+  RETURN jsonb_build_object(
+    'updated', updated_rows,
+    'deleted', deleted_rows,
+    'leftover_id', leftover_id
+  );
+END;
+$$ LANGUAGE plpgsql;
@@ -0,0 +1,63 @@
+-- Move bought shopping-list rows into the inventory in one transaction (markPurchased).
+-- p_increments: [{"id": inventory row id, "amount": quantity to add in that row's unit}]
+-- p_new_items: [{"item_name", "quantity", "unit", "category", "expiry_date"}] with unique names;
+--   a name that appeared in the inventory meanwhile has its quantity added instead
+-- p_list_ids: shopping_lists rows to remove
+-- Additions happen here so concurrent inventory edits are not overwritten.
+CREATE OR REPLACE FUNCTION public.mark_shopping_items_purchased(
+  p_user_id UUID,
+  p_increments JSONB,
+  p_new_items JSONB,
+  p_list_ids UUID[]
+)
+RETURNS JSONB AS $$
+DECLARE
+  merged_rows JSONB;
+  added_rows JSONB;
+  removed_count BIGINT;
+BEGIN
+  WITH inc AS (
+    SELECT (x ->> 'id')::uuid AS id, sum((x ->> 'amount')::numeric) AS amount
+    FROM jsonb_array_elements(COALESCE(p_increments, '[]'::jsonb)) AS x
+    GROUP BY 1
+  ), merged AS (
+    UPDATE public.user_inventory i
+    SET quantity = i.quantity + inc.amount,
+        updated_at = now()
+    FROM inc
+    WHERE i.id = inc.id
+      AND i.user_id = p_user_id
+    RETURNING i.item_name, i.quantity, i.unit
+  ), added AS (
+    INSERT INTO public.user_inventory (user_id, item_name, quantity, unit, category, expiry_date)
+    SELECT
+      p_user_id,
+      x ->> 'item_name',
+      COALESCE((x ->> 'quantity')::numeric, 1),
+      COALESCE(NULLIF(x ->> 'unit', ''), 'piece'),
+      COALESCE(NULLIF(x ->> 'category', ''), 'other'),
+      (x ->> 'expiry_date')::date
+    FROM jsonb_array_elements(COALESCE(p_new_items, '[]'::jsonb)) AS x
+    ON CONFLICT (user_id, item_name) DO UPDATE
+    SET quantity = user_inventory.quantity + EXCLUDED.quantity,
+        updated_at = now()
+    RETURNING item_name, quantity, unit
+  ), removed AS (
+    DELETE FROM public.shopping_lists
+    WHERE user_id = p_user_id
+      AND id = ANY(COALESCE(p_list_ids, '{}'::uuid[]))
+    RETURNING id
+  )
+  SELECT
+    (SELECT COALESCE(jsonb_agg(to_jsonb(merged)), '[]'::jsonb) FROM merged),
+    (SELECT COALESCE(jsonb_agg(to_jsonb(added)), '[]'::jsonb) FROM added),
+    (SELECT count(*) FROM removed)
+  INTO merged_rows, added_rows, removed_count;
+
+  RETURN jsonb_build_object(
+    'merged', merged_rows,
+    'added', added_rows,
+    'removed', removed_count
+  );
+END;
+$$ LANGUAGE plpgsql;